@@ -0,0 +1,58 @@
+"""Microbenchmark for extras detection against the LogRecord baseline.
+
+Compares the legacy list scan (`BASELINE`) with the indexed set
+(`BASELINE_KEYS`) while padding the baseline with extra internal names, to
+show that the per-record cost of the set lookup does not grow with it.
+
+Run with::
+
+    python benchmarks/bench_baseline.py
+"""
+
+import logging
+import timeit
+from typing import Any
+from typing import Container
+from typing import Dict
+from typing import List
+
+from pylogformats.baseline import BASELINE
+from pylogformats.baseline import build_baseline
+
+
+NUMBER = 20_000
+
+
+def _record() -> logging.LogRecord:
+    record: logging.LogRecord = logging.makeLogRecord(
+        {"name": "bench", "msg": "A benchmark log message", "args": None}
+    )
+    record.__dict__.update({f"extra_{index}": index for index in range(5)})
+    return record
+
+
+def _extras(record: logging.LogRecord, baseline: Container[str]) -> Dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in baseline}
+
+
+def main() -> None:
+    """Print the per-record cost of extras detection for each baseline size."""
+    record: logging.LogRecord = _record()
+
+    print(f"{'padding':>8} {'list (us)':>10} {'frozenset (us)':>15}")
+    for padding in (0, 50, 200, 1000):
+        names: List[str] = [f"_padding_{index}" for index in range(padding)]
+        as_list: List[str] = BASELINE + names
+        as_set = build_baseline(extra_keys=names)
+
+        list_time = timeit.timeit(lambda: _extras(record, as_list), number=NUMBER)
+        set_time = timeit.timeit(lambda: _extras(record, as_set), number=NUMBER)
+
+        print(
+            f"{padding:>8} {list_time / NUMBER * 1e6:>10.3f} "
+            f"{set_time / NUMBER * 1e6:>15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Microbenchmark for batch formatting.
+
+Formats a batch of records with every formatter, once by calling `format`
+in a loop and joining the lines, and once with `format_batch`.
+
+Run with::
+
+    python benchmarks/bench_batch.py
+"""
+
+import logging
+import timeit
+from typing import List
+
+from pylogformats.base import BaseFormat
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+
+
+RECORDS = 5_000
+REPEAT = 5
+
+
+def main() -> None:
+    """Print the per-record cost of a `format` loop and of `format_batch`."""
+    records: List[logging.LogRecord] = [
+        logging.makeLogRecord(
+            {"name": "bench", "msg": "Benchmark record %d", "args": (index,)}
+        )
+        for index in range(RECORDS)
+    ]
+
+    print(f"{'formatter':>18} {'loop (ns)':>10} {'batch (ns)':>11} {'speedup':>8}")
+    for formatter_class in (
+        JsonFormat,
+        AdvJsonFormat,
+        BunyanFormat,
+        SimpleTextFormat,
+        CompactTextFormat,
+    ):
+        formatter: BaseFormat = formatter_class()
+
+        def loop() -> bytes:
+            return "".join(
+                [formatter.format(record) + "\n" for record in records]
+            ).encode("utf-8")
+
+        def batch() -> bytes:
+            return formatter.format_batch(records, "utf-8")
+
+        assert loop() == batch()  # noqa: S101
+        before = min(timeit.repeat(loop, number=1, repeat=REPEAT))
+        after = min(timeit.repeat(batch, number=1, repeat=REPEAT))
+
+        print(
+            f"{formatter_class.__name__:>18} {before / RECORDS * 1e9:>10.0f} "
+            f"{after / RECORDS * 1e9:>11.0f} {before / after:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
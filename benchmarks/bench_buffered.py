@@ -0,0 +1,89 @@
+"""Microbenchmark for writing log files in large chunks.
+
+Writes the same records to a file with `logging.FileHandler`, which writes
+and flushes every record, and with `BufferedFileHandler`, which writes them
+in chunks.
+
+Run with::
+
+    python benchmarks/bench_buffered.py
+"""
+
+import logging
+import os
+import tempfile
+import timeit
+from typing import Callable
+from typing import List
+
+from pylogformats.handlers import BufferedFileHandler
+from pylogformats.json import JsonFormat
+
+RECORDS = 50_000
+
+
+def _records() -> List[logging.LogRecord]:
+    return [
+        logging.makeLogRecord(
+            {
+                "name": "app.web",
+                "msg": "Request %d served in %.2f ms",
+                "args": (index, index / 7),
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+            }
+        )
+        for index in range(RECORDS)
+    ]
+
+
+def _write(
+    handler_factory: Callable[[str], logging.Handler],
+    formatter: logging.Formatter,
+    records: List[logging.LogRecord],
+    path: str,
+) -> None:
+    handler: logging.Handler = handler_factory(path)
+    handler.setFormatter(formatter)
+    for record in records:
+        handler.handle(record)
+    handler.close()
+    os.remove(path)
+
+
+def main() -> None:
+    """Print the per-record cost of writing with each handler."""
+    records: List[logging.LogRecord] = _records()
+
+    print(
+        f"{'formatter':>10} {'FileHandler (ns)':>17} "
+        f"{'BufferedFileHandler (ns)':>25} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "app.log")
+        for name, formatter in [
+            ("message", logging.Formatter("%(message)s")),
+            ("json", JsonFormat()),
+        ]:
+            before = min(
+                timeit.repeat(
+                    lambda: _write(logging.FileHandler, formatter, records, path),
+                    number=1,
+                    repeat=3,
+                )
+            )
+            after = min(
+                timeit.repeat(
+                    lambda: _write(BufferedFileHandler, formatter, records, path),
+                    number=1,
+                    repeat=3,
+                )
+            )
+            print(
+                f"{name:>10} {before / RECORDS * 1e9:>17.0f} "
+                f"{after / RECORDS * 1e9:>25.0f} {before / after:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
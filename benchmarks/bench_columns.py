@@ -0,0 +1,99 @@
+"""Microbenchmark for reading JSON logs into columns.
+
+Writes logs with an extra nested object and a request id, then reads them
+into `LogColumns` by parsing every line into a record first, and with
+`read_columns`, which decodes only the values the columns keep from the raw
+lines.
+
+Run with::
+
+    python benchmarks/bench_columns.py
+"""
+
+import logging
+import os
+import tempfile
+import timeit
+from typing import List
+from typing import Tuple
+
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.parse import LogColumns
+from pylogformats.parse import get_parser
+from pylogformats.parse import read_columns
+
+
+RECORDS = 50_000
+
+# The fields kept besides the usual columns, in each run.
+FIELD_SETS: List[List[str]] = [[], ["request"]]
+
+
+def _lines(formatter: logging.Formatter) -> List[str]:
+    lines: List[str] = []
+    for index in range(RECORDS):
+        level: int = logging.ERROR if index % 100 < 2 else logging.INFO
+        record: logging.LogRecord = logging.makeLogRecord(
+            {
+                "name": "app.db" if index % 2 else "app.web",
+                "msg": 'Request %d served from "%s"',
+                "args": (index, "cache"),
+                "levelno": level,
+                "levelname": logging.getLevelName(level),
+                "request": f"req-{index:08d}",
+                "user": {"id": index % 500, "roles": ["reader"]},
+            }
+        )
+        lines.append(formatter.format(record))
+    return lines
+
+
+def _parse_then_append(path: str, parser: str, fields: List[str]) -> LogColumns:
+    columns: LogColumns = LogColumns(fields)
+    with open(path, encoding="utf-8") as lines:
+        columns.extend(get_parser(parser).parse(lines))
+    return columns
+
+
+def _time(path: str, parser: str, fields: List[str]) -> Tuple[float, float]:
+    parsed: LogColumns = _parse_then_append(path, parser, fields)
+    scanned: LogColumns = read_columns(path, parser, fields)
+    assert parsed.arrow_buffers() == scanned.arrow_buffers()
+
+    before = min(
+        timeit.repeat(
+            lambda: _parse_then_append(path, parser, fields), number=1, repeat=5
+        )
+    )
+    after = min(
+        timeit.repeat(lambda: read_columns(path, parser, fields), number=1, repeat=5)
+    )
+    return before, after
+
+
+def main() -> None:
+    """Print the per-line cost of both ways of reading columns, for each format."""
+    print(
+        f"{'format':>8} {'fields':>9} {'parse (ns)':>11} {'scan (ns)':>10} "
+        f"{'speedup':>8}"
+    )
+    for name, formatter in [("json", JsonFormat()), ("bunyan", BunyanFormat())]:
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", suffix=".log", delete=False
+        ) as output:
+            output.write("\n".join(_lines(formatter)) + "\n")
+        try:
+            for fields in FIELD_SETS:
+                before, after = _time(output.name, name, fields)
+                print(
+                    f"{name:>8} {','.join(fields) or '-':>9} "
+                    f"{before / RECORDS * 1e9:>11.0f} {after / RECORDS * 1e9:>10.0f} "
+                    f"{before / after:>7.1f}x"
+                )
+        finally:
+            os.remove(output.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Microbenchmark for adding the same values to every record.
+
+Logs records carrying a request id, tenant and trace id, passed with
+``extra=`` on every call, and bound once with
+`pylogformats.context.log_context`. The first column is the cost of the
+logging calls alone, with a handler which drops the records, and the second
+includes formatting them with `JsonFormat`.
+
+Run with::
+
+    python benchmarks/bench_context.py
+"""
+
+import io
+import logging
+import timeit
+from typing import Callable
+
+from pylogformats.context import log_context
+from pylogformats.json import JsonFormat
+
+
+RECORDS = 100_000
+
+VALUES = {"request_id": "req-00001234", "tenant": "acme", "trace_id": "4bf92f35"}
+
+
+class DropHandler(logging.Handler):
+    """Accepts records and does nothing with them."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Drop the record."""
+
+
+def _with_extra(logger: logging.Logger) -> None:
+    for index in range(RECORDS):
+        logger.info(
+            "Request %d served",
+            index,
+            extra={
+                "request_id": VALUES["request_id"],
+                "tenant": VALUES["tenant"],
+                "trace_id": VALUES["trace_id"],
+            },
+        )
+
+
+def _with_context(logger: logging.Logger) -> None:
+    with log_context(**VALUES):
+        for index in range(RECORDS):
+            logger.info("Request %d served", index)
+
+
+def _time(run: Callable[[logging.Logger], None], handler: logging.Handler) -> float:
+    logger: logging.Logger = logging.getLogger("bench.context")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [handler]
+    return min(timeit.repeat(lambda: run(logger), number=1, repeat=3))
+
+
+def main() -> None:
+    """Print the per-record cost of both ways of adding the values."""
+    formatting = logging.StreamHandler(io.StringIO())
+    formatting.setFormatter(JsonFormat())
+
+    print(f"{'':>10} {'calls (ns)':>12} {'formatted (ns)':>15}")
+    for name, run in [("extra=", _with_extra), ("context", _with_context)]:
+        calls: float = _time(run, DropHandler())
+        formatted: float = _time(run, formatting)
+        formatting.stream = io.StringIO()
+        print(
+            f"{name:>10} {calls / RECORDS * 1e9:>12.0f} "
+            f"{formatted / RECORDS * 1e9:>15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Microbenchmark for filtering JSON logs before decoding them.
+
+Writes logs in which only a few records are errors from the logger being
+searched for, then finds them by parsing every line and checking the
+records, and with `RecordFilter`, which scans the raw lines first.
+
+Run with::
+
+    python benchmarks/bench_filter.py
+"""
+
+import logging
+import timeit
+from typing import List
+
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.parse import RecordFilter
+from pylogformats.parse import get_parser
+
+
+RECORDS = 50_000
+
+
+def _lines(formatter: logging.Formatter) -> List[str]:
+    lines: List[str] = []
+    for index in range(RECORDS):
+        # One record in a hundred is an error, from either of two loggers.
+        level: int = logging.ERROR if index % 100 < 2 else logging.INFO
+        record: logging.LogRecord = logging.makeLogRecord(
+            {
+                "name": "app.db" if index % 2 else "app.web",
+                "msg": "Request %d served in %.2f ms",
+                "args": (index, index / 7),
+                "levelno": level,
+                "levelname": logging.getLevelName(level),
+                "request": f"req-{index:08d}",
+                "user": {"id": index % 500, "roles": ["reader"]},
+            }
+        )
+        lines.append(formatter.format(record))
+    return lines
+
+
+def main() -> None:
+    """Print the per-line cost of both ways of filtering, for each format."""
+    record_filter = RecordFilter("ERROR", loggers=["app.db"])
+
+    print(
+        f"{'format':>8} {'matches':>8} {'parse all (ns)':>15} "
+        f"{'prefilter (ns)':>15} {'speedup':>8}"
+    )
+    for name, formatter in [("json", JsonFormat()), ("bunyan", BunyanFormat())]:
+        lines: List[str] = _lines(formatter)
+        parser = get_parser(name)
+
+        matches: int = len(list(record_filter.filter(parser, lines)))
+        before = min(
+            timeit.repeat(
+                lambda: [r for r in parser.parse(lines) if record_filter(r)],
+                number=1,
+                repeat=3,
+            )
+        )
+        after = min(
+            timeit.repeat(
+                lambda: list(record_filter.filter(parser, lines)), number=1, repeat=3
+            )
+        )
+
+        print(
+            f"{name:>8} {matches:>8} {before / RECORDS * 1e9:>15.0f} "
+            f"{after / RECORDS * 1e9:>15.0f} {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Microbenchmark for the JSON serializer backends.
+
+Formats the same record with `JsonFormat` using `json.dumps` directly and
+each installed backend from `pylogformats.serializers`.
+
+Run with::
+
+    python benchmarks/bench_serializers.py
+"""
+
+import json
+import logging
+import timeit
+from typing import Any
+from typing import Dict
+
+from pylogformats.json import JsonFormat
+from pylogformats.serializers import SERIALIZERS
+from pylogformats.serializers import get_serializer
+
+
+NUMBER = 20_000
+
+
+def main() -> None:
+    """Print the per-record cost of each serializer backend."""
+    record: logging.LogRecord = logging.makeLogRecord(
+        {"name": "bench", "msg": "A benchmark log message", "args": None}
+    )
+    record.__dict__.update({f"extra_{index}": f"value {index}" for index in range(5)})
+    payload: Dict[str, Any] = json.loads(JsonFormat().format(record))
+
+    reference = timeit.timeit(lambda: json.dumps(payload), number=NUMBER)
+    print(f"{'backend':>10} {'dumps (ns)':>11} {'speedup':>8} {'format (ns)':>12}")
+    print(f"{'json.dumps':>10} {reference / NUMBER * 1e9:>11.0f} {'1.0x':>8}")
+
+    for name in SERIALIZERS:
+        try:
+            serializer = get_serializer(name)
+        except ImportError:
+            print(f"{name:>10} {'not installed':>11}")
+            continue
+
+        formatter = JsonFormat(serializer=serializer)
+        dumps = timeit.timeit(lambda: serializer.dumps(payload), number=NUMBER)
+        fmt = timeit.timeit(lambda: formatter.format(record), number=NUMBER)
+
+        print(
+            f"{name:>10} {dumps / NUMBER * 1e9:>11.0f} "
+            f"{reference / dumps:>7.1f}x {fmt / NUMBER * 1e9:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
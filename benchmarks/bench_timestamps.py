@@ -0,0 +1,63 @@
+"""Microbenchmark for the cached timestamp renderers.
+
+Renders a burst of timestamps a few microseconds apart, as seen at high
+record rates, with the per-record `datetime` calls the formatters used to
+make and with the cached renderers from `pylogformats.timestamps`.
+
+Run with::
+
+    python benchmarks/bench_timestamps.py
+"""
+
+import time
+import timeit
+from datetime import datetime
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from pylogformats.timestamps import BunyanTimestamp
+from pylogformats.timestamps import IsoTimestamp
+from pylogformats.timestamps import StrftimeTimestamp
+
+
+RECORDS = 50_000
+
+
+def _uncached_text(created: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+
+
+def _uncached_bunyan(created: float) -> str:
+    return datetime.fromtimestamp(created).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _uncached_iso(created: float) -> str:
+    return datetime.fromtimestamp(created).isoformat()
+
+
+def main() -> None:
+    """Print the per-record cost of each renderer, uncached and cached."""
+    start: float = time.time()
+    # Around 50k records per second.
+    burst: List[float] = [start + index * 0.00002 for index in range(RECORDS)]
+
+    renderers: Dict[str, List[Callable[[float], str]]] = {
+        "iso": [_uncached_iso, IsoTimestamp()],
+        "bunyan": [_uncached_bunyan, BunyanTimestamp()],
+        "text": [_uncached_text, StrftimeTimestamp("%Y-%m-%d %H:%M:%S")],
+    }
+
+    print(f"{'renderer':>8} {'uncached (ns)':>14} {'cached (ns)':>12} {'speedup':>8}")
+    for name, (uncached, cached) in renderers.items():
+        before = timeit.timeit(lambda: [uncached(c) for c in burst], number=1)
+        after = timeit.timeit(lambda: [cached(c) for c in burst], number=1)
+
+        print(
+            f"{name:>8} {before / RECORDS * 1e9:>14.0f} "
+            f"{after / RECORDS * 1e9:>12.0f} {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Benchmark suite for every formatter in `pylogformats`.
+
+Formats a set of record shapes with each formatter and reports:
+
+- throughput, in records per second,
+- per-record latency percentiles, in nanoseconds,
+- the peak memory allocated while formatting a record, with `tracemalloc`.
+
+Results can be saved as a JSON baseline, and later runs compared against it
+to flag throughput regressions.
+
+Run with::
+
+    python benchmarks/suite.py
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --compare baseline.json --threshold 0.1
+
+or through the ``benchmarks`` Nox session, which passes its arguments on::
+
+    nox --session=benchmarks -- --formatter JsonFormat --shape extras
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+
+
+FORMATTERS: Dict[str, Callable[[], logging.Formatter]] = {
+    "JsonFormat": JsonFormat,
+    "AdvJsonFormat": AdvJsonFormat,
+    "BunyanFormat": BunyanFormat,
+    "SimpleTextFormat": SimpleTextFormat,
+    "CompactTextFormat": CompactTextFormat,
+}
+
+
+def _record(**attributes: Any) -> logging.LogRecord:
+    record: logging.LogRecord = logging.makeLogRecord(
+        {"name": "bench", "msg": "A benchmark log message", "args": None}
+    )
+    record.__dict__.update(attributes)
+    return record
+
+
+def _exception_record() -> logging.LogRecord:
+    try:
+        raise ValueError("A benchmark exception")
+    except ValueError:
+        return _record(exc_info=sys.exc_info())
+
+
+# Shared by the records of the large message shape, to keep them small.
+_LARGE_MESSAGE = "A large benchmark message. " * 2048
+
+SHAPES: Dict[str, Callable[[], logging.LogRecord]] = {
+    "plain": _record,
+    "extras": lambda: _record(**{f"extra_{index}": index for index in range(5)}),
+    "many_extras": lambda: _record(
+        **{f"extra_{index}": f"value {index}" for index in range(50)}
+    ),
+    "large_message": lambda: _record(msg=_LARGE_MESSAGE),
+    "args": lambda: _record(
+        msg="User %s logged in from %s after %d attempts (%.2f seconds)",
+        args=("someone", "127.0.0.1", 3, 1.25),
+    ),
+    "exception": _exception_record,
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+def _percentile(samples: List[int], percentile: int) -> int:
+    """Pick a percentile from sorted samples, using the nearest rank."""
+    index: int = max(0, -(-len(samples) * percentile // 100) - 1)
+    return samples[index]
+
+
+def measure(
+    formatter: logging.Formatter,
+    make_record: Callable[[], logging.LogRecord],
+    number: int,
+    repeat: int,
+) -> Dict[str, float]:
+    """Measure formatting records of one shape.
+
+    Every record is formatted once, as in real logging, so the caches kept on
+    a record or keyed on its exception never hit. The records are made before
+    the timing starts.
+
+    :param formatter: The formatter to measure.
+    :type formatter: logging.Formatter
+    :param make_record: Makes a new record to format.
+    :type make_record: Callable[[], logging.LogRecord]
+    :param number: The number of records formatted per throughput run.
+    :type number: int
+    :param repeat: The number of throughput runs, of which the fastest is kept.
+    :type repeat: int
+    :return: Records per second, latency percentiles in nanoseconds and the \
+median peak of allocated bytes.
+    :rtype: Dict[str, float]
+    """
+    fmt = formatter.format
+    runs: range = range(number)
+    records: List[logging.LogRecord]
+
+    # Warm up any caches, such as the per-second timestamp cache.
+    for _ in range(min(number, 100)):
+        fmt(make_record())
+
+    best: float = float("inf")
+    for _ in range(repeat):
+        records = [make_record() for _ in runs]
+        start: float = time.perf_counter()
+        for record in records:
+            fmt(record)
+        best = min(best, time.perf_counter() - start)
+
+    clock = time.perf_counter_ns
+    latencies: List[int] = []
+    records = [make_record() for _ in runs]
+    for record in records:
+        before: int = clock()
+        fmt(record)
+        latencies.append(clock() - before)
+    latencies.sort()
+    del records
+
+    # Allocations are sampled separately, tracing slows formatting down. The
+    # peak covers everything allocated while formatting, including the output.
+    peaks: List[int] = []
+    for _ in range(min(number, 200)):
+        record = make_record()
+        tracemalloc.start()
+        try:
+            fmt(record)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    peaks.sort()
+
+    result: Dict[str, float] = {"records_per_second": number / best}
+    for percentile in PERCENTILES:
+        result[f"p{percentile}_ns"] = _percentile(latencies, percentile)
+    result["peak_bytes"] = _percentile(peaks, 50)
+    return result
+
+
+def run(
+    formatters: Sequence[str],
+    shapes: Sequence[str],
+    number: int,
+    repeat: int,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Measure every formatter against every record shape.
+
+    :param formatters: Names from `FORMATTERS`.
+    :type formatters: Sequence[str]
+    :param shapes: Names from `SHAPES`.
+    :type shapes: Sequence[str]
+    :param number: The number of records formatted per throughput run.
+    :type number: int
+    :param repeat: The number of throughput runs.
+    :type repeat: int
+    :return: Results keyed on formatter name, then shape name.
+    :rtype: Dict[str, Dict[str, Dict[str, float]]]
+    """
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in formatters:
+        results[name] = {}
+        for shape in shapes:
+            results[name][shape] = measure(
+                FORMATTERS[name](), SHAPES[shape], number, repeat
+            )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    threshold: float,
+) -> List[str]:
+    """Find throughput regressions against a baseline.
+
+    :param results: The current results.
+    :type results: Dict[str, Dict[str, Dict[str, float]]]
+    :param baseline: Results from an earlier run.
+    :type baseline: Dict[str, Dict[str, Dict[str, float]]]
+    :param threshold: The tolerated slowdown, as a fraction of the baseline.
+    :type threshold: float
+    :return: A description of every regression.
+    :rtype: List[str]
+    """
+    regressions: List[str] = []
+    for name, shapes in results.items():
+        for shape, result in shapes.items():
+            previous: Optional[Dict[str, float]] = baseline.get(name, {}).get(shape)
+            if previous is None:
+                continue
+
+            change: float = (
+                result["records_per_second"] / previous["records_per_second"] - 1
+            )
+            if change < -threshold:
+                regressions.append(
+                    f"{name} {shape}: {result['records_per_second']:,.0f} records/s, "
+                    f"{change:+.1%} against {previous['records_per_second']:,.0f}"
+                )
+    return regressions
+
+
+def report(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None,
+) -> None:
+    """Print the results as a table.
+
+    :param results: The results to print.
+    :type results: Dict[str, Dict[str, Dict[str, float]]]
+    :param baseline: Results from an earlier run, to print the change against.
+    :type baseline: Dict[str, Dict[str, Dict[str, float]]] | None
+    """
+    header: str = (
+        f"{'formatter':<18} {'shape':<14} {'records/s':>11} "
+        + " ".join(f"{f'p{percentile} ns':>9}" for percentile in PERCENTILES)
+        + f" {'peak B':>9}"
+    )
+    if baseline is not None:
+        header += f" {'change':>8}"
+    print(header)
+
+    for name, shapes in results.items():
+        for shape, result in shapes.items():
+            line: str = (
+                f"{name:<18} {shape:<14} {result['records_per_second']:>11,.0f} "
+                + " ".join(
+                    f"{result[f'p{percentile}_ns']:>9,.0f}"
+                    for percentile in PERCENTILES
+                )
+                + f" {result['peak_bytes']:>9,.0f}"
+            )
+            previous = (baseline or {}).get(name, {}).get(shape)
+            if previous is not None:
+                change: float = (
+                    result["records_per_second"] / previous["records_per_second"] - 1
+                )
+                line += f" {change:>+8.1%}"
+            print(line)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the suite from the command line.
+
+    :param argv: The command line arguments, defaults to `sys.argv`.
+    :type argv: Sequence[str] | None
+    :return: The exit code, 1 when a regression was found.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--formatter",
+        action="append",
+        choices=list(FORMATTERS),
+        help="Only benchmark this formatter, may be repeated.",
+    )
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=list(SHAPES),
+        help="Only benchmark this record shape, may be repeated.",
+    )
+    parser.add_argument("--number", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="Save the results as JSON.")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="Compare against saved results."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Tolerated throughput loss against the baseline (default: 0.1).",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.formatter or list(FORMATTERS),
+        args.shape or list(SHAPES),
+        args.number,
+        args.repeat,
+    )
+
+    baseline: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is not None:
+        regressions: List[str] = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
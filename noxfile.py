@@ -205,6 +205,13 @@ def xdoctest(session: Session) -> None:
     session.run("python", "-m", "xdoctest", *args)
 
 
+@session(python=python_versions[0])
+def benchmarks(session: Session) -> None:
+    """Benchmark the formatters, see benchmarks/suite.py for the arguments."""
+    session.install(".")
+    session.run("python", "benchmarks/suite.py", *session.posargs)
+
+
 @session(name="docs-build", python=python_versions[0])
 def docs_build(session: Session) -> None:
     """Build the documentation."""
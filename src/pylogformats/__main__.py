@@ -0,0 +1,6 @@
+"""Run the log converter with ``python -m pylogformats``."""
+
+from pylogformats.cli import main
+
+
+raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""Shared behaviour for every Format class."""
+
+import logging
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+from typing import overload
+
+
+class BaseFormat(logging.Formatter):
+    """A base class for the formatters in `pylogformats`.
+
+    Adds batch formatting on top of `logging.Formatter`.
+    """
+
+    @overload
+    def format_batch(
+        self,
+        records: Iterable[logging.LogRecord],
+        encoding: None = None,
+        terminator: str = "\n",
+    ) -> str:
+        ...  # pragma: no cover
+
+    @overload
+    def format_batch(
+        self,
+        records: Iterable[logging.LogRecord],
+        encoding: str,
+        terminator: str = "\n",
+    ) -> bytes:
+        ...  # pragma: no cover
+
+    def format_batch(
+        self,
+        records: Iterable[logging.LogRecord],
+        encoding: Optional[str] = None,
+        terminator: str = "\n",
+    ) -> Union[str, bytes]:
+        """Format many records into a single buffer, one record per line.
+
+        The output of the JSON formatters is NDJSON. Every record, including
+        the last, is followed by the terminator, as a `logging.StreamHandler`
+        would write it.
+
+        >>> import logging
+        >>> from pylogformats import JsonFormat
+        >>>
+        >>> records = [
+        ...     logging.makeLogRecord({"name": "root", "msg": f"Record {index}"})
+        ...     for index in range(3)
+        ... ]
+        >>> JsonFormat().format_batch(records).count("\\n")
+        3
+
+        :param records: The records to format, in order.
+        :type records: Iterable[logging.LogRecord]
+        :param encoding: Encode the buffer to bytes with this encoding.
+        :type encoding: str | None
+        :param terminator: Written after every record.
+        :type terminator: str
+        :return: The formatted records, as a string or as bytes when an \
+encoding is given.
+        :rtype: str | bytes
+        """
+        lines: List[str] = self._format_many(records)
+        if not lines:
+            buffer: str = ""
+        else:
+            lines.append("")
+            buffer = terminator.join(lines)
+
+        if encoding is None:
+            return buffer
+        return buffer.encode(encoding)
+
+    def _format_many(self, records: Iterable[logging.LogRecord]) -> List[str]:
+        # Look `format` up once for the whole batch.
+        fmt = self.format
+        return [fmt(record) for record in records]
@@ -5,7 +5,15 @@ in by a user using the `extra` key
 """
 
 import logging
+import sys
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import List
+from typing import Tuple
+
+from pylogformats.context import CONTEXT_KEY
+from pylogformats.message import MEMO_KEY
 
 
 _LOG_RECORD: logging.LogRecord = logging.makeLogRecord(
@@ -19,4 +27,44 @@ _LOG_RECORD: logging.LogRecord = logging.makeLogRecord(
     }
 )
 
+# Attributes which `logging.LogRecord` only gained in later Python releases,
+# keyed on the first release to set them.
+_VERSIONED_KEYS: Dict[Tuple[int, int], Tuple[str, ...]] = {
+    (3, 12): ("taskName",),
+}
+
+
+def build_baseline(
+    version: Tuple[int, int] = (sys.version_info[0], sys.version_info[1]),
+    extra_keys: Iterable[str] = (),
+) -> FrozenSet[str]:
+    """Build the set of LogRecord attributes which are not user extras.
+
+    :param version: The ``(major, minor)`` Python version to build the set for. \
+Attributes added to `logging.LogRecord` after this version are left out.
+    :type version: Tuple[int, int]
+    :param extra_keys: Any further attribute names to treat as internal.
+    :type extra_keys: Iterable[str]
+    :return: An immutable set of attribute names, for constant time lookups.
+    :rtype: FrozenSet[str]
+    """
+    keys = set(vars(_LOG_RECORD))
+
+    for introduced, names in _VERSIONED_KEYS.items():
+        if version >= introduced:
+            keys.update(names)
+        else:
+            keys.difference_update(names)
+
+    keys.update(extra_keys)
+
+    return frozenset(keys)
+
+
+# Attributes `pylogformats` itself stores on records.
+_PYLOGFORMATS_KEYS: Tuple[str, ...] = (MEMO_KEY, CONTEXT_KEY)
+
+BASELINE_KEYS: FrozenSet[str] = build_baseline(extra_keys=_PYLOGFORMATS_KEYS)
+
+# Kept for backwards compatibility. Prefer `BASELINE_KEYS` for membership tests.
 BASELINE: List[str] = list(_LOG_RECORD.__dict__.keys())
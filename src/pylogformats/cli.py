@@ -0,0 +1,273 @@
+"""Convert logs between the `pylogformats` formats.
+
+Reads logs written by one formatter and writes them again with another,
+such as turning a `BunyanFormat` archive into `CompactTextFormat` for
+reading:
+
+.. code-block:: console
+
+    $ pylogformats --from bunyan --to compact app.log > app.txt
+    $ cat app.log | python -m pylogformats --from bunyan --to compact
+
+Input and output go through large buffers, and records are formatted in
+batches. With ``--processes``, files are split into chunks which are parsed
+and formatted in parallel, see `pylogformats.parse.read_parallel`.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+
+from pylogformats.base import BaseFormat
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.parse import ParsedRecord
+from pylogformats.parse import RecordFilter
+from pylogformats.parse import get_parser
+from pylogformats.parse import read_parallel
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+
+
+# Every format, with its formatter and the parser reading it back.
+FORMATS: Dict[str, Tuple[Callable[[], BaseFormat], str]] = {
+    "json": (JsonFormat, "json"),
+    "advjson": (AdvJsonFormat, "json"),
+    "bunyan": (BunyanFormat, "bunyan"),
+    "compact": (CompactTextFormat, "compact"),
+    "simple": (SimpleTextFormat, "simple"),
+}
+
+# The size of the input and output buffers, in bytes.
+BUFFER_SIZE = 1 << 20
+
+# The most records formatted together.
+BATCH_SIZE = 1000
+
+
+def convert(
+    records: Iterable[ParsedRecord], formatter: BaseFormat, batch_size: int = BATCH_SIZE
+) -> Iterator[Tuple[int, bytes]]:
+    """Format parsed records again, in batches.
+
+    :param records: The records to convert.
+    :type records: Iterable[ParsedRecord]
+    :param formatter: The formatter to write them with.
+    :type formatter: BaseFormat
+    :param batch_size: The most records formatted together.
+    :type batch_size: int
+    :yield: The number of records in each batch, and the batch as UTF-8 lines.
+    :rtype: Iterator[Tuple[int, bytes]]
+    """
+    batch: List[Any] = []
+    for record in records:
+        batch.append(record.to_log_record())
+        if len(batch) >= batch_size:
+            yield len(batch), formatter.format_batch(batch, "utf-8")
+            batch = []
+
+    if batch:
+        yield len(batch), formatter.format_batch(batch, "utf-8")
+
+
+class ConvertChunk:
+    """Convert the records of a chunk in a worker process.
+
+    Holds the name of the output format rather than a formatter, so it is
+    cheap to pickle. The formatter is created in the worker.
+    """
+
+    def __init__(self, target: str) -> None:
+        """Create the converter.
+
+        :param target: The name of the output format.
+        :type target: str
+        """
+        self.target: str = target
+
+    def __call__(self, records: Iterable[ParsedRecord]) -> Tuple[int, bytes]:
+        """Convert a chunk.
+
+        :param records: The records of the chunk.
+        :type records: Iterable[ParsedRecord]
+        :return: The number of records and the converted chunk.
+        :rtype: Tuple[int, bytes]
+        """
+        formatter: BaseFormat = FORMATS[self.target][0]()
+        batches: List[Tuple[int, bytes]] = list(convert(records, formatter))
+        return sum(count for count, _ in batches), b"".join(data for _, data in batches)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser.
+
+    :return: The parser for the command line arguments.
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="pylogformats",
+        description="Convert logs between the pylogformats formats.",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="Log files to read, in order. Reads standard input if none are given.",
+    )
+    parser.add_argument(
+        "--from",
+        dest="source",
+        choices=sorted(FORMATS),
+        required=True,
+        help="The format of the input.",
+    )
+    parser.add_argument(
+        "--to",
+        dest="target",
+        choices=sorted(FORMATS),
+        required=True,
+        help="The format to write.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="The file to write to. Writes to standard output if not given.",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        default=0,
+        help="Convert files in this many processes. Standard input is always "
+        "converted in a single process.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1 << 26,
+        help="The size of the chunks files are split into with --processes, "
+        "in bytes.",
+    )
+    parser.add_argument(
+        "--level",
+        help="Only convert records at or above this level, such as ERROR.",
+    )
+    parser.add_argument(
+        "--logger",
+        action="append",
+        default=[],
+        help="Only convert records of this logger and its children. May be "
+        "given more than once.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report the number of records converted and the throughput on "
+        "standard error.",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the converter.
+
+    :param argv: The command line arguments, defaults to `sys.argv`.
+    :type argv: List[str] | None
+    :return: The exit status.
+    :rtype: int
+    """
+    parser: argparse.ArgumentParser = build_parser()
+    args: argparse.Namespace = parser.parse_args(argv)
+    try:
+        args.record_filter = _record_filter(args)
+    except ValueError as error:
+        parser.error(str(error))
+    started: float = time.perf_counter()
+
+    output: BinaryIO
+    if args.output is None:
+        output = sys.stdout.buffer
+    else:
+        output = open(args.output, "wb", buffering=BUFFER_SIZE)
+
+    records: int = 0
+    written: int = 0
+    try:
+        for count, data in _convert_inputs(args):
+            output.write(data)
+            records += count
+            written += len(data)
+        output.flush()
+    except BrokenPipeError:
+        # The reader went away, such as ``head``. Stop quietly, and keep
+        # Python from failing again when it flushes standard output on exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if args.output is not None:
+            output.close()
+
+    if args.stats:
+        elapsed: float = max(time.perf_counter() - started, 1e-9)
+        print(
+            f"Converted {records} records ({written / 1e6:.1f} MB) in "
+            f"{elapsed:.2f}s: {records / elapsed:,.0f} records/s, "
+            f"{written / 1e6 / elapsed:.1f} MB/s",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def _record_filter(args: argparse.Namespace) -> Optional[RecordFilter]:
+    if args.level is None and not args.logger:
+        return None
+    return RecordFilter(args.level or 0, args.logger)
+
+
+def _convert_inputs(args: argparse.Namespace) -> Iterator[Tuple[int, bytes]]:
+    parser_name: str = FORMATS[args.source][1]
+    record_filter: Optional[RecordFilter] = args.record_filter
+
+    def read(lines: Iterable[str]) -> Iterator[ParsedRecord]:
+        line_parser = get_parser(parser_name)
+        if record_filter is None:
+            return line_parser.parse(lines)
+        return record_filter.filter(line_parser, lines)
+
+    if not args.files:
+        lines: TextIO = io.TextIOWrapper(
+            sys.stdin.buffer, encoding="utf-8", errors="replace"
+        )
+        formatter: BaseFormat = FORMATS[args.target][0]()
+        yield from convert(read(lines), formatter)
+        return
+
+    for path in args.files:
+        if args.processes > 1:
+            yield from read_parallel(
+                path,
+                parser_name,
+                processes=args.processes,
+                chunk_size=args.chunk_size,
+                reduce=ConvertChunk(args.target),
+                record_filter=record_filter,
+            )
+            continue
+
+        formatter = FORMATS[args.target][0]()
+        with open(
+            path, encoding="utf-8", errors="replace", buffering=BUFFER_SIZE
+        ) as lines:
+            yield from convert(read(lines), formatter)
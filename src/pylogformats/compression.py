@@ -0,0 +1,179 @@
+"""Compression codecs for log files.
+
+`pylogformats.handlers.CompressedRotatingFileHandler` compresses log files
+through a `Codec`, picked by name, or automatically with ``"auto"``:
+
+- ``"gzip"`` - `zlib`, writing ``.gz`` files.
+- ``"lzma"`` - `lzma`, writing ``.xz`` files. Smaller, but much slower.
+- ``"zstd"`` - `zstandard <https://github.com/indygreg/python-zstandard>`_,
+  writing ``.zst`` files. Fast and small, when installed.
+
+Every codec writes output which can be ended and started again at any point.
+The compressed pieces, one after the other, are still a valid file, which
+``gzip -d``, ``xz -d`` and ``zstd -d`` read as one.
+
+>>> import gzip
+>>> from pylogformats.compression import get_codec
+>>>
+>>> codec = get_codec("gzip")
+>>> compressor = codec.compressor()
+>>> data = compressor.compress(b"A demo log message\\n") + compressor.flush()
+>>> compressor = codec.compressor()
+>>> data += compressor.compress(b"Another\\n") + compressor.flush()
+>>> gzip.decompress(data)
+b'A demo log message\\nAnother\\n'
+
+"""
+
+import importlib
+import lzma
+import os
+import zlib
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+from typing import Union
+
+
+# How much of a file is compressed at a time.
+_CHUNK_SIZE = 1024 * 1024
+
+
+class Codec(ABC):
+    """Compresses log files.
+
+    :cvar name: The name the codec is registered under.
+    :cvar suffix: Added to the names of the files it writes.
+    """
+
+    name: str = ""
+    suffix: str = ""
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        """Create the codec.
+
+        :param level: The compression level, or `None` for the codec's default.
+        :type level: int | None
+        """
+        self.level: Optional[int] = level
+
+    @abstractmethod
+    def compressor(self) -> Any:
+        """Start a compressed stream."""
+
+    def compress_file(
+        self,
+        source: Union[str, "os.PathLike[str]"],
+        target: Union[str, "os.PathLike[str]"],
+    ) -> None:
+        """Compress a file into another.
+
+        :param source: The file to compress.
+        :type source: str | os.PathLike
+        :param target: The compressed file to write.
+        :type target: str | os.PathLike
+        """
+        compressor: Any = self.compressor()
+        with open(source, "rb") as data, open(target, "wb") as output:
+            for chunk in iter(lambda: data.read(_CHUNK_SIZE), b""):
+                output.write(compressor.compress(chunk))
+            output.write(compressor.flush())
+
+
+class GzipCodec(Codec):
+    """Compress with `zlib`, into the gzip format."""
+
+    name = "gzip"
+    suffix = ".gz"
+
+    def compressor(self) -> Any:
+        """Start a gzip member.
+
+        :return: An object with ``compress`` and ``flush`` methods.
+        :rtype: zlib.Compress
+        """
+        level: int = zlib.Z_DEFAULT_COMPRESSION if self.level is None else self.level
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class LzmaCodec(Codec):
+    """Compress with `lzma`, into the xz format."""
+
+    name = "lzma"
+    suffix = ".xz"
+
+    def compressor(self) -> Any:
+        """Start an xz stream.
+
+        :return: An object with ``compress`` and ``flush`` methods.
+        :rtype: lzma.LZMACompressor
+        """
+        return lzma.LZMACompressor(lzma.FORMAT_XZ, preset=self.level)
+
+
+class ZstdCodec(Codec):
+    """Compress with `zstandard`, into the Zstandard format."""
+
+    name = "zstd"
+    suffix = ".zst"
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        """Import zstandard.
+
+        :param level: The compression level, or `None` for the codec's default.
+        :type level: int | None
+        """
+        super().__init__(level)
+        zstandard: Any = importlib.import_module("zstandard")
+        self._compressor: Any = zstandard.ZstdCompressor(
+            level=3 if level is None else level
+        )
+
+    def compressor(self) -> Any:
+        """Start a Zstandard frame.
+
+        :return: An object with ``compress`` and ``flush`` methods.
+        :rtype: zstandard.ZstdCompressionObj
+        """
+        return self._compressor.compressobj()
+
+
+CODECS: Dict[str, Type[Codec]] = {
+    codec.name: codec for codec in (GzipCodec, LzmaCodec, ZstdCodec)
+}
+
+# The order codecs are tried in by ``"auto"``, best first.
+AUTO_ORDER: List[str] = ["zstd", "gzip"]
+
+
+def get_codec(codec: Union[str, Codec] = "gzip") -> Codec:
+    """Resolve a codec by name.
+
+    :param codec: A `Codec` instance, a codec name, or ``"auto"`` to use \
+Zstandard when it is installed, and gzip otherwise.
+    :type codec: str | Codec
+    :raises ValueError: When the codec name is not known.
+    :return: A ready to use codec.
+    :rtype: Codec
+    """
+    if isinstance(codec, Codec):
+        return codec
+
+    if codec == "auto":
+        for name in AUTO_ORDER:  # pragma: no branch
+            try:
+                return CODECS[name]()
+            except ImportError:
+                continue
+
+    if codec not in CODECS:
+        raise ValueError(
+            f"Unknown codec {codec!r}, expected one of "
+            f"{', '.join(['auto', *CODECS])}"
+        )
+
+    return CODECS[codec]()
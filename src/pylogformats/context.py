@@ -0,0 +1,149 @@
+"""Add the same values to every record, without passing ``extra=`` to each call.
+
+Values bound with `bind` or `log_context`, such as a request id, are kept in
+a `contextvars.ContextVar`, so each thread and each `asyncio` task sees its
+own. The JSON formatters and `pylogformats.CompactTextFormat` read them when
+they format a record and write them with the record's extras, before them,
+so an ``extra=`` value of the same name wins. Logging calls themselves do no
+extra work.
+
+>>> import logging
+>>> from pylogformats import JsonFormat
+>>> from pylogformats.context import log_context
+>>>
+>>> record = logging.makeLogRecord({"name": "root", "msg": "Served"})
+>>> with log_context(request_id="abc123", tenant="acme"):
+...     JsonFormat().format(record)  # doctest: +ELLIPSIS
+'{..."message": "Served", ..."request_id": "abc123", "tenant": "acme"}'
+
+Records formatted in another thread than the one which logged them, such as
+by `pylogformats.handlers.QueueFormatHandler`, carry a snapshot of the
+context they were logged in, taken by `snapshot_context`. The handlers in
+`pylogformats.handlers` take it themselves. For other handlers which pass
+records to other threads, such as `logging.handlers.QueueHandler`, add a
+`ContextSnapshotFilter` to the handler.
+
+Binding creates a new mapping and leaves the old one as it is, so a snapshot
+is only a reference to the mapping.
+"""
+
+import contextvars
+import logging
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+
+
+# The record attribute a snapshot of the context is kept in.
+CONTEXT_KEY = "_pylogformats_context"
+
+_EMPTY: Dict[str, Any] = {}
+
+# Mappings in the variable are never changed, only replaced.
+_CONTEXT: "contextvars.ContextVar[Dict[str, Any]]" = contextvars.ContextVar(
+    "pylogformats_context", default=_EMPTY
+)
+
+
+def bind(**values: Any) -> "contextvars.Token[Dict[str, Any]]":
+    """Add values to the context, for every record logged in it from now on.
+
+    :param values: The names and values to add. Values already bound under \
+the same names are replaced.
+    :type values: Any
+    :return: A token to restore the context as it was with `reset`.
+    :rtype: contextvars.Token
+    """
+    return _CONTEXT.set({**_CONTEXT.get(), **values})
+
+
+def unbind(*names: str) -> "contextvars.Token[Dict[str, Any]]":
+    """Remove values from the context.
+
+    :param names: The names of the values to remove.
+    :type names: str
+    :return: A token to restore the context as it was with `reset`.
+    :rtype: contextvars.Token
+    """
+    return _CONTEXT.set(
+        {key: value for key, value in _CONTEXT.get().items() if key not in names}
+    )
+
+
+def reset(token: "contextvars.Token[Dict[str, Any]]") -> None:
+    """Restore the context as it was before a `bind` or `unbind`.
+
+    :param token: The token `bind` or `unbind` returned.
+    :type token: contextvars.Token
+    """
+    _CONTEXT.reset(token)
+
+
+@contextmanager
+def log_context(**values: Any) -> Iterator[None]:
+    """Add values to the context for the duration of a ``with`` block.
+
+    :param values: The names and values to add.
+    :type values: Any
+    :yield: Once the values are bound. They are removed on leaving the block.
+    :rtype: Iterator[None]
+    """
+    token: "contextvars.Token[Dict[str, Any]]" = bind(**values)
+    try:
+        yield
+    finally:
+        _CONTEXT.reset(token)
+
+
+def get_context() -> Mapping[str, Any]:
+    """Return the values bound in the current context.
+
+    :return: A read-only view of the values.
+    :rtype: Mapping[str, Any]
+    """
+    return MappingProxyType(_CONTEXT.get())
+
+
+def snapshot_context(record: logging.LogRecord) -> None:
+    """Keep the current context on a record, before it goes to another thread.
+
+    A record which already carries a snapshot keeps it.
+
+    :param record: The record being logged.
+    :type record: logging.LogRecord
+    """
+    record.__dict__.setdefault(CONTEXT_KEY, _CONTEXT.get())
+
+
+def record_context(record: logging.LogRecord) -> Dict[str, Any]:
+    """Return the context a record was logged in.
+
+    :param record: The record being formatted.
+    :type record: logging.LogRecord
+    :return: The record's snapshot, or the current context when it has none. \
+It must not be changed.
+    :rtype: Dict[str, Any]
+    """
+    context: Optional[Dict[str, Any]] = record.__dict__.get(CONTEXT_KEY)
+    if context is None:
+        return _CONTEXT.get()
+    return context
+
+
+class ContextSnapshotFilter(logging.Filter):
+    """Snapshot the context of records, for handlers which format them later."""
+
+    def filter(self, record: logging.LogRecord) -> bool:  # noqa: A003
+        """Keep the current context on a record.
+
+        :param record: The record being logged.
+        :type record: logging.LogRecord
+        :return: Always `True`, every record is let through.
+        :rtype: bool
+        """
+        snapshot_context(record)
+        return True
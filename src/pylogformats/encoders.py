@@ -0,0 +1,164 @@
+"""Encode values which JSON has no type for.
+
+Extras can be any object, such as a `datetime.datetime` or a model instance,
+and without help the JSON serializers raise `TypeError` on them, losing the
+record. Every serializer in `pylogformats.serializers` hands such values to
+`encode_default`, which turns them into JSON compatible values:
+
+- `datetime.datetime`, `datetime.date` and `datetime.time` - ISO 8601 strings
+- `uuid.UUID` and `decimal.Decimal` - strings
+- `enum.Enum` - the member's value
+- dataclasses - objects of their fields
+- `set` and `frozenset` - arrays
+- `bytes` and `bytearray` - strings, decoded as UTF-8
+- exceptions - objects with ``exc_type`` and ``exc_message``
+- anything else - its ``repr``
+
+The encoder for a type is found once, by walking the type's method
+resolution order, and kept, so later values of the same type cost a dictionary
+lookup.
+
+The third party serializers encode some of these types natively, and so may
+write them differently, such as `msgspec` writing bytes as base64 and `ujson`
+writing decimals as numbers.
+
+>>> import datetime
+>>> import decimal
+>>> from pylogformats.encoders import encode_default
+>>>
+>>> encode_default(datetime.date(2020, 1, 31))
+'2020-01-31'
+>>> encode_default(decimal.Decimal("1.10"))
+'1.10'
+>>> encode_default(object())  # doctest: +ELLIPSIS
+'<object object at ...>'
+
+"""
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import uuid
+import weakref
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+
+Encoder = Callable[[Any], Any]
+
+
+def _encode_isoformat(value: Any) -> str:
+    result: str = value.isoformat()
+    return result
+
+
+def _encode_enum(value: enum.Enum) -> Any:
+    return value.value
+
+
+def _encode_dataclass(value: Any) -> Dict[str, Any]:
+    # Shallow, as nested values which need encoding come back here.
+    return {
+        field.name: getattr(value, field.name) for field in dataclasses.fields(value)
+    }
+
+
+def _encode_bytes(value: bytes) -> str:
+    return bytes(value).decode("utf-8", "backslashreplace")
+
+
+def _encode_exception(value: BaseException) -> Dict[str, str]:
+    try:
+        message: str = str(value)
+    except Exception:  # noqa: B902
+        message = f"<exception str() failed: {type(value).__name__}>"
+    return {"exc_type": type(value).__name__, "exc_message": message}
+
+
+def _encode_repr(value: Any, render: Callable[[Any], str] = repr) -> str:
+    try:
+        return render(value)
+    except Exception:  # noqa: B902
+        return f"<repr() failed: {type(value).__name__}>"
+
+
+# Encoders for a type and its subclasses, see `register_encoder`.
+ENCODERS: Dict[type, Encoder] = {
+    datetime.date: _encode_isoformat,
+    datetime.time: _encode_isoformat,
+    uuid.UUID: str,
+    decimal.Decimal: str,
+    enum.Enum: _encode_enum,
+    set: list,
+    frozenset: list,
+    bytes: _encode_bytes,
+    bytearray: _encode_bytes,
+    BaseException: _encode_exception,
+}
+
+# The encoder found for every exact type seen so far. Weakly keyed, so classes
+# created on the fly are not kept alive once they are gone.
+_RESOLVED: "weakref.WeakKeyDictionary[type, Encoder]" = weakref.WeakKeyDictionary()
+
+
+def _resolve(cls: type) -> Encoder:
+    for base in cls.__mro__:
+        if base in ENCODERS:
+            return ENCODERS[base]
+
+    if dataclasses.is_dataclass(cls):
+        return _encode_dataclass
+
+    return _encode_repr
+
+
+def encode_default(
+    value: Any, render_repr: Optional[Callable[[Any], str]] = None
+) -> Any:
+    """Turn a value JSON has no type for into one it has.
+
+    Serializers call this with the values they can not encode themselves.
+
+    :param value: The value to encode.
+    :type value: Any
+    :param render_repr: Renders the values encoded as their ``repr``, such as \
+`reprlib.Repr.repr` to bound their size. Defaults to `repr`.
+    :type render_repr: Callable[[Any], str] | None
+    :return: A JSON compatible value, which may need encoding in turn.
+    :rtype: Any
+    """
+    cls: type = type(value)
+    try:
+        encoder: Encoder = _RESOLVED[cls]
+    except KeyError:
+        encoder = _RESOLVED[cls] = _resolve(cls)
+    if render_repr is not None and encoder is _encode_repr:
+        return _encode_repr(value, render_repr)
+    return encoder(value)
+
+
+def register_encoder(cls: type, encoder: Encoder) -> None:
+    """Encode a type, and its subclasses, with a custom encoder.
+
+    >>> from pylogformats.encoders import encode_default
+    >>> from pylogformats.encoders import register_encoder
+    >>>
+    >>> class Point:
+    ...     def __init__(self, x, y):
+    ...         self.x, self.y = x, y
+    >>>
+    >>> register_encoder(Point, lambda point: [point.x, point.y])
+    >>> encode_default(Point(1, 2))
+    [1, 2]
+
+    :param cls: The type to encode.
+    :type cls: type
+    :param encoder: Called with each value of the type, returning a JSON \
+compatible value.
+    :type encoder: Callable[[Any], Any]
+    """
+    ENCODERS[cls] = encoder
+    _RESOLVED.clear()
@@ -0,0 +1,258 @@
+"""Precompiled JSON record layouts.
+
+A `FieldPlan` is compiled once from an ordered description of a JSON record:
+which keys it has, in which order, and how to read each value from a
+`logging.LogRecord`. Everything static, such as the keys, separators, nested
+object braces and constant values, is encoded at compile time, and fields
+which are plain record attributes are read together with a single
+`operator.attrgetter`. Formatting a record then only encodes the dynamic
+values and fills them into a template, instead of building a dictionary per
+record and serializing all of it.
+
+Third party serializers are fast enough at whole records that encoding
+values one call at a time costs more than it saves, see
+`pylogformats.serializers.Serializer.splices_values`. With those, the plan
+builds the dictionary from a compiled layout and serializes it in one call.
+
+>>> import logging
+>>> from pylogformats.fieldplan import FieldPlan
+>>> from pylogformats.fieldplan import Static
+>>> from pylogformats.serializers import StdlibSerializer
+>>>
+>>> plan = FieldPlan(
+...     [
+...         ("logger", "name"),
+...         ("location", [("line", "lineno")]),
+...         ("v", Static(1)),
+...     ],
+...     StdlibSerializer(),
+... )
+>>> record = logging.makeLogRecord({"name": "root", "lineno": 30})
+>>> plan.render(record, {"whatami": "An Extra"})
+'{"logger": "root", "location": {"line": 30}, "v": 1, "whatami": "An Extra"}'
+
+"""
+
+import logging
+from operator import attrgetter
+from operator import itemgetter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+from typing import cast
+
+from pylogformats.serializers import Serializer
+
+
+Accessor = Callable[[logging.LogRecord], Any]
+
+
+class Static:
+    """A value which is the same for every record, encoded once."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        """Wrap a constant value.
+
+        :param value: The JSON compatible value.
+        :type value: Any
+        """
+        self.value: Any = value
+
+
+# A field is a record attribute name, an accessor called with the record, a
+# constant, or a nested object.
+FieldSpec = Sequence[Tuple[str, Union[str, Accessor, Static, Sequence[Any]]]]
+
+
+class FieldPlan:
+    """An ordered JSON record layout, compiled against a serializer."""
+
+    __slots__ = (
+        "fields",
+        "serializer",
+        "keys",
+        "_build",
+        "_attributes",
+        "_accessors",
+        "_order",
+        "_template",
+        "_extras_template",
+    )
+
+    def __init__(self, fields: FieldSpec, serializer: Serializer) -> None:
+        """Compile the layout.
+
+        :param fields: ``(key, field)`` pairs in output order. A field is the \
+name of a record attribute, an accessor called with the record, a `Static` \
+value or a nested `FieldSpec`.
+        :type fields: FieldSpec
+        :param serializer: The serializer the output has to match.
+        :type serializer: Serializer
+        """
+        self.fields: FieldSpec = fields
+        self.serializer: Serializer = serializer
+        self.keys: FrozenSet[str] = frozenset(key for key, _ in fields)
+        self._build: Callable[[logging.LogRecord], Dict[str, Any]] = _builder(fields)
+
+        fragments: List[str] = [""]
+        slots: List[Union[str, Accessor]] = []
+        self._compile(fields, fragments, slots)
+
+        # Attribute values are read first, followed by the accessor values, and
+        # then put back into template order.
+        names: List[str] = [slot for slot in slots if isinstance(slot, str)]
+        accessors: List[Accessor] = [
+            slot for slot in slots if not isinstance(slot, str)
+        ]
+        order: List[int] = []
+        next_attribute: int = 0
+        next_accessor: int = len(names)
+        for slot in slots:
+            if isinstance(slot, str):
+                order.append(next_attribute)
+                next_attribute += 1
+            else:
+                order.append(next_accessor)
+                next_accessor += 1
+
+        self._attributes: Callable[[logging.LogRecord], Tuple[Any, ...]] = (
+            _attribute_reader(names)
+        )
+        self._accessors: Tuple[Accessor, ...] = tuple(accessors)
+        self._order: Optional[Callable[[Tuple[Any, ...]], Tuple[Any, ...]]] = (
+            None if order == sorted(order) else itemgetter(*order)
+        )
+
+        template: str = "%s".join(fragment.replace("%", "%%") for fragment in fragments)
+        self._template: str = template + "}"
+        self._extras_template: str = template + serializer.item_separator + "%s}"
+
+    def _compile(
+        self,
+        fields: FieldSpec,
+        fragments: List[str],
+        slots: List[Union[str, Accessor]],
+    ) -> None:
+        serializer: Serializer = self.serializer
+
+        fragments[-1] += "{"
+        for index, (key, field) in enumerate(fields):
+            if index:
+                fragments[-1] += serializer.item_separator
+            fragments[-1] += serializer.dumps(key) + serializer.key_separator
+
+            if isinstance(field, Static):
+                fragments[-1] += serializer.dumps(field.value)
+            elif isinstance(field, str) or callable(field):
+                slots.append(field)
+                fragments.append("")
+            else:
+                self._compile(cast(FieldSpec, field), fragments, slots)
+                fragments[-1] += "}"
+
+    def build(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Build the record as a dictionary, following the layout.
+
+        :param record: The record to read values from.
+        :type record: logging.LogRecord
+        :return: The record as nested dictionaries.
+        :rtype: Dict[str, Any]
+        """
+        return self._build(record)
+
+    def render(self, record: logging.LogRecord, extras: Dict[str, Any]) -> str:
+        """Render a record and its extras as a JSON string.
+
+        Extras are written after the planned fields. An extra which shares a key
+        with a planned field replaces its value in place, as it would in a
+        dictionary.
+
+        :param record: The record to read values from.
+        :type record: logging.LogRecord
+        :param extras: Additional top level keys and values.
+        :type extras: Dict[str, Any]
+        :return: The JSON string.
+        :rtype: str
+        """
+        if not self.serializer.splices_values or (
+            extras and not self.keys.isdisjoint(extras)
+        ):
+            built: Dict[str, Any] = self._build(record)
+            built.update(extras)
+            return self.serializer.dumps(built)
+
+        values: Tuple[Any, ...] = self._attributes(record) + tuple(
+            [accessor(record) for accessor in self._accessors]
+        )
+        if self._order is not None:
+            values = self._order(values)
+
+        encoded: List[str] = self.serializer.encode_values(values)
+        if not extras:
+            return self._template % tuple(encoded)
+
+        # Extras are serialized as an object of their own and spliced in.
+        encoded.append(self.serializer.dumps(extras)[1:-1])
+        return self._extras_template % tuple(encoded)
+
+    def render_bytes(self, record: logging.LogRecord, extras: Dict[str, Any]) -> bytes:
+        """Render a record and its extras as UTF-8 encoded JSON.
+
+        Backends which produce bytes serialize straight into them, rather than
+        into a string which is then encoded again.
+
+        :param record: The record to read values from.
+        :type record: logging.LogRecord
+        :param extras: Additional top level keys and values.
+        :type extras: Dict[str, Any]
+        :return: The JSON document.
+        :rtype: bytes
+        """
+        if self.serializer.native_bytes:
+            built: Dict[str, Any] = self._build(record)
+            built.update(extras)
+            return self.serializer.dumps_bytes(built)
+
+        return self.render(record, extras).encode("utf-8")
+
+
+def _attribute_reader(
+    names: List[str],
+) -> Callable[[logging.LogRecord], Tuple[Any, ...]]:
+    """Read every named attribute of a record into a tuple in one call."""
+    if len(names) > 1:
+        return attrgetter(*names)
+
+    if names:
+        getter = attrgetter(names[0])
+        return lambda record: (getter(record),)
+
+    return lambda record: ()
+
+
+def _builder(fields: FieldSpec) -> Callable[[logging.LogRecord], Dict[str, Any]]:
+    """Compile a layout into a function building it as a dictionary."""
+    getters: List[Tuple[str, Accessor]] = []
+    for key, field in fields:
+        if isinstance(field, Static):
+            getters.append((key, _constant(field.value)))
+        elif isinstance(field, str):
+            getters.append((key, attrgetter(field)))
+        elif callable(field):
+            getters.append((key, field))
+        else:
+            getters.append((key, _builder(cast(FieldSpec, field))))
+
+    return lambda record: {key: getter(record) for key, getter in getters}
+
+
+def _constant(value: Any) -> Accessor:
+    return lambda record: value
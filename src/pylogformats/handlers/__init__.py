@@ -0,0 +1,28 @@
+"""Logging handlers which work with the `pylogformats` formatters."""
+
+from .aggregate import AggregatedWriter
+from .aggregate import RecordShippingHandler
+from .asynchronous import AsyncioHandler
+from .asynchronous import AsyncTarget
+from .asynchronous import FileTarget
+from .asynchronous import StreamTarget
+from .buffered import BufferedFileHandler
+from .bytestream import BytesStreamHandler
+from .indexing import IndexingFileHandler
+from .queued import QueueFormatHandler
+from .rotating import CompressedRotatingFileHandler
+
+
+__all__ = [
+    "AggregatedWriter",
+    "AsyncTarget",
+    "AsyncioHandler",
+    "BufferedFileHandler",
+    "BytesStreamHandler",
+    "CompressedRotatingFileHandler",
+    "FileTarget",
+    "IndexingFileHandler",
+    "QueueFormatHandler",
+    "RecordShippingHandler",
+    "StreamTarget",
+]
@@ -0,0 +1,261 @@
+"""Aggregate the logs of many processes into a single writer process.
+
+Worker processes which all format and write to the same file interleave
+partial lines and contend on locks. With `AggregatedWriter`, workers only
+ship their records over a `multiprocessing` queue, using the handler from
+`AggregatedWriter.handler`. A single writer process formats them with any
+`pylogformats` formatter and writes them in large buffered writes.
+
+Records keep the process id and name of the worker which logged them, so
+formats such as `JsonFormat` show the origin process, not the writer.
+
+.. code-block:: python
+
+    writer = AggregatedWriter("app.log", JsonFormat)
+    writer.start()
+
+    # In every worker process.
+    logging.getLogger().addHandler(writer.handler())
+
+    # Once the workers are finished.
+    writer.stop()
+"""
+
+import logging
+import multiprocessing
+import pickle  # noqa: S403
+import queue
+import sys
+import traceback
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from pylogformats.baseline import BASELINE_KEYS
+from pylogformats.context import CONTEXT_KEY
+from pylogformats.context import record_context
+from pylogformats.message import MEMO_KEY
+from pylogformats.message import get_message
+
+
+# Formats exceptions into text, as tracebacks can not cross processes.
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class RecordShippingHandler(logging.Handler):
+    """Ship records to an `AggregatedWriter`, from any process."""
+
+    def __init__(self, records: Any, level: int = logging.NOTSET) -> None:
+        """Create the handler.
+
+        :param records: The writer's `multiprocessing` queue.
+        :type records: multiprocessing.Queue
+        :param level: The handler's level.
+        :type level: int
+        """
+        super().__init__(level)
+        self.records: Any = records
+
+    def prepare(self, record: logging.LogRecord) -> bytes:
+        """Pickle the state of a record which the writer needs.
+
+        The message is merged with its arguments and any exception is rendered
+        into ``exc_text``, as neither arguments nor tracebacks are guaranteed
+        to be picklable. The caller's `pylogformats.context` is kept with the
+        record. Extras and context values which can not be pickled are replaced
+        by their ``repr``.
+
+        :param record: The record being logged.
+        :type record: logging.LogRecord
+        :return: The pickled attributes of the record.
+        :rtype: bytes
+        """
+        state: Dict[str, Any] = dict(vars(record))
+        state.pop(MEMO_KEY, None)
+        state[CONTEXT_KEY] = record_context(record)
+        state["msg"] = get_message(record)
+        state["args"] = None
+        if record.exc_info:
+            if not record.exc_text:
+                state["exc_text"] = _EXCEPTION_FORMATTER.formatException(
+                    record.exc_info
+                )
+            state["exc_info"] = None
+
+        try:
+            return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: B902
+            for key, value in state.items():
+                if key not in BASELINE_KEYS:
+                    state[key] = _picklable(value)
+            state[CONTEXT_KEY] = {
+                key: _picklable(value) for key, value in state[CONTEXT_KEY].items()
+            }
+            return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Ship a record to the writer.
+
+        :param record: The record being logged.
+        :type record: logging.LogRecord
+        """
+        try:
+            self.records.put(self.prepare(record))
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:  # noqa: B902
+            self.handleError(record)
+
+
+def _picklable(value: Any) -> Any:
+    """Return the value if it can be pickled, or else its ``repr``."""
+    try:
+        pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except Exception:  # noqa: B902
+        return repr(value)
+    return value
+
+
+class AggregatedWriter:
+    """A process which formats and writes the records of other processes.
+
+    The formatter and the output file are created inside the writer process,
+    so ``formatter`` is a picklable callable returning the formatter, such as
+    a formatter class or a `functools.partial` of one.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        formatter: Callable[[], logging.Formatter],
+        buffer_size: int = 1 << 16,
+        batch_size: int = 1000,
+        context: Optional[Any] = None,
+    ) -> None:
+        """Set up the writer, without starting it.
+
+        :param filename: The file the records are appended to.
+        :type filename: str
+        :param formatter: Creates the formatter in the writer process.
+        :type formatter: Callable[[], logging.Formatter]
+        :param buffer_size: The size of the write buffer, in bytes.
+        :type buffer_size: int
+        :param batch_size: The most records formatted together.
+        :type batch_size: int
+        :param context: The `multiprocessing` context to create the queue and \
+process with, defaults to the default context.
+        :type context: multiprocessing.context.BaseContext | None
+        """
+        self.filename: str = filename
+        self.formatter: Callable[[], logging.Formatter] = formatter
+        self.buffer_size: int = buffer_size
+        self.batch_size: int = batch_size
+
+        self._context: Any = context or multiprocessing.get_context()
+        self.records: Any = self._context.Queue()
+        self.process: Optional[Any] = None
+
+    def handler(self, level: int = logging.NOTSET) -> RecordShippingHandler:
+        """Create a handler shipping records to this writer.
+
+        :param level: The handler's level.
+        :type level: int
+        :return: A handler for use in any process sharing the writer's queue.
+        :rtype: RecordShippingHandler
+        """
+        return RecordShippingHandler(self.records, level)
+
+    def start(self) -> None:
+        """Start the writer process."""
+        self.process = self._context.Process(
+            target=_write_records,
+            args=(
+                self.records,
+                self.filename,
+                self.formatter,
+                self.buffer_size,
+                self.batch_size,
+            ),
+            name="pylogformats-writer",
+            daemon=True,
+        )
+        self.process.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Write out the records shipped so far and stop the writer process.
+
+        :param timeout: How long to wait for the writer, or `None` to wait for \
+as long as it takes.
+        :type timeout: float | None
+        """
+        if self.process is None:
+            return
+
+        self.records.put(None)
+        self.process.join(timeout)
+        self.process = None
+
+
+def _write_records(
+    records: Any,
+    filename: str,
+    formatter_factory: Callable[[], logging.Formatter],
+    buffer_size: int,
+    batch_size: int,
+) -> None:
+    formatter: logging.Formatter = formatter_factory()
+
+    with open(filename, "ab", buffering=buffer_size) as output:
+        while True:
+            batch: List[Optional[bytes]] = [records.get()]
+            try:
+                while len(batch) < batch_size and batch[-1] is not None:
+                    batch.append(records.get_nowait())
+            except queue.Empty:
+                pass
+
+            stopping: bool = batch[-1] is None
+            _write_batch(
+                output,
+                formatter,
+                [
+                    logging.makeLogRecord(pickle.loads(data))  # noqa: S301
+                    for data in batch
+                    if data is not None
+                ],
+            )
+
+            if stopping:
+                return
+
+            # Flush once caught up, so records are not held back while idle.
+            if records.empty():
+                output.flush()
+
+
+def _write_batch(
+    output: BinaryIO, formatter: logging.Formatter, batch: List[logging.LogRecord]
+) -> None:
+    """Format a batch into one buffer, or record by record if that fails."""
+    format_batch = getattr(formatter, "format_batch", None)
+    try:
+        if format_batch is not None:
+            output.write(format_batch(batch, "utf-8"))
+        else:
+            output.write(
+                "".join([f"{formatter.format(record)}\n" for record in batch]).encode(
+                    "utf-8"
+                )
+            )
+        return
+    except Exception:  # noqa: B902
+        pass
+
+    for record in batch:
+        try:
+            output.write(f"{formatter.format(record)}\n".encode("utf-8"))
+        except Exception:  # noqa: B902
+            traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,358 @@
+"""A handler which writes from an `asyncio` event loop, without blocking it.
+
+A `logging.StreamHandler` writing to a slow pipe or socket blocks whichever
+thread logged, which in an `asyncio` service is the event loop. `AsyncioHandler`
+only snapshots each record and puts it on a bounded `asyncio.Queue`, from the
+loop or from any other thread. A task on the loop takes records off the
+queue in batches, formats each batch with the handler's formatter, and
+writes it through an `AsyncTarget`:
+
+- `StreamTarget` - a TCP or Unix socket, through `asyncio` streams, waiting
+  for the socket to drain after every batch.
+- `FileTarget` - a file, written in a worker thread.
+
+.. code-block:: python
+
+    async def main():
+        handler = AsyncioHandler(await StreamTarget.connect("127.0.0.1", 5170))
+        handler.setFormatter(AdvJsonFormat())
+        logging.getLogger().addHandler(handler)
+        try:
+            await serve()
+        finally:
+            await handler.aclose()
+
+When the target can not keep up, the queue fills and records are dropped and
+counted, rather than stalling the loop.
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import threading
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO
+from typing import Any
+from typing import Deque
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from pylogformats.context import snapshot_context
+from pylogformats.message import get_message
+from pylogformats.message import set_message
+
+
+# How many recent records the latency percentiles are taken over.
+LATENCY_SAMPLES = 4096
+
+
+class AsyncTarget(ABC):
+    """Somewhere `AsyncioHandler` writes formatted batches to."""
+
+    @abstractmethod
+    async def write(self, data: bytes) -> None:
+        """Write a batch, waiting until the target can take more.
+
+        :param data: The formatted records.
+        :type data: bytes
+        """
+
+    async def close(self) -> None:
+        """Close the target, once everything is written."""
+
+
+class StreamTarget(AsyncTarget):
+    """Write to an `asyncio.StreamWriter`, such as a TCP or Unix socket."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        """Create the target.
+
+        :param writer: The stream to write to. The target closes it.
+        :type writer: asyncio.StreamWriter
+        """
+        self.writer: asyncio.StreamWriter = writer
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> "StreamTarget":
+        """Connect to a TCP server.
+
+        :param host: The server's host name or address.
+        :type host: str
+        :param port: The server's port.
+        :type port: int
+        :return: A target writing to the connection.
+        :rtype: StreamTarget
+        """
+        _, writer = await asyncio.open_connection(host, port)
+        return cls(writer)
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> "StreamTarget":
+        """Connect to a Unix socket.
+
+        :param path: The socket's path.
+        :type path: str
+        :return: A target writing to the connection.
+        :rtype: StreamTarget
+        """
+        _, writer = await asyncio.open_unix_connection(path)
+        return cls(writer)
+
+    async def write(self, data: bytes) -> None:
+        """Write a batch, and wait for the socket's buffer to drain.
+
+        :param data: The formatted records.
+        :type data: bytes
+        """
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class FileTarget(AsyncTarget):
+    """Write to a file, in a worker thread so the loop never waits on the disk."""
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"], mode: str = "ab") -> None:
+        """Open the file.
+
+        :param path: The file to write to.
+        :type path: str | os.PathLike
+        :param mode: The binary mode to open it with.
+        :type mode: str
+        """
+        self.file: IO[bytes] = open(path, mode)
+        # A single thread keeps the writes in order.
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(1)
+
+    async def write(self, data: bytes) -> None:
+        """Write and flush a batch.
+
+        :param data: The formatted records.
+        :type data: bytes
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write, data
+        )
+
+    async def close(self) -> None:
+        """Close the file."""
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.file.close
+        )
+        self._executor.shutdown()
+
+    def _write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.file.flush()
+
+
+class AsyncioHandler(logging.Handler):
+    """Queue records from any thread, and write them from the event loop.
+
+    The handler counts the records it queued, wrote and dropped, in
+    `queued`, `written` and `dropped`. Each record's latency, from being
+    logged to being written, is kept for the latest `LATENCY_SAMPLES`
+    records, see `latency`.
+    """
+
+    def __init__(
+        self,
+        target: AsyncTarget,
+        maxsize: int = 10_000,
+        batch_size: int = 500,
+        level: Union[int, str] = logging.NOTSET,
+    ) -> None:
+        """Create the handler, and start writing on the running event loop.
+
+        :param target: Where the formatted records are written.
+        :type target: AsyncTarget
+        :param maxsize: The most records waiting to be written. Records logged \
+while the queue is full are dropped.
+        :type maxsize: int
+        :param batch_size: The most records formatted and written together.
+        :type batch_size: int
+        :param level: The handler's level.
+        :type level: int | str
+        :raises RuntimeError: When no event loop is running in this thread.
+        """
+        super().__init__(level)
+        self.target: AsyncTarget = target
+        self.batch_size: int = max(1, batch_size)
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        self.queued: int = 0
+        self.written: int = 0
+        self.dropped: int = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+        self._records: "asyncio.Queue[Optional[Tuple[float, logging.LogRecord]]]" = (
+            asyncio.Queue(maxsize)
+        )
+        self._loop_thread: int = threading.get_ident()
+        self._task: "asyncio.Task[None]" = self.loop.create_task(self._run())
+        self._closing: bool = False
+        self._closer: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of records waiting to be written.
+
+        :return: The queue size.
+        :rtype: int
+        """
+        return self._records.qsize()
+
+    def latency(self, percentile: float = 50) -> float:
+        """Return a percentile of the latency of recent records.
+
+        :param percentile: The percentile, from 0 to 100.
+        :type percentile: float
+        :return: The latency from logging a record to writing it, in seconds, \
+or 0 before any record is written.
+        :rtype: float
+        """
+        if not self.latencies:
+            return 0.0
+        samples: List[float] = sorted(self.latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Snapshot a record, merging its message with its arguments.
+
+        The arguments may change once the logging call returns, before the
+        record is formatted. The caller's `pylogformats.context` is kept on
+        the record.
+
+        :param record: The record being logged.
+        :type record: logging.LogRecord
+        :return: A shallow copy of the record, with the message merged.
+        :rtype: logging.LogRecord
+        """
+        message: str = get_message(record)
+
+        record = copy.copy(record)
+        snapshot_context(record)
+        set_message(record, message)
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record, to be written on the event loop.
+
+        :param record: The record to write.
+        :type record: logging.LogRecord
+        """
+        try:
+            item: Tuple[float, logging.LogRecord] = (
+                time.perf_counter(),
+                self.prepare(record),
+            )
+            if threading.get_ident() == self._loop_thread:
+                self._enqueue(item)
+            else:
+                self.loop.call_soon_threadsafe(self._enqueue, item)
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:  # noqa: B902
+            self.handleError(record)
+
+    def format_batch(self, records: List[logging.LogRecord]) -> bytes:
+        """Format records into a single buffer, one record per line.
+
+        :param records: The records to format.
+        :type records: List[logging.LogRecord]
+        :return: The formatted records, encoded as UTF-8.
+        :rtype: bytes
+        """
+        format_batch: Any = getattr(self.formatter, "format_batch", None)
+        if format_batch is not None:
+            data: bytes = format_batch(records, "utf-8")
+            return data
+        return "".join(f"{self.format(record)}\n" for record in records).encode()
+
+    async def drain(self) -> None:
+        """Wait until every record queued so far is written."""
+        await self._records.join()
+
+    async def aclose(self) -> None:
+        """Write out the queued records, stop, and close the target."""
+        if not self._closing:
+            self._closing = True
+            await self._records.put(None)
+            await self._task
+            await self.target.close()
+        super().close()
+
+    def close(self) -> None:
+        """Write out the queued records and stop, from outside the loop.
+
+        `logging.shutdown` calls this on exit. From another thread, it waits
+        for the loop to write out the queue. On the loop's own thread it can
+        not wait, and only schedules it, so prefer awaiting `aclose`.
+        """
+        if self._closing or self.loop.is_closed():
+            super().close()
+        elif self.loop.is_running():
+            if threading.get_ident() == self._loop_thread:
+                self._closer = self.loop.create_task(self.aclose())
+            else:
+                asyncio.run_coroutine_threadsafe(self.aclose(), self.loop).result()
+        else:
+            self.loop.run_until_complete(self.aclose())
+
+    def _enqueue(self, item: Tuple[float, logging.LogRecord]) -> None:
+        if self._closing:
+            self.dropped += 1
+            return
+        try:
+            self._records.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+        self.queued += 1
+
+    async def _run(self) -> None:
+        records: "asyncio.Queue[Optional[Tuple[float, logging.LogRecord]]]" = (
+            self._records
+        )
+        stopping: bool = False
+        while not stopping:
+            batch: List[Tuple[float, logging.LogRecord]] = []
+            item: Optional[Tuple[float, logging.LogRecord]] = await records.get()
+            while True:
+                if item is None:
+                    stopping = True
+                    records.task_done()
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size or records.empty():
+                    break
+                item = records.get_nowait()
+
+            if batch:
+                await self._write(batch)
+                for _ in batch:
+                    records.task_done()
+
+    async def _write(self, batch: List[Tuple[float, logging.LogRecord]]) -> None:
+        log_records: List[logging.LogRecord] = [record for _, record in batch]
+        try:
+            await self.target.write(self.format_batch(log_records))
+        except Exception:  # noqa: B902
+            self.dropped += len(batch)
+            self.handleError(log_records[0])
+            return
+
+        self.written += len(batch)
+        now: float = time.perf_counter()
+        self.latencies.extend(now - queued for queued, _ in batch)
@@ -0,0 +1,237 @@
+"""A file handler which writes records in large chunks, rather than one by one.
+
+`logging.FileHandler` writes and flushes every record, a system call or two
+per record. `BufferedFileHandler` copies formatted records into a buffer
+allocated once, and writes the buffer to the file in a single vectored
+``os.writev`` call when any of these happen:
+
+- The buffer is full, that is ``buffer_size`` bytes are waiting.
+- ``max_records`` records are waiting.
+- ``interval`` seconds have passed, checked by a background thread.
+- A record at ``flush_level`` or above, `logging.ERROR` by default, is logged,
+  so errors reach the file straight away.
+
+Whatever is left in the buffer is written when the handler is flushed or
+closed, and at interpreter exit, even if the handler was never closed.
+
+.. code-block:: python
+
+    from pylogformats import JsonFormat
+    from pylogformats.handlers import BufferedFileHandler
+
+    handler = BufferedFileHandler("app.log", buffer_size=256 * 1024)
+    handler.setFormatter(JsonFormat())
+"""
+
+import atexit
+import functools
+import logging
+import os
+import sys
+import threading
+import traceback
+import weakref
+from typing import Callable
+from typing import Optional
+from typing import Union
+
+from pylogformats.handlers.bytestream import Buffer
+from pylogformats.handlers.bytestream import BytesStreamHandler
+from pylogformats.handlers.bytestream import _write_fd
+
+
+# The flags a log file is opened with, for each mode.
+_MODES = {
+    "a": os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+    "w": os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+}
+
+# How often the timer checks whether the handler is closing, while it waits
+# for the handler's lock.
+_LOCK_POLL = 0.05
+
+
+class BufferedFileHandler(BytesStreamHandler):
+    """Write records to a file, in large chunks held in a fixed buffer."""
+
+    def __init__(
+        self,
+        filename: Union[str, "os.PathLike[str]"],
+        mode: str = "a",
+        buffer_size: int = 64 * 1024,
+        max_records: int = 1000,
+        interval: Optional[float] = 1.0,
+        flush_level: int = logging.ERROR,
+        level: Union[int, str] = logging.NOTSET,
+    ) -> None:
+        """Open the file, and start flushing it every ``interval`` seconds.
+
+        :param filename: The log file.
+        :type filename: str | os.PathLike
+        :param mode: ``"a"`` to add to the file, or ``"w"`` to replace it.
+        :type mode: str
+        :param buffer_size: The size of the buffer in bytes. Records which do \
+not fit in it are written straight away, after the buffer.
+        :type buffer_size: int
+        :param max_records: The most records held in the buffer.
+        :type max_records: int
+        :param interval: The most seconds a record is held in the buffer, or \
+`None` to not flush on a timer.
+        :type interval: float | None
+        :param flush_level: Records at this level or above are written \
+straight away, with everything before them.
+        :type flush_level: int
+        :param level: The handler's level.
+        :type level: int | str
+        :raises ValueError: When the mode is not ``"a"`` or ``"w"``.
+        """
+        if mode not in _MODES:
+            raise ValueError(f"mode must be 'a' or 'w', not {mode!r}")
+
+        self.baseFilename: str = os.path.abspath(os.fspath(filename))
+        self.fd: int = os.open(
+            self.baseFilename, _MODES[mode] | getattr(os, "O_BINARY", 0), 0o666
+        )
+        super().__init__(self.fd, level)
+        self.buffer_size: int = max(1, buffer_size)
+        self.max_records: int = max(1, max_records)
+        self.interval: Optional[float] = interval
+        self.flush_level: int = flush_level
+
+        self._buffer: memoryview = memoryview(bytearray(self.buffer_size))
+        self._used: int = 0
+        self._records: int = 0
+        self._closed: bool = False
+
+        # Neither the exit hook nor the timer keep the handler alive.
+        self._at_exit: Callable[[], None] = functools.partial(
+            _flush_at_exit, weakref.ref(self)
+        )
+        atexit.register(self._at_exit)
+        self._stop: threading.Event = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if interval is not None:
+            self._timer = threading.Thread(
+                target=_flush_periodically,
+                args=(weakref.ref(self), self._stop, interval),
+                name="pylogformats-flusher",
+                daemon=True,
+            )
+            self._timer.start()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of bytes waiting in the buffer.
+
+        :return: The bytes not written yet.
+        :rtype: int
+        """
+        return self._used
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Add a record to the buffer, and write the buffer out if it is due.
+
+        :param record: The record to write.
+        :type record: logging.LogRecord
+        """
+        try:
+            if self._closed:
+                raise ValueError("I/O operation on closed file")
+
+            data: bytes = self.format_bytes(record)
+            end: int = self._used + len(data) + len(self.terminator)
+            if end > self.buffer_size:
+                # The record is written from where it is, after the buffer.
+                self._write_out(data, self.terminator)
+                return
+
+            self._buffer[self._used : end - len(self.terminator)] = data
+            self._buffer[end - len(self.terminator) : end] = self.terminator
+            self._used = end
+            self._records += 1
+            if self._records >= self.max_records or record.levelno >= self.flush_level:
+                self._write_out()
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:  # noqa: B902
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Write out the buffer."""
+        self.acquire()
+        try:
+            if not self._closed:
+                self._write_out()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Write out the buffer, and close the file.
+
+        The caller may hold the handler's lock, as `logging.shutdown` does.
+        The timer gives up waiting for the lock once the handler is closing.
+        """
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+        atexit.unregister(self._at_exit)
+
+        self.acquire()
+        try:
+            if not self._closed:
+                self._closed = True
+                try:
+                    self._write_out()
+                finally:
+                    os.close(self.fd)
+        finally:
+            self.release()
+            super().close()
+
+    def _flush_on_timer(self) -> None:
+        """Write out the buffer, unless the handler is closed while waiting."""
+        while not (self.lock is None or self.lock.acquire(timeout=_LOCK_POLL)):
+            if self._stop.is_set():
+                return
+        try:
+            if not self._closed:
+                self._write_out()
+        finally:
+            self.release()
+
+    def _write_out(self, *chunks: Buffer) -> None:
+        # The buffer is emptied first, so a failed write is not repeated with
+        # every later record.
+        used: int = self._used
+        self._used = 0
+        self._records = 0
+        if used:
+            chunks = (self._buffer[:used],) + chunks
+        if chunks:
+            _write_fd(self.fd, chunks)
+
+
+def _flush_at_exit(reference: "weakref.ReferenceType[BufferedFileHandler]") -> None:
+    handler: Optional[BufferedFileHandler] = reference()
+    if handler is not None:
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            # As in `logging.shutdown`, the file may already be gone.
+            pass
+
+
+def _flush_periodically(
+    reference: "weakref.ReferenceType[BufferedFileHandler]",
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    while not stop.wait(interval):
+        handler: Optional[BufferedFileHandler] = reference()
+        if handler is None:
+            return
+        try:
+            handler._flush_on_timer()
+        except Exception:  # noqa: B902
+            traceback.print_exc(file=sys.stderr)
+        del handler
@@ -0,0 +1,114 @@
+"""A handler which writes bytes to a file descriptor or binary stream.
+
+`logging.StreamHandler` writes formatted strings to a text stream, which
+encodes them again. `BytesStreamHandler` asks formatters with a
+``format_bytes`` method, such as the `pylogformats` JSON formatters, for
+bytes, and writes those to a raw file descriptor or a binary stream as they
+are.
+
+>>> import io
+>>> import logging
+>>> from pylogformats import JsonFormat
+>>> from pylogformats.handlers import BytesStreamHandler
+>>>
+>>> buffer = io.BytesIO()
+>>> handler = BytesStreamHandler(buffer)
+>>> handler.setFormatter(JsonFormat())
+>>> handler.handle(logging.makeLogRecord({"name": "root", "msg": "Bytes"}))
+True
+>>> buffer.getvalue().startswith(b'{"logger": "root"')
+True
+
+"""
+
+import logging
+import os
+from typing import BinaryIO
+from typing import Sequence
+from typing import Union
+
+
+# The chunks written by `_write_fd`.
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class BytesStreamHandler(logging.Handler):
+    """Write formatted records, as bytes, to a file descriptor or binary stream.
+
+    :cvar terminator: Written after every record.
+    :cvar encoding: Encodes the output of formatters without ``format_bytes``.
+    """
+
+    terminator: bytes = b"\n"
+    encoding: str = "utf-8"
+
+    def __init__(
+        self, target: Union[int, BinaryIO], level: Union[int, str] = logging.NOTSET
+    ) -> None:
+        """Create the handler.
+
+        :param target: A file descriptor, such as ``1`` for standard output, or \
+a binary stream with a ``write`` method. The handler does not close it.
+        :type target: int | BinaryIO
+        :param level: The handler's level.
+        :type level: int | str
+        """
+        super().__init__(level)
+        self.target: Union[int, BinaryIO] = target
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format a record into bytes.
+
+        :param record: The record to format.
+        :type record: logging.LogRecord
+        :return: The formatted record, without the terminator.
+        :rtype: bytes
+        """
+        format_bytes = getattr(self.formatter, "format_bytes", None)
+        if format_bytes is not None:
+            data: bytes = format_bytes(record)
+            return data
+
+        return self.format(record).encode(self.encoding)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record.
+
+        :param record: The record to write.
+        :type record: logging.LogRecord
+        """
+        try:
+            data: bytes = self.format_bytes(record)
+            if isinstance(self.target, int):
+                _write_fd(self.target, [data, self.terminator])
+            else:
+                self.target.write(data)
+                self.target.write(self.terminator)
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:  # noqa: B902
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Flush the stream, if it has a ``flush`` method."""
+        self.acquire()
+        try:
+            flush = getattr(self.target, "flush", None)
+            if flush is not None:
+                flush()
+        finally:
+            self.release()
+
+
+def _write_fd(fd: int, chunks: Sequence[Buffer]) -> None:
+    """Write chunks in order, without joining them first."""
+    if hasattr(os, "writev"):
+        written: int = os.writev(fd, chunks)
+    else:  # pragma: no cover
+        written = os.write(fd, b"".join(chunks))
+
+    # Writes to pipes and sockets may be partial.
+    if written < sum(len(chunk) for chunk in chunks):
+        remaining: memoryview = memoryview(b"".join(chunks))[written:]
+        while remaining:
+            remaining = remaining[os.write(fd, remaining) :]
@@ -0,0 +1,114 @@
+"""A file handler which keeps a time index of the file it writes.
+
+`IndexingFileHandler` is a `logging.FileHandler` which also writes the
+sidecar index `pylogformats.parse.read_window` seeks with, so windows of
+time can be read from the file straight away, without `build_index`
+reading it all first.
+
+.. code-block:: python
+
+    from pylogformats import AdvJsonFormat
+    from pylogformats.handlers import IndexingFileHandler
+
+    handler = IndexingFileHandler("app.log", every=1000)
+    handler.setFormatter(AdvJsonFormat())
+"""
+
+import logging
+import os
+from typing import Optional
+from typing import TextIO
+from typing import Union
+
+from pylogformats.parse.index import INDEX_HEADER
+from pylogformats.parse.index import format_entry
+from pylogformats.parse.index import index_path
+
+
+class IndexingFileHandler(logging.FileHandler):
+    """Write records to a file, and the offset of every few to its index."""
+
+    def __init__(
+        self,
+        filename: Union[str, "os.PathLike[str]"],
+        mode: str = "a",
+        encoding: Optional[str] = "utf-8",
+        delay: bool = False,
+        every: int = 1000,
+    ) -> None:
+        """Create the handler.
+
+        :param filename: The log file. Its index is the same name with \
+``.idx`` added.
+        :type filename: str | os.PathLike
+        :param mode: ``"a"`` to add to the file and its index, or ``"w"`` to \
+replace both.
+        :type mode: str
+        :param encoding: The encoding of the log file.
+        :type encoding: str | None
+        :param delay: Open the files on the first record rather than now.
+        :type delay: bool
+        :param every: The number of records between index entries.
+        :type every: int
+        """
+        self.every: int = every
+        self.index: Optional[TextIO] = None
+        self._countdown: int = 0
+        super().__init__(filename, mode, encoding, delay)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record, and an index entry for every so many records.
+
+        :param record: The record to write.
+        :type record: logging.LogRecord
+        """
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.index is None:
+                self.index = self._open_index()
+
+            offset: Optional[int] = None
+            if self._countdown <= 0:
+                # The file's position is only exact in bytes once it is flushed.
+                self.stream.flush()
+                offset = self.stream.tell()
+
+            # Written here rather than by `logging.StreamHandler.emit`, which
+            # handles its own errors, so the entry only follows a record which
+            # was written.
+            msg: str = self.format(record)
+            self.stream.write(msg + self.terminator)
+            self.flush()
+
+            if offset is not None:
+                self.index.write(format_entry(record.created, offset))
+                self.index.flush()
+                self._countdown = self.every
+            self._countdown -= 1
+        except RecursionError:  # pragma: no cover
+            raise
+        except Exception:  # noqa: B902
+            self.handleError(record)
+
+    def close(self) -> None:
+        """Close the log file and its index."""
+        self.acquire()
+        try:
+            if self.index is not None:
+                self.index.close()
+                self.index = None
+        finally:
+            self.release()
+            super().close()
+
+    def _open_index(self) -> TextIO:
+        # Entries hold absolute offsets, so an index started part way through
+        # a file is still correct, it only covers the records after it.
+        path: str = index_path(self.baseFilename)
+        self._countdown = 0
+        if self.mode == "w" or not os.path.exists(path):
+            index: TextIO = open(path, "w", encoding="ascii")
+            index.write(INDEX_HEADER)
+            return index
+        return open(path, "a", encoding="ascii")
@@ -0,0 +1,196 @@
+"""A handler which formats and writes records in a background thread.
+
+`QueueFormatHandler` only snapshots each record on the logging caller's
+thread and puts it on a bounded queue. A `logging.handlers.QueueListener`
+thread takes records off the queue and passes them to the wrapped handlers,
+which format them with their own formatters, such as any formatter from
+`pylogformats`, and write them out.
+
+>>> import io
+>>> import logging
+>>> from pylogformats import JsonFormat
+>>> from pylogformats.handlers import QueueFormatHandler
+>>>
+>>> stream = logging.StreamHandler(io.StringIO())
+>>> stream.setFormatter(JsonFormat())
+>>> handler = QueueFormatHandler(stream, maxsize=1000, overflow="drop")
+>>> logging.getLogger("queued").addHandler(handler)
+>>> logging.getLogger("queued").warning("Formatted in the background")
+>>> handler.close()
+>>> handler.queued, handler.dropped
+(1, 0)
+
+"""
+
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from typing import Any
+from typing import Optional
+
+from pylogformats.context import snapshot_context
+from pylogformats.message import get_message
+from pylogformats.message import set_message
+
+
+# What to do with a record when the queue is full.
+OVERFLOW_POLICIES = ("drop", "block", "sample")
+
+
+class _Listener(QueueListener):
+    """A `QueueListener` which can be stopped while its queue is full."""
+
+    def enqueue_sentinel(self) -> None:
+        """Wait for room for the sentinel, rather than failing on a full queue."""
+        records: Any = self.queue
+        # `None` is the sentinel `QueueListener` stops on.
+        records.put(None)
+
+    def stop(self) -> None:
+        """Write out the records still on the queue and stop the thread, once."""
+        if self._thread is not None:
+            super().stop()
+
+
+class QueueFormatHandler(QueueHandler):
+    """Hand records to other handlers, which run in a background thread.
+
+    The handler keeps count of the records it queued and the records it
+    dropped, in `queued` and `dropped`. Both are updated while holding the
+    handler's lock.
+
+    Overflow policies, for when the queue is full:
+
+    - ``"drop"`` - drop the record.
+    - ``"block"`` - wait up to ``timeout`` seconds for room, then drop it.
+    - ``"sample"`` - once the queue is half full, keep only one in every \
+``sample_every`` records, and drop the rest. Drop every record while it is full.
+    """
+
+    def __init__(
+        self,
+        *handlers: logging.Handler,
+        maxsize: int = 10_000,
+        overflow: str = "drop",
+        timeout: Optional[float] = None,
+        sample_every: int = 10,
+        respect_handler_level: bool = False,
+        defer_messages: bool = False,
+    ) -> None:
+        """Create the queue and start the background thread.
+
+        :param handlers: The handlers which format and write the records.
+        :type handlers: logging.Handler
+        :param maxsize: The most records the queue holds, or 0 for no limit.
+        :type maxsize: int
+        :param overflow: One of `OVERFLOW_POLICIES`.
+        :type overflow: str
+        :param timeout: How long the ``"block"`` policy waits, or `None` to wait \
+for as long as it takes.
+        :type timeout: float | None
+        :param sample_every: How many records the ``"sample"`` policy keeps one of.
+        :type sample_every: int
+        :param respect_handler_level: Check the level of each handler before \
+passing it a record, as `logging.handlers.QueueListener` does.
+        :type respect_handler_level: bool
+        :param defer_messages: Leave merging the message with its arguments to \
+the background thread, once a record has passed the filters of the wrapped \
+handlers. Only safe when the arguments are not changed after logging, such as \
+with `pylogformats.message.lazy` arguments.
+        :type defer_messages: bool
+        :raises ValueError: When the overflow policy is not known.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}, expected one of "
+                f"{', '.join(OVERFLOW_POLICIES)}"
+            )
+
+        records: "queue.Queue[Any]" = queue.Queue(maxsize)
+        super().__init__(records)
+        self._records: "queue.Queue[Any]" = records
+        self.maxsize: int = maxsize
+        self.overflow: str = overflow
+        self.timeout: Optional[float] = timeout
+        self.sample_every: int = max(1, sample_every)
+        self.defer_messages: bool = defer_messages
+
+        self.queued: int = 0
+        self.dropped: int = 0
+        self._sampled: int = 0
+
+        self.listener: QueueListener = _Listener(
+            records, *handlers, respect_handler_level=respect_handler_level
+        )
+        self.listener.start()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of records waiting on the queue.
+
+        :return: The approximate queue size.
+        :rtype: int
+        """
+        return self._records.qsize()
+
+    def prepare(self, record: logging.LogRecord) -> Any:
+        """Snapshot the state of a record the background thread needs.
+
+        The message is merged with its arguments on the caller's thread, since
+        the arguments may change once the logging call returns, unless
+        ``defer_messages`` is set. The caller's `pylogformats.context` is kept
+        on the record. The rest of the record, including
+        ``exc_info``, is passed on unchanged as only handlers in the same
+        process read it.
+
+        :param record: The record being logged.
+        :type record: logging.LogRecord
+        :return: A shallow copy of the record, with the message merged.
+        :rtype: logging.LogRecord
+        """
+        if self.defer_messages:
+            record = copy.copy(record)
+            snapshot_context(record)
+            return record
+
+        message: str = get_message(record)
+
+        record = copy.copy(record)
+        snapshot_context(record)
+        set_message(record, message)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, following the overflow policy.
+
+        :param record: The prepared record.
+        :type record: logging.LogRecord
+        """
+        if self.overflow == "sample" and self._records.qsize() * 2 >= self.maxsize > 0:
+            self._sampled += 1
+            if self._sampled % self.sample_every:
+                self.dropped += 1
+                return
+
+        try:
+            if self.overflow == "block":
+                self._records.put(record, timeout=self.timeout)
+            else:
+                self._records.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        self.queued += 1
+
+    def close(self) -> None:
+        """Write out the records still on the queue and stop the thread."""
+        self.acquire()
+        try:
+            self.listener.stop()
+        finally:
+            self.release()
+
+        super().close()
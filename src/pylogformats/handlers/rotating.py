@@ -0,0 +1,354 @@
+"""A rotating file handler which compresses the files it rotates out.
+
+`CompressedRotatingFileHandler` writes to a log file and, once the file
+reaches ``max_bytes`` or every ``interval`` seconds, renames it after the
+time it was rotated, such as ``app.log.20210204-140000``, and starts a new
+one. Rotated files are compressed, with any `pylogformats.compression`
+codec, in a background thread, so the thread which logged never waits for
+the compression. Only the newest ``backup_count`` compressed files are kept.
+
+With ``compress_active=True`` the file being written, ``app.log.gz`` with
+gzip, is compressed as it is written instead, and rotating only renames it.
+Every ``sync_interval`` seconds, and whenever the handler is flushed, the
+compressed stream is ended and a new one started, so everything logged before
+that point can be read back, even if the process dies.
+
+.. code-block:: python
+
+    from pylogformats import BunyanFormat
+    from pylogformats.handlers import CompressedRotatingFileHandler
+
+    handler = CompressedRotatingFileHandler(
+        "app.log", max_bytes=100 * 1024 * 1024, backup_count=30
+    )
+    handler.setFormatter(BunyanFormat())
+"""
+
+import io
+import logging
+import logging.handlers
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import BinaryIO
+from typing import List
+from typing import Match
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from pylogformats.compression import Codec
+from pylogformats.compression import get_codec
+
+
+# The time rotated files are named after.
+_STAMP_FORMAT = "%Y%m%d-%H%M%S"
+
+# How often the timer checks whether the handler is closing, while it waits
+# for the handler's lock.
+_LOCK_POLL = 0.05
+
+
+class _CompressingWriter(io.RawIOBase):
+    """Compresses everything written to it into a file."""
+
+    def __init__(self, output: BinaryIO, codec: Codec) -> None:
+        self.output: BinaryIO = output
+        self.codec: Codec = codec
+        self._compressor: Any = codec.compressor()
+        self._pending: bool = False
+
+    def writable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self.output.fileno()
+
+    def write(self, data: Any) -> int:
+        self.output.write(self._compressor.compress(data))
+        self._pending = True
+        return len(data)
+
+    def sync(self) -> None:
+        """End the compressed stream, so all of it so far can be read back."""
+        if self._pending:
+            self.output.write(self._compressor.flush())
+            self.output.flush()
+            self._compressor = self.codec.compressor()
+            self._pending = False
+
+    def close(self) -> None:
+        try:
+            self.sync()
+        finally:
+            self.output.close()
+            super().close()
+
+
+class CompressedRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """Rotate log files by size or time, and compress them in the background."""
+
+    def __init__(
+        self,
+        filename: Union[str, "os.PathLike[str]"],
+        max_bytes: int = 0,
+        interval: Optional[float] = None,
+        backup_count: int = 0,
+        compression: Union[str, Codec] = "gzip",
+        compress_active: bool = False,
+        sync_interval: float = 1.0,
+        encoding: Optional[str] = "utf-8",
+        delay: bool = False,
+    ) -> None:
+        """Create the handler.
+
+        :param filename: The log file.
+        :type filename: str | os.PathLike
+        :param max_bytes: Rotate once the file is this large, or ``0`` to not \
+rotate by size. With ``compress_active``, this is the compressed size.
+        :type max_bytes: int
+        :param interval: Rotate every so many seconds, counted from the epoch \
+so that hourly files start on the hour, or `None` to not rotate by time.
+        :type interval: float | None
+        :param backup_count: How many rotated files to keep, or ``0`` to keep \
+them all.
+        :type backup_count: int
+        :param compression: The codec, or its name, see \
+`pylogformats.compression.get_codec`.
+        :type compression: str | Codec
+        :param compress_active: Compress the file while it is written, rather \
+than once it is rotated.
+        :type compress_active: bool
+        :param sync_interval: With ``compress_active``, the most seconds \
+between the points the compressed file can be read up to, kept by a \
+background thread.
+        :type sync_interval: float
+        :param encoding: The encoding of the log file.
+        :type encoding: str | None
+        :param delay: Open the file on the first record rather than now.
+        :type delay: bool
+        """
+        self.codec: Codec = get_codec(compression)
+        self.max_bytes: int = max_bytes
+        self.interval: Optional[float] = interval
+        self.backup_count: int = backup_count
+        self.compress_active: bool = compress_active
+        self.sync_interval: float = sync_interval
+
+        # A single thread compresses one file at a time, in order, and prunes
+        # the files rotated out after each.
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            1, thread_name_prefix="pylogformats-compress"
+        )
+        self._writer: Optional[_CompressingWriter] = None
+        self._sync_at: float = 0.0
+        self._emitting: bool = False
+        self.rollover_at: float = self._next_rollover(time.time())
+        super().__init__(filename, "a", encoding, delay)
+
+        # The timer does not keep the handler alive.
+        self._stop: threading.Event = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if compress_active and sync_interval > 0:
+            self._timer = threading.Thread(
+                target=_sync_periodically,
+                args=(weakref.ref(self), self._stop, sync_interval),
+                name="pylogformats-sync",
+                daemon=True,
+            )
+            self._timer.start()
+
+    @property
+    def active_path(self) -> str:
+        """Return the path of the file being written.
+
+        :return: The log file's name, with the codec's suffix when the file is \
+compressed as it is written.
+        :rtype: str
+        """
+        if self.compress_active:
+            return self.baseFilename + self.codec.suffix
+        return self.baseFilename
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802
+        """Decide whether to rotate before writing a record.
+
+        :param record: The record about to be written.
+        :type record: logging.LogRecord
+        :return: Whether the file is due to be rotated.
+        :rtype: bool
+        """
+        if record.created >= self.rollover_at:
+            # The next interval follows on from the record's, so records
+            # logged with times of their own are rotated by those times.
+            self.rollover_at = self._next_rollover(record.created)
+            return True
+        if self.max_bytes and self.stream is not None:
+            # Records are flushed as they are written, so the file's size is
+            # up to date without seeking the stream.
+            return os.fstat(self.stream.fileno()).st_size >= self.max_bytes
+        return False
+
+    def doRollover(self) -> None:  # noqa: N802
+        """Rotate the file, and compress and prune the rotated files."""
+        now: float = time.time()
+        self.rollover_at = max(self.rollover_at, self._next_rollover(now))
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        source: str = self.active_path
+        segment: Optional[str] = None
+        if os.path.exists(source) and os.path.getsize(source):
+            segment = self._segment_name(now)
+            self.rotate(
+                source, segment + self.codec.suffix if self.compress_active else segment
+            )
+        self._executor.submit(self._compress, None if self.compress_active else segment)
+
+        if not self.delay:
+            self.stream = self._open()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record, rotating first if it is due.
+
+        :param record: The record to write.
+        :type record: logging.LogRecord
+        """
+        # Writing a record flushes the handler, which must not sync.
+        self._emitting = True
+        try:
+            super().emit(record)
+        finally:
+            self._emitting = False
+        if self._writer is None or time.monotonic() < self._sync_at:
+            return
+        try:
+            self._sync()
+        except Exception:  # noqa: B902
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Flush the file, ending the compressed stream with ``compress_active``.
+
+        Everything logged before flushing can be read back from the file.
+        """
+        self.acquire()
+        try:
+            super().flush()
+            if not self._emitting:
+                self._sync()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Close the file, and wait for the rotated files to be compressed.
+
+        The caller may hold the handler's lock, as `logging.shutdown` does.
+        The timer gives up waiting for the lock once the handler is closing.
+        """
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+        try:
+            super().close()
+        finally:
+            self._executor.shutdown()
+
+    def _sync(self) -> None:
+        if self._writer is not None and not self._writer.closed:
+            self._writer.sync()
+            self._sync_at = time.monotonic() + self.sync_interval
+
+    def _sync_on_timer(self) -> None:
+        """End the compressed stream, unless the handler is closed while waiting."""
+        while not (self.lock is None or self.lock.acquire(timeout=_LOCK_POLL)):
+            if self._stop.is_set():
+                return
+        try:
+            self._sync()
+        finally:
+            self.release()
+
+    def _open(self) -> Any:
+        if not self.compress_active:
+            return super()._open()
+
+        self._writer = _CompressingWriter(open(self.active_path, "ab"), self.codec)
+        self._sync_at = time.monotonic() + self.sync_interval
+        return io.TextIOWrapper(
+            self._writer,
+            encoding=self.encoding,
+            errors=getattr(self, "errors", None),
+            write_through=True,
+        )
+
+    def _next_rollover(self, now: float) -> float:
+        if not self.interval:
+            return float("inf")
+        return (now // self.interval + 1) * self.interval
+
+    def _segment_name(self, now: float) -> str:
+        """Name a rotated file after the time, without taking an existing name."""
+        stamp: str = time.strftime(_STAMP_FORMAT, time.localtime(now))
+        name: str = f"{self.baseFilename}.{stamp}"
+        segment: str = name
+        number: int = 0
+        while os.path.exists(segment) or os.path.exists(segment + self.codec.suffix):
+            number += 1
+            segment = f"{name}_{number}"
+        return segment
+
+    def _compress(self, segment: Optional[str]) -> None:
+        try:
+            if segment is not None:
+                # Written under a temporary name, so a compressed file is
+                # never seen half written.
+                partial: str = f"{segment}{self.codec.suffix}.tmp"
+                self.codec.compress_file(segment, partial)
+                os.replace(partial, segment + self.codec.suffix)
+                os.remove(segment)
+            self._prune()
+        except Exception:  # noqa: B902
+            traceback.print_exc(file=sys.stderr)
+
+    def _prune(self) -> None:
+        if self.backup_count <= 0:
+            return
+
+        directory, base = os.path.split(self.baseFilename)
+        pattern = re.compile(
+            rf"{re.escape(base)}\.(\d{{8}}-\d{{6}})(?:_(\d+))?"
+            rf"{re.escape(self.codec.suffix)}"
+        )
+        rotated: List[Tuple[str, int, str]] = []
+        for name in os.listdir(directory):
+            match: Optional[Match[str]] = pattern.fullmatch(name)
+            if match:
+                rotated.append((match[1], int(match[2] or 0), name))
+
+        rotated.sort()
+        for _, _, name in rotated[: -self.backup_count]:
+            os.remove(os.path.join(directory, name))
+
+
+def _sync_periodically(
+    reference: "weakref.ReferenceType[CompressedRotatingFileHandler]",
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    while not stop.wait(interval):
+        handler: Optional[CompressedRotatingFileHandler] = reference()
+        if handler is None:
+            return
+        try:
+            handler._sync_on_timer()
+        except Exception:  # noqa: B902
+            traceback.print_exc(file=sys.stderr)
+        del handler
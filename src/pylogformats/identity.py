@@ -0,0 +1,75 @@
+"""Cached identity of the running process.
+
+Values such as the hostname never change for the life of a process, but
+looking them up means a system call. `ProcessIdentity` resolves them once
+so formatters can read them from memory on every record.
+"""
+
+import os
+import platform
+import sys
+import weakref
+from typing import Optional
+
+
+class ProcessIdentity:
+    """The hostname, process id and process name of the running process.
+
+    The values are resolved when the instance is created. Pass
+    ``refresh_on_fork=True`` to resolve them again in child processes created
+    with `os.fork`, on platforms which support `os.register_at_fork`.
+
+    >>> from pylogformats.identity import ProcessIdentity
+    >>>
+    >>> identity = ProcessIdentity(hostname="SomePc")
+    >>> identity.hostname
+    'SomePc'
+    >>> identity.process_name
+    'MainProcess'
+
+    """
+
+    __slots__ = ("_explicit_hostname", "hostname", "pid", "process_name", "__weakref__")
+
+    def __init__(
+        self, hostname: Optional[str] = None, refresh_on_fork: bool = False
+    ) -> None:
+        """Resolve the identity of the running process.
+
+        :param hostname: An explicit hostname to use instead of `platform.node()`.
+        :type hostname: str | None
+        :param refresh_on_fork: Resolve the identity again in forked children.
+        :type refresh_on_fork: bool
+        """
+        self._explicit_hostname: Optional[str] = hostname
+        self.hostname: str = ""
+        self.pid: int = 0
+        self.process_name: str = "MainProcess"
+
+        self.refresh()
+
+        if refresh_on_fork and hasattr(os, "register_at_fork"):
+            # Hold a weak reference so the hook does not keep this alive.
+            refresh = weakref.WeakMethod(self.refresh)
+
+            def _after_fork() -> None:  # pragma: no cover
+                method = refresh()
+                if method is not None:
+                    method()
+
+            os.register_at_fork(after_in_child=_after_fork)
+
+    def refresh(self) -> None:
+        """Resolve the hostname, process id and process name again."""
+        self.hostname = self._explicit_hostname or platform.node()
+        self.pid = os.getpid()
+
+        # Mirror `logging.LogRecord`, which only asks multiprocessing for the
+        # process name once it has been imported.
+        mp = sys.modules.get("multiprocessing")
+        self.process_name = "MainProcess"
+        if mp is not None:
+            try:
+                self.process_name = mp.current_process().name
+            except Exception:  # pragma: no cover  # noqa: B902
+                pass
@@ -1,15 +1,15 @@
 """Advanced JSON Format."""
 
-import json
 import logging
-from datetime import datetime
 from typing import Any
-from typing import Dict
 
-from pylogformats.baseline import BASELINE
+from pylogformats.fieldplan import FieldSpec
+from pylogformats.fieldplan import Static
+from pylogformats.json.base import BaseJsonFormat
+from pylogformats.timestamps import IsoTimestamp
 
 
-class AdvJsonFormat(logging.Formatter):
+class AdvJsonFormat(BaseJsonFormat):
     """A formatter for an opinionated Advanced Json format.
 
     Extends the `logging.Formatter` class to correctly format a log record using
@@ -57,6 +57,50 @@ class AdvJsonFormat(logging.Formatter):
 
     """
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialise the formatter.
+
+        :param args: Positional arguments passed to `BaseJsonFormat`.
+        :type args: Any
+        :param kwargs: Keyword arguments passed to `BaseJsonFormat`.
+        :type kwargs: Any
+        """
+        super().__init__(*args, **kwargs)
+        # Kept apart from the record timestamps so each cache stays warm.
+        self._rtimestamp: IsoTimestamp = IsoTimestamp()
+
+    def _fields(self) -> FieldSpec:
+        return [
+            ("logger", "name"),
+            ("timestamp", self._time),
+            ("rtimestamp", self._rtime),
+            ("message", self._message),
+            ("level", "levelname"),
+            ("levelno", "levelno"),
+            (
+                "location",
+                [
+                    ("pathname", "pathname"),
+                    ("module", "module"),
+                    ("filename", "filename"),
+                    ("function", "funcName"),
+                    ("line", "lineno"),
+                ],
+            ),
+            (
+                "process",
+                [("number", self._process_number), ("name", self._process_name)],
+            ),
+            (
+                "thread",
+                [("number", self._thread_number), ("name", self._thread_name)],
+            ),
+            ("v", Static(1)),
+        ]
+
+    def _rtime(self, record: logging.LogRecord) -> str:
+        return self._rtimestamp(record.created - record.relativeCreated)
+
     def format(self, record: logging.LogRecord) -> str:
         """Format LogRecords into an advanced JSON log format.
 
@@ -66,35 +110,4 @@ information about the event being logged.
         :return: A string representation of the Bunyan formatted logging event.
         :rtype: str
         """
-        formatted_message: Dict[str, Any] = {
-            "logger": record.name,
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
-            "rtimestamp": datetime.fromtimestamp(
-                record.created - record.relativeCreated
-            ).isoformat(),
-            "message": record.getMessage(),
-            "level": record.levelname,
-            "levelno": record.levelno,
-            "location": {
-                "pathname": record.pathname,
-                "module": record.module,
-                "filename": record.filename,
-                "function": record.funcName,
-                "line": record.lineno,
-            },
-            "process": {
-                "number": record.process or 0,
-                "name": record.processName or "unknown",
-            },
-            "thread": {
-                "number": record.thread or 0,
-                "name": record.threadName or "unknown",
-            },
-            "v": 1,
-        }
-
-        for key, value in vars(record).items():
-            if key not in BASELINE:
-                formatted_message[key] = value
-
-        return json.dumps(formatted_message)
+        return self._plan.render(record, self._extras(record))
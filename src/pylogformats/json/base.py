@@ -0,0 +1,174 @@
+"""Shared behaviour for the JSON Format classes."""
+
+import logging
+import threading
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from pylogformats.base import BaseFormat
+from pylogformats.baseline import BASELINE_KEYS
+from pylogformats.context import record_context
+from pylogformats.fieldplan import FieldPlan
+from pylogformats.fieldplan import FieldSpec
+from pylogformats.identity import ProcessIdentity
+from pylogformats.limits import SizeLimits
+from pylogformats.message import get_message
+from pylogformats.serializers import Serializer
+from pylogformats.serializers import get_serializer
+from pylogformats.timestamps import IsoTimestamp
+from pylogformats.tracebacks import RenderedException
+from pylogformats.tracebacks import render_exception
+
+
+class BaseJsonFormat(BaseFormat, ABC):
+    """A base class for the JSON formatters.
+
+    Accepts the same arguments as `logging.Formatter`, plus keyword-only options
+    which are shared by every JSON format.
+
+    Subclasses describe their layout in `_fields`, which is compiled into a
+    `pylogformats.fieldplan.FieldPlan` when the formatter is created.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        identity: Optional[ProcessIdentity] = None,
+        serializer: Union[str, Serializer, None] = None,
+        limits: Optional[SizeLimits] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialise the formatter.
+
+        :param args: Positional arguments passed to `logging.Formatter`.
+        :type args: Any
+        :param identity: A cached process identity. When given, it fills in the \
+process details of records which were created without them, such as when \
+`logging.logProcesses` is disabled to avoid a `os.getpid()` call per record.
+        :type identity: ProcessIdentity | None
+        :param serializer: The JSON backend, see `pylogformats.serializers`. \
+Defaults to the standard library's `json`.
+        :type serializer: str | Serializer | None
+        :param limits: Cut oversized messages and extras down to size, see \
+`pylogformats.limits`.
+        :type limits: SizeLimits | None
+        :param kwargs: Keyword arguments passed to `logging.Formatter`.
+        :type kwargs: Any
+        """
+        super().__init__(*args, **kwargs)
+        self.identity: Optional[ProcessIdentity] = identity
+        self.serializer: Serializer = get_serializer(serializer)
+        self.limits: Optional[SizeLimits] = limits
+        self._timestamp: Callable[[float], str] = IsoTimestamp()
+        # The message `_extras` limited along with the extras, for `_message`.
+        self._limited: threading.local = threading.local()
+
+        fields: Optional[FieldSpec] = self._fields()
+        if fields is not None:
+            self._plan: FieldPlan = FieldPlan(fields, self.serializer)
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format a LogRecord into UTF-8 encoded JSON.
+
+        Produces the same document as `format`, serialized straight into bytes
+        where the serializer supports it.
+
+        :param record: An instance of *logging.LogRecord* which contains all relevant \
+information about the event being logged.
+        :type record: logging.LogRecord
+        :return: The formatted logging event.
+        :rtype: bytes
+        """
+        return self._plan.render_bytes(record, self._extras(record))
+
+    @abstractmethod
+    def _fields(self) -> Optional[FieldSpec]:
+        """Lay out the fields of the format for its field plan, or `None` for none."""
+
+    def _extras(self, record: logging.LogRecord) -> Dict[str, Any]:
+        # Context values come first, so extras of the same name replace them.
+        # Most records carry no extras, which a subset test finds quickly, and
+        # then the context is used as it is, without copying it.
+        context: Dict[str, Any] = record_context(record)
+        if vars(record).keys() <= BASELINE_KEYS:
+            extras: Dict[str, Any] = context
+        else:
+            extras = {
+                **context,
+                **{
+                    key: value
+                    for key, value in vars(record).items()
+                    if key not in BASELINE_KEYS
+                },
+            }
+
+        if record.exc_info or record.exc_text or record.stack_info:
+            extras = {**self._errors(record), **extras}
+
+        if self.limits is not None:
+            message, extras = self.limits.limit_record(get_message(record), extras)
+            self._limited.message = (record, message)
+        return extras
+
+    def _errors(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Describe the exception and stack of a record, when it has them."""
+        errors: Dict[str, Any] = {}
+
+        rendered: Optional[RenderedException] = render_exception(record.exc_info)
+        if rendered is not None:
+            errors["exception"] = {
+                "exc_type": rendered.exc_type,
+                "exc_message": rendered.exc_message,
+                "frames": rendered.frames,
+                "traceback": rendered.text,
+            }
+        elif record.exc_text:
+            errors["exception"] = {"traceback": record.exc_text}
+
+        if record.stack_info:
+            errors["stack_info"] = record.stack_info
+
+        return errors
+
+    # Accessors used by the field plans. They read the formatter's attributes
+    # when called, so subclasses may replace those after compiling the plan.
+
+    def _time(self, record: logging.LogRecord) -> str:
+        return self._timestamp(record.created)
+
+    def _process_number(self, record: logging.LogRecord) -> int:
+        if record.process:
+            return record.process
+        return self.identity.pid if self.identity is not None else 0
+
+    def _process_name(self, record: logging.LogRecord) -> str:
+        if record.processName:
+            return record.processName
+        return self.identity.process_name if self.identity is not None else "unknown"
+
+    @staticmethod
+    def _thread_number(record: logging.LogRecord) -> int:
+        return record.thread or 0
+
+    @staticmethod
+    def _thread_name(record: logging.LogRecord) -> str:
+        return record.threadName or "unknown"
+
+    def _message(self, record: logging.LogRecord) -> str:
+        if self.limits is None:
+            return get_message(record)
+
+        # The formatters call `_extras` first, which limits the message too.
+        limited: Optional[Tuple[logging.LogRecord, str]] = getattr(
+            self._limited, "message", None
+        )
+        self._limited.message = None
+        if limited is not None and limited[0] is record:
+            return limited[1]
+        return self.limits.limit_message(get_message(record))
@@ -1,15 +1,13 @@
 """Standard JSON Format."""
 
-import json
 import logging
-from datetime import datetime
-from typing import Any
-from typing import Dict
 
-from pylogformats.baseline import BASELINE
+from pylogformats.fieldplan import FieldSpec
+from pylogformats.fieldplan import Static
+from pylogformats.json.base import BaseJsonFormat
 
 
-class JsonFormat(logging.Formatter):
+class JsonFormat(BaseJsonFormat):
     """A formatter for an opinionated Json format.
 
     Extends the `logging.Formatter` class to correctly format a log record using
@@ -54,6 +52,25 @@ class JsonFormat(logging.Formatter):
 
     """
 
+    def _fields(self) -> FieldSpec:
+        return [
+            ("logger", "name"),
+            ("timestamp", self._time),
+            ("message", self._message),
+            ("level", "levelname"),
+            ("levelno", "levelno"),
+            ("function", "funcName"),
+            (
+                "process",
+                [("number", self._process_number), ("name", self._process_name)],
+            ),
+            (
+                "thread",
+                [("number", self._thread_number), ("name", self._thread_name)],
+            ),
+            ("v", Static(1)),
+        ]
+
     def format(self, record: logging.LogRecord) -> str:
         """Format LogRecords into an simplified JSON log format.
 
@@ -63,26 +80,4 @@ information about the event being logged.
         :return: A string representation of the Bunyan formatted logging event.
         :rtype: str
         """
-        formatted_message: Dict[str, Any] = {
-            "logger": record.name,
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
-            "message": record.getMessage(),
-            "level": record.levelname,
-            "levelno": record.levelno,
-            "function": record.funcName,
-            "process": {
-                "number": record.process or 0,
-                "name": record.processName or "unknown",
-            },
-            "thread": {
-                "number": record.thread or 0,
-                "name": record.threadName or "unknown",
-            },
-            "v": 1,
-        }
-
-        for key, value in vars(record).items():
-            if key not in BASELINE:
-                formatted_message[key] = value
-
-        return json.dumps(formatted_message)
+        return self._plan.render(record, self._extras(record))
@@ -0,0 +1,257 @@
+"""Bound the size of formatted records.
+
+A single oversized message or extra can produce log lines many megabytes
+long, which log shippers and collectors choke on. `SizeLimits` cuts strings,
+collections and deeply nested values down to size while walking the record,
+before anything is serialized. Only the parts of a value which fit within the
+limits are read, so the work and memory spent on a record stay bounded
+however large its values are.
+
+Objects encoded as their ``repr`` are rendered through `reprlib`, which
+leaves out what could not fit while rendering the strings and containers it
+knows, rather than after.
+
+Values found again inside themselves are replaced with ``"<cycle>"``
+where they repeat.
+
+Records which were cut carry ``"truncated": true`` alongside their extras.
+
+>>> import logging
+>>> from pylogformats import JsonFormat
+>>> from pylogformats.limits import SizeLimits
+>>>
+>>> formatter = JsonFormat(limits=SizeLimits(max_string_bytes=5, max_items=2))
+>>> record = logging.makeLogRecord(
+...     {"name": "root", "msg": "A long message", "ids": list(range(100))}
+... )
+>>> formatter.format(record)  # doctest: +ELLIPSIS
+'{..."message": "A lon", ..."ids": [0, 1], "truncated": true}'
+
+"""
+
+import reprlib
+from itertools import islice
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from pylogformats.encoders import encode_default
+
+
+# Replaces collections nested deeper than the limit allows.
+TRUNCATED_VALUE = "..."
+
+# Replaces values found again inside themselves.
+CYCLE_VALUE = "<cycle>"
+
+# The size charged for numbers, booleans and nulls.
+_SCALAR_SIZE = 8
+
+_SCALARS = (int, float, bool, type(None))
+
+# The `reprlib.Repr` limits, each set just past what a string limit allows.
+_REPR_LIMITS = (
+    "maxlevel",
+    "maxtuple",
+    "maxlist",
+    "maxarray",
+    "maxdict",
+    "maxset",
+    "maxfrozenset",
+    "maxdeque",
+    "maxstring",
+    "maxlong",
+    "maxother",
+)
+
+
+class SizeLimits:
+    """Limits on the size of a record's message and extras.
+
+    Sizes are in bytes of UTF-8 text before JSON escaping, so they are close
+    to, but not exactly, the size of the output. Every limit defaults to
+    `None`, for no limit.
+    """
+
+    __slots__ = ("max_string_bytes", "max_items", "max_depth", "max_record_bytes")
+
+    def __init__(
+        self,
+        max_string_bytes: Optional[int] = None,
+        max_items: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_record_bytes: Optional[int] = None,
+    ) -> None:
+        """Set the limits.
+
+        :param max_string_bytes: The longest any string, including the \
+message, may be.
+        :type max_string_bytes: int | None
+        :param max_items: The most items kept of any list, tuple, set or \
+dictionary.
+        :type max_items: int | None
+        :param max_depth: How many levels of collections may be nested in an \
+extra. Deeper collections are replaced with ``"..."``.
+        :type max_depth: int | None
+        :param max_record_bytes: The total size of the message and extras. The \
+message is counted first, and extras past the limit are cut or left out.
+        :type max_record_bytes: int | None
+        """
+        self.max_string_bytes: Optional[int] = max_string_bytes
+        self.max_items: Optional[int] = max_items
+        self.max_depth: Optional[int] = max_depth
+        self.max_record_bytes: Optional[int] = max_record_bytes
+
+    def limit_message(self, message: str) -> str:
+        """Cut a message down to size.
+
+        :param message: The rendered message of a record.
+        :type message: str
+        :return: The message, cut to the string and record limits.
+        :rtype: str
+        """
+        return _Walk(self, self.max_record_bytes).string(message)
+
+    def limit_record(
+        self, message: str, extras: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Cut a record's message and extras down to size.
+
+        :param message: The rendered message of the record.
+        :type message: str
+        :param extras: The record's extras.
+        :type extras: Dict[str, Any]
+        :return: The message and extras, with ``"truncated": True`` added to \
+the extras if anything was cut.
+        :rtype: Tuple[str, Dict[str, Any]]
+        """
+        walk: _Walk = _Walk(self, self.max_record_bytes)
+        message = walk.string(message)
+
+        limited: Dict[str, Any] = {}
+        for key, value in extras.items():
+            if walk.exhausted():
+                walk.truncated = True
+                break
+            walk.charge(len(key))
+            limited[key] = walk.value(value, 1)
+
+        if walk.truncated:
+            limited["truncated"] = True
+        return message, limited
+
+
+class _Walk:
+    """Limits one record, tracking the space left and whether it was cut."""
+
+    __slots__ = ("limits", "remaining", "truncated", "path")
+
+    def __init__(self, limits: SizeLimits, remaining: Optional[int]) -> None:
+        self.limits: SizeLimits = limits
+        self.remaining: Optional[int] = remaining
+        self.truncated: bool = False
+        # The ids of the values being walked into, to stop at cycles.
+        self.path: Set[int] = set()
+
+    def exhausted(self) -> bool:
+        return self.remaining is not None and self.remaining <= 0
+
+    def charge(self, size: int) -> None:
+        if self.remaining is not None:
+            self.remaining -= size
+
+    def cap(self) -> Optional[int]:
+        cap: Optional[int] = self.limits.max_string_bytes
+        if self.remaining is not None:
+            cap = max(self.remaining, 0) if cap is None else min(cap, self.remaining)
+        return cap
+
+    def string(self, value: str) -> str:
+        cap: Optional[int] = self.cap()
+        if cap is None:
+            return value
+
+        # Encode no more characters than could possibly fit.
+        encoded: bytes = value[:cap].encode("utf-8")
+        if len(value) > cap or len(encoded) > cap:
+            self.truncated = True
+            value = encoded[:cap].decode("utf-8", "ignore")
+            encoded = encoded[:cap]
+
+        self.charge(len(encoded))
+        return value
+
+    def value(self, value: Any, depth: int) -> Any:
+        if isinstance(value, str):
+            return self.string(value)
+
+        if isinstance(value, _SCALARS):
+            self.charge(_SCALAR_SIZE)
+            return value
+
+        if isinstance(value, (bytes, bytearray)):
+            cap: Optional[int] = self.limits.max_string_bytes
+            if cap is not None and len(value) > cap:
+                value = value[:cap]
+            return self.string(encode_default(value))
+
+        if id(value) in self.path:
+            self.truncated = True
+            return self.string(CYCLE_VALUE)
+
+        self.path.add(id(value))
+        try:
+            return self.nested(value, depth)
+        finally:
+            self.path.discard(id(value))
+
+    def nested(self, value: Any, depth: int) -> Any:
+        if isinstance(value, (dict, list, tuple, set, frozenset)):
+            max_depth: Optional[int] = self.limits.max_depth
+            if max_depth is not None and depth > max_depth:
+                self.truncated = True
+                return self.string(TRUNCATED_VALUE)
+            if isinstance(value, dict):
+                return self.mapping(value, depth)
+            return self.sequence(value, depth)
+
+        # Objects are encoded into new values, which may hold the objects.
+        return self.value(encode_default(value, self.short_repr), depth)
+
+    def short_repr(self, value: Any) -> str:
+        cap: Optional[int] = self.cap()
+        if cap is None:
+            return repr(value)
+
+        # Whatever `reprlib` shortens comes out longer than the cap, so it is
+        # then cut to size and marked as truncated like any other string.
+        shortener: reprlib.Repr = reprlib.Repr()
+        for limit in _REPR_LIMITS:
+            setattr(shortener, limit, cap + 1)
+        return shortener.repr(value)
+
+    def mapping(self, value: Dict[Any, Any], depth: int) -> Dict[Any, Any]:
+        limited: Dict[Any, Any] = {}
+        for key, item in islice(value.items(), self.limits.max_items):
+            if self.exhausted():
+                break
+            self.charge(len(key) if isinstance(key, str) else _SCALAR_SIZE)
+            limited[key] = self.value(item, depth + 1)
+
+        if len(limited) < len(value):
+            self.truncated = True
+        return limited
+
+    def sequence(self, value: Any, depth: int) -> List[Any]:
+        limited: List[Any] = []
+        for item in islice(value, self.limits.max_items):
+            if self.exhausted():
+                break
+            limited.append(self.value(item, depth + 1))
+
+        if len(limited) < len(value):
+            self.truncated = True
+        return limited
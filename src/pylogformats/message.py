@@ -0,0 +1,168 @@
+"""Render each record's message once, however many formatters read it.
+
+`logging.LogRecord.getMessage` merges the message with its arguments every
+time it is called, so a record sent to handlers with different formatters
+is interpolated once per handler. `get_message` keeps the result on the
+record and reuses it for as long as ``msg`` and ``args`` are unchanged.
+
+Arguments which are expensive to turn into strings can be wrapped with
+`lazy`, so the work is only done if a formatter renders the message.
+
+>>> import logging
+>>> from pylogformats.message import get_message
+>>> from pylogformats.message import lazy
+>>>
+>>> calls = []
+>>> def expensive():
+...     calls.append(1)
+...     return "computed"
+>>>
+>>> record = logging.makeLogRecord({"msg": "Value %s", "args": (lazy(expensive),)})
+>>> len(calls)
+0
+>>> get_message(record), get_message(record)
+('Value computed', 'Value computed')
+>>> len(calls)
+1
+
+"""
+
+import logging
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+
+# The record attribute the rendered message is kept in.
+MEMO_KEY = "_pylogformats_message"
+
+
+def get_message(record: logging.LogRecord) -> str:
+    """Return the message of a record, merged with its arguments.
+
+    The message is rendered on the first call and kept on the record, with
+    the ``msg`` and ``args`` it was rendered from. It is rendered again if
+    ``msg`` or ``args`` are replaced, but not if an argument is changed in
+    place. Pickled records leave the kept message behind.
+
+    :param record: The record to read the message of.
+    :type record: logging.LogRecord
+    :return: The same string as `logging.LogRecord.getMessage`.
+    :rtype: str
+    """
+    attributes: Dict[str, Any] = record.__dict__
+    msg: Any = record.msg
+    args: Any = record.args
+
+    memo: _Memo = attributes.get(MEMO_KEY, _EMPTY_MEMO)
+    if memo.msg is msg and memo.args is args:
+        return memo.message
+
+    message: str = record.getMessage()
+    attributes[MEMO_KEY] = _Memo(msg, args, message)
+    return message
+
+
+def set_message(record: logging.LogRecord, message: str) -> None:
+    """Replace the message of a record with one already merged.
+
+    :param record: The record to change.
+    :type record: logging.LogRecord
+    :param message: The merged message, which `get_message` returns from now on.
+    :type message: str
+    """
+    record.msg = message
+    record.args = None
+    record.__dict__[MEMO_KEY] = _Memo(message, None, message)
+
+
+class _Memo:
+    """A rendered message, with the ``msg`` and ``args`` it came from."""
+
+    __slots__ = ("msg", "args", "message")
+
+    def __init__(self, msg: Any, args: Any, message: str) -> None:
+        self.msg: Any = msg
+        self.args: Any = args
+        self.message: str = message
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The arguments may not pickle, and a copy holds other objects anyway.
+        return (_empty_memo, ())
+
+
+def _empty_memo() -> _Memo:
+    return _EMPTY_MEMO
+
+
+# Never matches, as no record holds this object.
+_NOTHING = object()
+_EMPTY_MEMO: _Memo = _Memo(_NOTHING, _NOTHING, "")
+
+
+class LazyArg:
+    """A logging argument which is computed when the message is rendered."""
+
+    __slots__ = ("_func", "_args", "_kwargs", "_value", "_computed")
+
+    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Wrap the function computing the argument.
+
+        :param func: Called at most once, with ``args`` and ``kwargs``.
+        :type func: Callable[..., Any]
+        :param args: Positional arguments for ``func``.
+        :type args: Any
+        :param kwargs: Keyword arguments for ``func``.
+        :type kwargs: Any
+        """
+        self._func: Callable[..., Any] = func
+        self._args: Tuple[Any, ...] = args
+        self._kwargs: Dict[str, Any] = kwargs
+        self._value: Any = None
+        self._computed: bool = False
+
+    @property
+    def value(self) -> Any:
+        """Compute the argument on first use.
+
+        :return: The result of the wrapped function.
+        :rtype: Any
+        """
+        if not self._computed:
+            self._value = self._func(*self._args, **self._kwargs)
+            self._computed = True
+        return self._value
+
+    def __str__(self) -> str:
+        """Return ``str`` of the computed argument, for ``%s``.
+
+        :return: The computed argument as a string.
+        :rtype: str
+        """
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        """Return ``repr`` of the computed argument, for ``%r``.
+
+        :return: The representation of the computed argument.
+        :rtype: str
+        """
+        return repr(self.value)
+
+
+def lazy(func: Callable[..., Any], *args: Any, **kwargs: Any) -> LazyArg:
+    """Defer computing a logging argument until the message is rendered.
+
+    The result is formatted with ``%s`` or ``%r`` in the message.
+
+    :param func: Computes the argument, called at most once.
+    :type func: Callable[..., Any]
+    :param args: Positional arguments for ``func``.
+    :type args: Any
+    :param kwargs: Keyword arguments for ``func``.
+    :type kwargs: Any
+    :return: An argument to pass to a logging call.
+    :rtype: LazyArg
+    """
+    return LazyArg(func, *args, **kwargs)
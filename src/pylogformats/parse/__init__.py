@@ -0,0 +1,57 @@
+"""Read back the logs written by the `pylogformats` formatters.
+
+Every format has a parser which turns its lines back into `ParsedRecord`
+objects, one at a time, so log files of any size can be processed in
+constant memory:
+
+.. code-block:: python
+
+    from pylogformats.parse import read_records
+
+    for record in read_records("app.log", "json"):
+        if record.level == "ERROR":
+            print(record.timestamp, record.message)
+"""
+
+from .bulk import chunk_boundaries
+from .bulk import parse_chunk
+from .bulk import read_parallel
+from .columns import LogColumns
+from .columns import StringColumn
+from .columns import read_columns
+from .filters import RecordFilter
+from .index import TimeIndex
+from .index import build_index
+from .index import read_window
+from .json import BunyanParser
+from .json import JsonParser
+from .reader import PARSERS
+from .reader import get_parser
+from .reader import read_records
+from .records import LineParser
+from .records import ParsedRecord
+from .text import CompactTextParser
+from .text import SimpleTextParser
+
+
+__all__ = [
+    "BunyanParser",
+    "CompactTextParser",
+    "JsonParser",
+    "LineParser",
+    "LogColumns",
+    "PARSERS",
+    "ParsedRecord",
+    "RecordFilter",
+    "SimpleTextParser",
+    "StringColumn",
+    "TimeIndex",
+    "build_index",
+    "chunk_boundaries",
+    "get_parser",
+    "parse_chunk",
+    "read_columns",
+    "read_parallel",
+    "read_records",
+    "read_window",
+]
@@ -0,0 +1,257 @@
+"""Parse large log files across many processes.
+
+`read_records` parses a file one line at a time in a single process, which
+is slow for files many gigabytes in size. `read_parallel` memory maps the
+file, splits it into chunks which start and end on record boundaries, and
+parses the chunks in a pool of processes. Results come back in file order.
+
+Each chunk's records can be returned as they are, or reduced to a summary
+in the worker process with ``reduce``, so only the summaries are sent back:
+
+.. code-block:: python
+
+    from collections import Counter
+
+    from pylogformats.parse import read_parallel
+
+
+    def count_levels(records):
+        return Counter(record.level for record in records)
+
+
+    totals = sum(read_parallel("app.log", "bunyan", reduce=count_levels), Counter())
+
+``reduce`` and the parser are sent to the worker processes, so they have to
+be picklable, such as functions defined at the top level of a module.
+"""
+
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from pylogformats.parse.filters import RecordFilter
+from pylogformats.parse.reader import get_parser
+from pylogformats.parse.records import LineParser
+from pylogformats.parse.records import ParsedRecord
+
+
+Reducer = Callable[[Iterable[ParsedRecord]], Any]
+
+
+def chunk_boundaries(
+    path: Union[str, "os.PathLike[str]"],
+    chunk_size: int,
+    parser: Optional[LineParser] = None,
+) -> List[Tuple[int, int]]:
+    """Split a file into chunks which end on line boundaries.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :param chunk_size: The size each chunk is at least, in bytes, unless it \
+is the last.
+    :type chunk_size: int
+    :param parser: For multiline formats, chunks are also kept from splitting \
+a record, by only starting them on lines this parser reads as a record.
+    :type parser: LineParser | None
+    :return: The ``(start, end)`` byte offsets of every chunk, in order.
+    :rtype: List[Tuple[int, int]]
+    """
+    with open(path, "rb") as log_file:
+        size: int = os.fstat(log_file.fileno()).st_size
+        if not size:
+            return []
+
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            boundaries: List[Tuple[int, int]] = []
+            start: int = 0
+            while start < size:
+                end: int = _line_end(mapped, start + chunk_size, size)
+                if parser is not None and parser.multiline:
+                    end = _record_start(mapped, end, size, parser)
+
+                boundaries.append((start, end))
+                start = end
+
+            return boundaries
+
+
+def _line_end(mapped: mmap.mmap, position: int, size: int) -> int:
+    """Return the offset just past the first newline at or after a position."""
+    if position >= size:
+        return size
+    newline: int = mapped.find(b"\n", position)
+    return size if newline == -1 else newline + 1
+
+
+def _record_start(
+    mapped: mmap.mmap, position: int, size: int, parser: LineParser
+) -> int:
+    """Return the offset of the first line from a position starting a record."""
+    while position < size:
+        end: int = _line_end(mapped, position, size)
+        line: str = mapped[position:end].decode("utf-8", "replace")
+        if parser.parse_line(line.rstrip("\r\n")) is not None:
+            break
+        position = end
+    return position
+
+
+def parse_chunk(
+    path: Union[str, "os.PathLike[str]"],
+    start: int,
+    end: int,
+    parser: LineParser,
+    reduce: Optional[Reducer] = None,
+    encoding: str = "utf-8",
+    record_filter: Optional[RecordFilter] = None,
+) -> Any:
+    """Parse one chunk of a file.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :param start: The offset the chunk starts at.
+    :type start: int
+    :param end: The offset the chunk ends at.
+    :type end: int
+    :param parser: Parses the chunk's lines.
+    :type parser: LineParser
+    :param reduce: Called with the chunk's records, to return a summary of \
+them rather than the records.
+    :type reduce: Callable[[Iterable[ParsedRecord]], Any] | None
+    :param encoding: The encoding of the file.
+    :type encoding: str
+    :param record_filter: Only keep the records this accepts.
+    :type record_filter: RecordFilter | None
+    :return: The records of the chunk, or the result of ``reduce``.
+    :rtype: List[ParsedRecord] | Any
+    """
+    with open(path, "rb") as log_file:
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text: str = mapped[start:end].decode(encoding, "replace")
+
+    lines: List[str] = text.split("\n")
+    if not lines[-1]:
+        lines.pop()
+
+    records: Iterator[ParsedRecord] = (
+        parser.parse(lines)
+        if record_filter is None
+        else record_filter.filter(parser, lines)
+    )
+    if reduce is not None:
+        return reduce(records)
+    return list(records)
+
+
+def read_parallel(
+    path: Union[str, "os.PathLike[str]"],
+    parser: Union[str, LineParser] = "json",
+    processes: Optional[int] = None,
+    chunk_size: int = 1 << 26,
+    reduce: Optional[Reducer] = None,
+    encoding: str = "utf-8",
+    context: Optional[Any] = None,
+    record_filter: Optional[RecordFilter] = None,
+) -> Iterator[Any]:
+    """Parse a log file in parallel, yielding results in file order.
+
+    A file which fits into a single chunk is parsed in the calling process.
+    Only a few chunks more than there are processes are parsed ahead of the
+    results being consumed, which bounds the memory used.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :param parser: The format of the file, see `get_parser`.
+    :type parser: str | LineParser
+    :param processes: The number of worker processes, defaults to the number \
+of CPUs.
+    :type processes: int | None
+    :param chunk_size: The size of the chunks the file is split into, in bytes.
+    :type chunk_size: int
+    :param reduce: Called in the worker processes with each chunk's records. \
+Its results are yielded instead of the records.
+    :type reduce: Callable[[Iterable[ParsedRecord]], Any] | None
+    :param encoding: The encoding of the file.
+    :type encoding: str
+    :param context: The `multiprocessing` context to start the workers with, \
+defaults to the default context.
+    :type context: multiprocessing.context.BaseContext | None
+    :param record_filter: Only keep the records this accepts, see \
+`RecordFilter`. It is applied in the worker processes, before ``reduce``.
+    :type record_filter: RecordFilter | None
+    :yield: Every record in the file, or the result of ``reduce`` for every \
+chunk.
+    :rtype: Iterator[ParsedRecord] | Iterator[Any]
+    """
+    line_parser: LineParser = get_parser(parser)
+    chunks: List[Tuple[int, int]] = chunk_boundaries(path, chunk_size, line_parser)
+
+    if len(chunks) == 1:
+        results: Iterator[Any] = iter(
+            [
+                parse_chunk(
+                    path, *chunks[0], line_parser, reduce, encoding, record_filter
+                )
+            ]
+        )
+    else:
+        results = _parse_in_pool(
+            path,
+            chunks,
+            line_parser,
+            reduce,
+            encoding,
+            processes,
+            context,
+            record_filter,
+        )
+
+    for result in results:
+        if reduce is None:
+            yield from result
+        else:
+            yield result
+
+
+def _parse_in_pool(
+    path: Union[str, "os.PathLike[str]"],
+    chunks: List[Tuple[int, int]],
+    parser: LineParser,
+    reduce: Optional[Reducer],
+    encoding: str,
+    processes: Optional[int],
+    context: Optional[Any],
+    record_filter: Optional[RecordFilter],
+) -> Iterator[Any]:
+    workers: int = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        pending: Deque["Future[Any]"] = deque()
+        for start, end in chunks:
+            pending.append(
+                pool.submit(
+                    parse_chunk,
+                    path,
+                    start,
+                    end,
+                    parser,
+                    reduce,
+                    encoding,
+                    record_filter,
+                )
+            )
+            if len(pending) > workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
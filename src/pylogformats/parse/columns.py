@@ -0,0 +1,408 @@
+"""Collect parsed records into columns, for analytics.
+
+Loading logs into a dataframe record by record builds a dictionary and many
+small objects per line. `LogColumns` instead appends each record straight
+into compact typed columns:
+
+- ``timestamps`` - 64-bit integer microseconds since the epoch, with
+  `MISSING_TIMESTAMP` where the timestamp can not be read
+- ``levels`` - 16-bit integer level numbers, such as ``40`` for ``ERROR``
+- ``logger_codes`` - 32-bit integer indices into the ``loggers`` list
+- ``messages`` and any requested fields - `StringColumn` objects, which keep
+  all their strings in a single UTF-8 buffer with offsets into it
+
+These use the memory layout of Apache Arrow and NumPy, so they can be handed
+to either without copying, see `LogColumns.arrow_buffers`. They can also be
+written out with `LogColumns.to_csv` or `LogColumns.to_npz`, neither of which
+needs any other library.
+
+>>> from pylogformats.parse import ParsedRecord
+>>> from pylogformats.parse.columns import LogColumns
+>>>
+>>> columns = LogColumns()
+>>> columns.append(ParsedRecord("2021-02-04T23:01:46.5", "ERROR", "app", "Failed"))
+>>> columns.levels.tolist(), columns.loggers, columns.messages[0]
+([40], ['app'], 'Failed')
+
+"""
+
+import csv
+import json
+import logging
+import os
+import sys
+import zipfile
+from array import array
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import TextIO
+from typing import Tuple
+from typing import Union
+
+from pylogformats.parse.json import JsonParser
+from pylogformats.parse.reader import get_parser
+from pylogformats.parse.records import LineParser
+from pylogformats.parse.records import ParsedRecord
+from pylogformats.parse.records import _level_number
+from pylogformats.timestamps import parse_timestamp
+
+
+# Stands in for timestamps which can not be read. It is the value NumPy and
+# pandas use for ``NaT``.
+MISSING_TIMESTAMP = -(2**63)
+
+# Stands in for values a line does not have.
+_MISSING = object()
+
+
+class StringColumn:
+    """A column of strings, stored as UTF-8 in one buffer.
+
+    String ``i`` is ``data[offsets[i]:offsets[i + 1]]``, the layout of an
+    Arrow ``large_utf8`` array.
+    """
+
+    __slots__ = ("offsets", "data")
+
+    def __init__(self) -> None:
+        """Create an empty column."""
+        self.offsets: "array[int]" = array("q", [0])
+        self.data: bytearray = bytearray()
+
+    def append(self, value: str) -> None:
+        """Add a string to the end of the column.
+
+        :param value: The string to add.
+        :type value: str
+        """
+        self.data += value.encode("utf-8", "surrogatepass")
+        self.offsets.append(len(self.data))
+
+    def __len__(self) -> int:
+        """Count the strings in the column.
+
+        :return: The number of strings.
+        :rtype: int
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        """Read a string back.
+
+        :param index: The position of the string.
+        :type index: int
+        :return: The string.
+        :rtype: str
+        """
+        if index < 0:
+            index += len(self)
+        return self.data[self.offsets[index] : self.offsets[index + 1]].decode(
+            "utf-8", "surrogatepass"
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        """Read every string back, in order.
+
+        :yield: Each string.
+        :rtype: Iterator[str]
+        """
+        for index in range(len(self)):
+            yield self[index]
+
+
+class LogColumns:
+    """Parsed records, stored column by column."""
+
+    def __init__(self, fields: Sequence[str] = ()) -> None:
+        """Create empty columns.
+
+        :param fields: Names of other fields of the records to keep, each in a \
+`StringColumn` of its own. Values which are not strings are stored as JSON, \
+and missing values as empty strings.
+        :type fields: Sequence[str]
+        """
+        self.timestamps: "array[int]" = array("q")
+        self.levels: "array[int]" = array("h")
+        self.logger_codes: "array[int]" = array("i")
+        self.loggers: List[str] = []
+        self.messages: StringColumn = StringColumn()
+        self.fields: Dict[str, StringColumn] = {name: StringColumn() for name in fields}
+
+        self._logger_index: Dict[Optional[str], int] = {}
+        self._second: Tuple[str, Optional[float]] = ("", None)
+
+    def __len__(self) -> int:
+        """Count the records.
+
+        :return: The number of records.
+        :rtype: int
+        """
+        return len(self.timestamps)
+
+    def append(self, record: ParsedRecord) -> None:
+        """Add a record to the end of the columns.
+
+        :param record: The record to add.
+        :type record: ParsedRecord
+        """
+        fields: Dict[str, Any] = record.fields
+        self._append(
+            record.timestamp,
+            record.levelno,
+            record.logger,
+            record.message,
+            [fields.get(name) for name in self.fields],
+        )
+
+    def extend(self, records: Iterable[ParsedRecord]) -> None:
+        """Add many records to the end of the columns.
+
+        :param records: The records to add, in order.
+        :type records: Iterable[ParsedRecord]
+        """
+        append = self.append
+        for record in records:
+            append(record)
+
+    def arrow_buffers(self) -> Dict[str, List[Optional[memoryview]]]:
+        """Return the buffers of every column, laid out as Arrow arrays.
+
+        Each column's buffers start with its validity bitmap, which is always
+        `None` as no value is null. ``logger`` holds the 32-bit indices of a
+        dictionary array whose dictionary is ``loggers``. String columns hold
+        64-bit offsets followed by UTF-8 data.
+
+        .. code-block:: python
+
+            import pyarrow
+
+            buffers = columns.arrow_buffers()
+            levels = pyarrow.Array.from_buffers(
+                pyarrow.int16(),
+                len(columns),
+                [None, pyarrow.py_buffer(buffers["level"][1])],
+            )
+
+        The buffers share memory with the columns, so they must not be changed
+        while the buffers are in use.
+
+        :return: The buffers of each column, by column name.
+        :rtype: Dict[str, List[memoryview | None]]
+        """
+        buffers: Dict[str, List[Optional[memoryview]]] = {
+            "timestamp": [None, memoryview(self.timestamps)],
+            "level": [None, memoryview(self.levels)],
+            "logger": [None, memoryview(self.logger_codes)],
+            "loggers": _string_buffers(_string_column(self.loggers)),
+            "message": _string_buffers(self.messages),
+        }
+        for name, column in self.fields.items():
+            buffers[name] = _string_buffers(column)
+        return buffers
+
+    def to_csv(self, output: TextIO) -> None:
+        """Write the columns as CSV, with a header row.
+
+        :param output: A text file, opened with ``newline=""``.
+        :type output: TextIO
+        """
+        writer = csv.writer(output)
+        writer.writerow(["timestamp", "level", "logger", "message", *self.fields])
+
+        loggers: List[str] = self.loggers
+        extra_columns: List[StringColumn] = list(self.fields.values())
+        for index, (timestamp, level, code, message) in enumerate(
+            zip(self.timestamps, self.levels, self.logger_codes, self.messages)
+        ):
+            writer.writerow(
+                [
+                    "" if timestamp == MISSING_TIMESTAMP else timestamp,
+                    level,
+                    loggers[code],
+                    message,
+                    *[column[index] for column in extra_columns],
+                ]
+            )
+
+    def to_npz(self, output: Union[str, "os.PathLike[str]", BinaryIO]) -> None:
+        """Write the columns as a NumPy ``.npz`` archive.
+
+        Integer columns are stored as they are. Each string column is stored
+        as two arrays, ``<name>_offsets`` and ``<name>_data``, holding its
+        offsets and UTF-8 data. ``numpy.load`` reads the archive.
+
+        :param output: The file to write.
+        :type output: str | os.PathLike | BinaryIO
+        """
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+            _write_npy(archive, "timestamp", "i8", self.timestamps)
+            _write_npy(archive, "level", "i2", self.levels)
+            _write_npy(archive, "logger", "i4", self.logger_codes)
+
+            strings: Dict[str, StringColumn] = {
+                "loggers": _string_column(self.loggers),
+                "message": self.messages,
+                **self.fields,
+            }
+            for name, column in strings.items():
+                _write_npy(archive, f"{name}_offsets", "i8", column.offsets)
+                _write_npy(archive, f"{name}_data", "u1", column.data)
+
+    def _append(
+        self,
+        timestamp: str,
+        levelno: int,
+        logger: Optional[str],
+        message: str,
+        values: Iterable[Any],
+    ) -> None:
+        self.timestamps.append(self._micros(timestamp))
+        self.levels.append(levelno if -(2**15) <= levelno < 2**15 else logging.NOTSET)
+
+        code: Optional[int] = self._logger_index.get(logger)
+        if code is None:
+            code = self._logger_index[logger] = len(self.loggers)
+            self.loggers.append(logger or "")
+        self.logger_codes.append(code)
+
+        self.messages.append(message)
+        for column, value in zip(self.fields.values(), values):
+            column.append("" if value is _MISSING else _field_text(value))
+
+    def _extend_lines(self, parser: LineParser, lines: Iterable[str]) -> None:
+        """Add the records of lines, decoding only the values kept when it can."""
+        # The fields ``parse_line`` takes out of a record are always empty.
+        taken: Tuple[str, ...] = ()
+        keys: List[str] = []
+        if isinstance(parser, JsonParser):
+            taken = (
+                parser.timestamp_key,
+                parser.level_key,
+                parser.logger_key,
+                parser.message_key,
+            )
+            keys = [*taken, parser.levelno_key]
+        positions: List[Optional[int]] = []
+        for name in self.fields:
+            positions.append(None if name in taken else len(keys))
+            if name not in taken:
+                keys.append(name)
+
+        scan = parser.value_scanner(keys, _MISSING) if taken else None
+        if scan is None:
+            self.extend(parser.parse(lines))
+            return
+
+        for line in lines:
+            # Decoding JSON skips the line ending.
+            values: Optional[List[Any]] = scan(line)
+            if values is None:
+                # The line is not a JSON object, so not a record.
+                continue
+
+            timestamp, level, logger, message, levelno = values[:5]
+            if type(levelno) is not int:
+                levelno = _level_number("" if level is _MISSING else str(level))
+            self._append(
+                "" if timestamp is _MISSING else str(timestamp),
+                levelno,
+                None if logger is _MISSING else logger,
+                "" if message is _MISSING else str(message),
+                [
+                    _MISSING if position is None else values[position]
+                    for position in positions
+                ],
+            )
+
+    def _micros(self, timestamp: str) -> int:
+        # Every record within a second shares everything up to the fraction,
+        # so that part is only parsed once per second.
+        second: str = timestamp[:19]
+        fraction: str = timestamp[20:].rstrip("Z")
+        if len(timestamp) > 19 and (timestamp[19] != "." or not fraction.isdigit()):
+            created: Optional[float] = parse_timestamp(timestamp)
+            return MISSING_TIMESTAMP if created is None else round(created * 1e6)
+
+        if self._second[0] != second:
+            self._second = (second, parse_timestamp(second))
+        seconds: Optional[float] = self._second[1]
+        if seconds is None:
+            return MISSING_TIMESTAMP
+
+        return round(seconds) * 1_000_000 + int(fraction[:6].ljust(6, "0") or 0)
+
+
+def read_columns(
+    path: Union[str, "os.PathLike[str]"],
+    parser: Union[str, LineParser] = "json",
+    fields: Sequence[str] = (),
+    encoding: str = "utf-8",
+) -> LogColumns:
+    """Read a log file into columns.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :param parser: The format of the file, see `get_parser`.
+    :type parser: str | LineParser
+    :param fields: Other fields of the records to keep, see `LogColumns`.
+    :type fields: Sequence[str]
+    :param encoding: The encoding of the file.
+    :type encoding: str
+    :return: The records of the file.
+    :rtype: LogColumns
+    """
+    columns: LogColumns = LogColumns(fields)
+    with open(path, encoding=encoding, errors="replace") as lines:
+        columns._extend_lines(get_parser(parser), lines)
+    return columns
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ""
+    return json.dumps(value)
+
+
+def _string_column(values: Iterable[str]) -> StringColumn:
+    column: StringColumn = StringColumn()
+    for value in values:
+        column.append(value)
+    return column
+
+
+def _string_buffers(column: StringColumn) -> List[Optional[memoryview]]:
+    return [None, memoryview(column.offsets), memoryview(column.data)]
+
+
+# The byte order prefix of NumPy type descriptions for this machine.
+_BYTE_ORDER: str = "<" if sys.byteorder == "little" else ">"
+
+
+def _write_npy(
+    archive: zipfile.ZipFile,
+    name: str,
+    dtype: str,
+    values: Union["array[int]", bytearray],
+) -> None:
+    """Write a one dimensional array in the ``.npy`` format, version 1.0."""
+    descr: str = "|u1" if dtype == "u1" else _BYTE_ORDER + dtype
+    header: str = (
+        f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({len(values)},), }}"
+    )
+    # The header is padded so the data starts on a 64 byte boundary.
+    padding: int = 63 - (10 + len(header)) % 64
+    header += " " * padding + "\n"
+
+    with archive.open(f"{name}.npy", "w") as output:
+        output.write(b"\x93NUMPY\x01\x00")
+        output.write(len(header).to_bytes(2, "little"))
+        output.write(header.encode("latin-1"))
+        output.write(memoryview(values).cast("B"))
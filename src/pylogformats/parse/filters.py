@@ -0,0 +1,132 @@
+"""Select records by level and logger while reading them.
+
+Searching large JSON logs for, say, the errors of one logger mostly throws
+records away, and decoding each line only to throw it away is most of the
+cost. `RecordFilter` first reads the logger name and level number from the
+raw line with `LineParser.scan_line`, and only decodes the lines which may
+match:
+
+.. code-block:: python
+
+    from pylogformats.parse import RecordFilter
+    from pylogformats.parse import read_records
+
+    errors = RecordFilter("ERROR", loggers=["app.db"])
+    for record in read_records("app.log", "bunyan", record_filter=errors):
+        print(record.timestamp, record.message)
+
+Lines the scan can not read, and records of the text formats, are parsed in
+full and then checked, so the result is the same either way.
+"""
+
+import logging
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from pylogformats.parse.records import LineParser
+from pylogformats.parse.records import ParsedRecord
+
+
+class RecordFilter:
+    """Accept records at or above a level, from some loggers.
+
+    >>> from pylogformats.parse import ParsedRecord
+    >>> from pylogformats.parse import RecordFilter
+    >>>
+    >>> errors = RecordFilter("ERROR", loggers=["app"])
+    >>> errors(ParsedRecord("", "ERROR", "app.db", "Failed"))
+    True
+    >>> errors(ParsedRecord("", "ERROR", "application", "Failed"))
+    False
+    """
+
+    def __init__(
+        self, level: Union[int, str] = logging.NOTSET, loggers: Sequence[str] = ()
+    ) -> None:
+        """Create the filter.
+
+        :param level: The lowest level accepted, as a number or a level name.
+        :type level: int | str
+        :param loggers: Accept only these loggers and their children, as \
+`logging.Filter` does. Records of formats which do not write the logger name \
+are then never accepted. Defaults to every logger.
+        :type loggers: Sequence[str]
+        :raises ValueError: When the level name is not known.
+        """
+        if isinstance(level, str):
+            number: Any = logging.getLevelName(level.upper())
+            if not isinstance(number, int):
+                raise ValueError(f"Unknown level {level!r}")
+            level = number
+
+        self.level: int = level
+        self.loggers: Tuple[str, ...] = tuple(loggers)
+        self._children: Tuple[str, ...] = tuple(f"{name}." for name in self.loggers)
+
+    def accepts(self, logger: Optional[str], levelno: Optional[int]) -> bool:
+        """Check the logger name and level number of a record.
+
+        :param logger: The logger name, or `None` if it is not known yet.
+        :type logger: str | None
+        :param levelno: The level number, or `None` if it is not known yet.
+        :type levelno: int | None
+        :return: Whether the record may be accepted. Parts which are not \
+known are taken to match.
+        :rtype: bool
+        """
+        if levelno is not None and levelno < self.level:
+            return False
+        if logger is not None and self.loggers:
+            return logger in self.loggers or logger.startswith(self._children)
+        return True
+
+    def __call__(self, record: ParsedRecord) -> bool:
+        """Check a parsed record.
+
+        :param record: The record to check.
+        :type record: ParsedRecord
+        :return: Whether the record is accepted.
+        :rtype: bool
+        """
+        if self.loggers and record.logger is None:
+            return False
+        return self.accepts(record.logger, record.levelno)
+
+    def filter(
+        self, parser: LineParser, lines: Iterable[str]
+    ) -> Iterator[ParsedRecord]:
+        """Parse lines into the records which are accepted.
+
+        Lines are first scanned, and only parsed when the scan does not rule
+        them out. Multiline formats are parsed in full, as a line which does
+        not match may still continue a record which does.
+
+        :param parser: Parses the lines.
+        :type parser: LineParser
+        :param lines: The lines to parse, with or without line endings.
+        :type lines: Iterable[str]
+        :yield: Each accepted record, in order.
+        :rtype: Iterator[ParsedRecord]
+        """
+        if parser.multiline:
+            for record in parser.parse(lines):
+                if self(record):
+                    yield record
+            return
+
+        accepts = self.accepts
+        scan_line = parser.scan_line
+        parse_line = parser.parse_line
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if not accepts(*scan_line(line)):
+                continue
+
+            parsed: Optional[ParsedRecord] = parse_line(line)
+            if parsed is not None and self(parsed):
+                yield parsed
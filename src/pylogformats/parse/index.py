@@ -0,0 +1,327 @@
+"""Find the records of a time window in a large log file, without reading it all.
+
+Log files are written in time order, so the records of a window can be found
+by seeking rather than reading from the top. `read_window` seeks using a
+sparse index kept next to the file, the file's name with ``.idx`` added,
+which holds the byte offset of every few thousandth record. The index is
+built after the fact with `build_index`, or while logging with
+`pylogformats.handlers.IndexingFileHandler`. Without an index, the file
+itself is bisected:
+
+.. code-block:: python
+
+    from datetime import datetime
+
+    from pylogformats.parse import read_window
+
+    for record in read_window(
+        "app.log",
+        datetime(2021, 2, 4, 14, 0),
+        datetime(2021, 2, 4, 14, 5),
+        "json",
+    ):
+        print(record.timestamp, record.message)
+
+The index is a text file, one ``<timestamp> <offset>`` line per entry after
+a header line, so it can be appended to as the log grows.
+"""
+
+import io
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+from pylogformats.parse.bulk import _line_end
+from pylogformats.parse.bulk import _record_start
+from pylogformats.parse.reader import get_parser
+from pylogformats.parse.records import LineParser
+from pylogformats.parse.records import ParsedRecord
+
+
+# The first line of every index file.
+INDEX_HEADER = "pylogformats-index 1\n"
+
+# Added to the name of a log file to name its index.
+INDEX_SUFFIX = ".idx"
+
+# Index entries may be this many seconds later than the timestamp the record
+# was written with, which is rounded down to the format's precision.
+_TOLERANCE = 1.0
+
+Moment = Union[float, datetime]
+
+
+def index_path(path: Union[str, "os.PathLike[str]"]) -> str:
+    """Name the index of a log file.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :return: The path of its index.
+    :rtype: str
+    """
+    return os.fspath(path) + INDEX_SUFFIX
+
+
+def format_entry(created: float, offset: int) -> str:
+    """Write a line of an index file.
+
+    :param created: The POSIX timestamp of the record.
+    :type created: float
+    :param offset: The byte offset the record starts at.
+    :type offset: int
+    :return: The line, with its line ending.
+    :rtype: str
+    """
+    return f"{created!r} {offset}\n"
+
+
+class TimeIndex:
+    """The timestamps and byte offsets of some of the records of a log file.
+
+    :ivar times: The POSIX timestamps of the records, in order.
+    :ivar offsets: The byte offsets the records start at.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self.times: "array[float]" = array("d")
+        self.offsets: "array[int]" = array("q")
+
+    def __len__(self) -> int:
+        """Count the entries.
+
+        :return: The number of entries.
+        :rtype: int
+        """
+        return len(self.offsets)
+
+    def add(self, created: float, offset: int) -> None:
+        """Add an entry after the others.
+
+        :param created: The POSIX timestamp of the record.
+        :type created: float
+        :param offset: The byte offset the record starts at.
+        :type offset: int
+        """
+        self.times.append(created)
+        self.offsets.append(offset)
+
+    def entry_before(self, moment: float) -> int:
+        """Find the last entry before a moment.
+
+        :param moment: A POSIX timestamp.
+        :type moment: float
+        :return: The position of the last entry strictly before the moment, or \
+-1 if there is none.
+        :rtype: int
+        """
+        return bisect_left(self.times, moment) - 1
+
+    def save(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """Write the index to a file.
+
+        :param path: The index file.
+        :type path: str | os.PathLike
+        """
+        with open(path, "w", encoding="ascii") as output:
+            output.write(INDEX_HEADER)
+            output.writelines(
+                format_entry(created, offset)
+                for created, offset in zip(self.times, self.offsets)
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, "os.PathLike[str]"]) -> "TimeIndex":
+        """Read an index file.
+
+        :param path: The index file.
+        :type path: str | os.PathLike
+        :raises ValueError: When the file is not an index.
+        :return: The index.
+        :rtype: TimeIndex
+        """
+        index: TimeIndex = cls()
+        with open(path, encoding="ascii", errors="replace") as lines:
+            if lines.readline() != INDEX_HEADER:
+                raise ValueError(f"{os.fspath(path)!r} is not a log index")
+
+            for line in lines:
+                # A line cut short by a crash while it was written ends the index.
+                if not line.endswith("\n"):
+                    break
+                created, _, offset = line.partition(" ")
+                index.add(float(created), int(offset))
+        return index
+
+
+def build_index(
+    path: Union[str, "os.PathLike[str]"],
+    parser: Union[str, LineParser] = "json",
+    every: int = 1000,
+    encoding: str = "utf-8",
+) -> TimeIndex:
+    """Index a log file, and save the index next to it.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :param parser: The format of the file, see `get_parser`.
+    :type parser: str | LineParser
+    :param every: The number of lines between entries.
+    :type every: int
+    :param encoding: The encoding of the file.
+    :type encoding: str
+    :return: The index.
+    :rtype: TimeIndex
+    """
+    line_parser: LineParser = get_parser(parser)
+    index: TimeIndex = TimeIndex()
+
+    with open(path, "rb") as log_file:
+        offset: int = 0
+        countdown: int = 0
+        for line in log_file:
+            # Only every so many lines is parsed. Lines which are not records
+            # with a timestamp, such as continuation lines, are passed over.
+            if countdown <= 0:
+                created: Optional[float] = _created(
+                    line_parser, line.decode(encoding, "replace")
+                )
+                if created is not None:
+                    index.add(created, offset)
+                    countdown = every
+            countdown -= 1
+            offset += len(line)
+
+    index.save(index_path(path))
+    return index
+
+
+def read_window(
+    path: Union[str, "os.PathLike[str]"],
+    start: Moment,
+    end: Moment,
+    parser: Union[str, LineParser] = "json",
+    encoding: str = "utf-8",
+) -> Iterator[ParsedRecord]:
+    """Read the records written during a window of time.
+
+    The file's records must be in time order. Records whose timestamp can
+    not be read are skipped.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :param start: The start of the window, as a POSIX timestamp or a local \
+`datetime.datetime`. Records at the start are included.
+    :type start: float | datetime.datetime
+    :param end: The end of the window. Records at the end are not included.
+    :type end: float | datetime.datetime
+    :param parser: The format of the file, see `get_parser`.
+    :type parser: str | LineParser
+    :param encoding: The encoding of the file.
+    :type encoding: str
+    :yield: Each record in the window, in order.
+    :rtype: Iterator[ParsedRecord]
+    """
+    line_parser: LineParser = get_parser(parser)
+    first: float = _posix(start)
+    last: float = _posix(end)
+
+    with open(path, "rb") as log_file:
+        size: int = os.fstat(log_file.fileno()).st_size
+        if not size:
+            return
+
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offset: Optional[int] = _seek_with_index(
+                mapped, size, path, line_parser, first, encoding
+            )
+            if offset is None:
+                offset = _bisect(mapped, size, line_parser, first, encoding)
+
+        log_file.seek(offset)
+        lines = io.TextIOWrapper(log_file, encoding=encoding, errors="replace")
+        for record in line_parser.parse(lines):
+            created: Optional[float] = record.created
+            if created is None or created < first:
+                continue
+            if created >= last:
+                break
+            yield record
+
+
+def _posix(moment: Moment) -> float:
+    return moment.timestamp() if isinstance(moment, datetime) else moment
+
+
+def _created(parser: LineParser, line: str) -> Optional[float]:
+    record: Optional[ParsedRecord] = parser.parse_line(line.rstrip("\r\n"))
+    return None if record is None else record.created
+
+
+def _created_at(
+    mapped: mmap.mmap, offset: int, size: int, parser: LineParser, encoding: str
+) -> Optional[float]:
+    """Read the timestamp of the record starting at an offset."""
+    line: bytes = mapped[offset : _line_end(mapped, offset, size)]
+    return _created(parser, line.decode(encoding, "replace"))
+
+
+def _seek_with_index(
+    mapped: mmap.mmap,
+    size: int,
+    path: Union[str, "os.PathLike[str]"],
+    parser: LineParser,
+    moment: float,
+    encoding: str,
+) -> Optional[int]:
+    """Find where to start reading from the index, if it is there and fits."""
+    try:
+        index: TimeIndex = TimeIndex.load(index_path(path))
+    except (OSError, ValueError):
+        return None
+
+    position: int = index.entry_before(moment)
+    if position < 0:
+        return 0
+
+    # An index left over from another file with the same name would send the
+    # read to the wrong place, so the entry is checked against the file.
+    offset: int = index.offsets[position]
+    created: Optional[float] = None
+    if offset < size and (offset == 0 or mapped[offset - 1 : offset] == b"\n"):
+        created = _created_at(mapped, offset, size, parser, encoding)
+    if created is None or abs(created - index.times[position]) > _TOLERANCE:
+        return None
+    return offset
+
+
+def _bisect(
+    mapped: mmap.mmap, size: int, parser: LineParser, moment: float, encoding: str
+) -> int:
+    """Find the start of a record before a moment, close to the moment."""
+    found: int = 0
+    low: int = 0
+    high: int = size
+    while low < high:
+        middle: int = (low + high) // 2
+        offset: int = _line_end(mapped, middle, size) if middle else 0
+        if parser.multiline:
+            offset = _record_start(mapped, offset, size, parser)
+
+        created: Optional[float] = None
+        if offset < high:
+            created = _created_at(mapped, offset, size, parser, encoding)
+
+        # Records which can not be read count as late, which only ever makes
+        # the read start earlier.
+        if created is not None and created < moment:
+            found = offset
+            low = offset + 1
+        else:
+            high = middle
+    return found
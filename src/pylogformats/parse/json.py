@@ -0,0 +1,216 @@
+"""Parsers for the lines written by the JSON formatters."""
+
+import json
+import logging
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from pylogformats.parse.records import LineParser
+from pylogformats.parse.records import ParsedRecord
+
+
+class JsonParser(LineParser):
+    """Parse lines written by `JsonFormat` and `AdvJsonFormat`.
+
+    >>> from pylogformats.parse import JsonParser
+    >>>
+    >>> JsonParser().parse_line(
+    ...     '{"logger": "root", "timestamp": "2021-02-04T23:01:46.435011", '
+    ...     '"message": "TEST", "level": "ERROR", "levelno": 40, "v": 1}'
+    ... )
+    ParsedRecord('2021-02-04T23:01:46.435011', 'ERROR', 'root', 'TEST')
+
+    :cvar timestamp_key: The key holding the timestamp.
+    :cvar level_key: The key holding the level.
+    :cvar logger_key: The key holding the logger name.
+    :cvar message_key: The key holding the message.
+    :cvar levelno_key: The key holding the level number.
+    """
+
+    name = "json"
+    timestamp_key: str = "timestamp"
+    level_key: str = "level"
+    logger_key: str = "logger"
+    message_key: str = "message"
+    levelno_key: str = "levelno"
+
+    def __init__(self, loads: Callable[[str], Any] = json.loads) -> None:
+        """Create the parser.
+
+        :param loads: Decodes a line of JSON, such as `orjson.loads` for speed.
+        :type loads: Callable[[str], Any]
+        """
+        self.loads: Callable[[str], Any] = loads
+        self._logger_marker: str = f'"{self.logger_key}":'
+        self._levelno_marker: str = f'"{self.levelno_key}":'
+
+    def parse_line(self, line: str) -> Optional[ParsedRecord]:
+        """Parse a single line.
+
+        :param line: The line, without its line ending.
+        :type line: str
+        :return: The record, or `None` if the line is not a JSON object.
+        :rtype: ParsedRecord | None
+        """
+        try:
+            fields: Any = self.loads(line)
+        except ValueError:
+            return None
+
+        if not isinstance(fields, dict):
+            return None
+
+        return ParsedRecord(
+            str(fields.pop(self.timestamp_key, "")),
+            self._level(fields.pop(self.level_key, "")),
+            fields.pop(self.logger_key, None),
+            str(fields.pop(self.message_key, "")),
+            fields,
+        )
+
+    def scan_line(self, line: str) -> Tuple[Optional[str], Optional[int]]:
+        """Read the logger name and level number of a line, without decoding it.
+
+        The formatters write these near the start of every line, before any
+        nested object, so they are found by searching for their keys. Keys
+        inside nested objects, or names holding escapes, are left unknown.
+
+        >>> from pylogformats.parse import BunyanParser
+        >>>
+        >>> BunyanParser().scan_line(
+        ...     '{"time": "2021-02-04T23:01:46.435Z", "name": "app", "pid": 7, '
+        ...     '"level": 40, "msg": "TEST"}'
+        ... )
+        ('app', 40)
+
+        :param line: The line, without its line ending.
+        :type line: str
+        :return: The logger name and the level number, each `None` if unknown.
+        :rtype: Tuple[str | None, int | None]
+        """
+        logger: Optional[str] = None
+        start: int = _value_start(line, self._logger_marker)
+        if start != -1:
+            start = line.find('"', start, start + 2)
+            end: int = line.find('"', start + 1)
+            if start != -1 and end != -1 and line.find("\\", start, end) == -1:
+                logger = line[start + 1 : end]
+
+        levelno: Optional[int] = None
+        start = _value_start(line, self._levelno_marker)
+        if start != -1:
+            try:
+                levelno = int(line[start : line.find(",", start)])
+            except ValueError:
+                pass
+
+        return logger, levelno
+
+    def value_scanner(
+        self, keys: Sequence[str], default: Any = None
+    ) -> Optional[Callable[[str], Optional[List[Any]]]]:
+        """Return a function decoding some top level values of a line.
+
+        Only the members before the first nested object of a line are decoded
+        when they hold every key, as the formatters write the timestamp,
+        level, logger and message first. Other lines are decoded whole.
+
+        >>> from pylogformats.parse import JsonParser
+        >>>
+        >>> scan = JsonParser().value_scanner(["message", "user", "request"])
+        >>> scan('{"message": "Served", "user": {"id": 7}, "request": "a1"}')
+        ['Served', {'id': 7}, 'a1']
+        >>> scan('{"message": "Served", "user": {"request": "b2"}}')
+        ['Served', {'request': 'b2'}, None]
+
+        :param keys: The keys of the values to read.
+        :type keys: Sequence[str]
+        :param default: Stands in for the values of keys a line does not have.
+        :type default: Any
+        :return: A function returning the value of each key of a line, in \
+order, or `None` for lines which are not JSON objects.
+        :rtype: Callable[[str], List[Any] | None] | None
+        """
+        return _ValueScanner(self.loads, keys, default)
+
+    @staticmethod
+    def _level(level: Any) -> str:
+        return str(level)
+
+
+class BunyanParser(JsonParser):
+    """Parse lines written by `BunyanFormat`.
+
+    Bunyan records the level as a number, which is turned back into its name.
+    """
+
+    name = "bunyan"
+    timestamp_key = "time"
+    logger_key = "name"
+    message_key = "msg"
+    levelno_key = "level"
+
+    @staticmethod
+    def _level(level: Any) -> str:
+        if isinstance(level, int):
+            return str(logging.getLevelName(level))
+        return str(level)
+
+
+def _value_start(line: str, marker: str) -> int:
+    """Find where the value of a top level key starts, or return -1."""
+    found: int = line.find(marker)
+    # A brace before the key may open a nested object holding it.
+    if found == -1 or line.find("{", 1, found) != -1:
+        return -1
+    return found + len(marker)
+
+
+_HEAD_MISSES = 8
+
+
+class _ValueScanner:
+    """Decodes some top level values of lines, for `JsonParser.value_scanner`."""
+
+    def __init__(
+        self, loads: Callable[[str], Any], keys: Sequence[str], default: Any
+    ) -> None:
+        self.loads: Callable[[str], Any] = loads
+        self.keys: List[str] = list(keys)
+        self.default: Any = default
+        # Lines in a row holding some key after their first nested object.
+        self.misses: int = 0
+
+    def __call__(self, line: str) -> Optional[List[Any]]:
+        keys: List[str] = self.keys
+        if self.misses < _HEAD_MISSES:
+            # Only the members before the first nested object are decoded. A
+            # cut inside a string or an array leaves it open, failing to decode.
+            cut: int = line.rfind(",", 0, line.find("{", 1))
+            if cut != -1:
+                try:
+                    head: Any = self.loads(f"{line[:cut]}}}")
+                    values: List[Any] = [head[key] for key in keys]
+                except (ValueError, KeyError):
+                    pass
+                else:
+                    self.misses = 0
+                    return values
+
+        try:
+            fields: Any = self.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(fields, dict):
+            return None
+
+        if self.misses < _HEAD_MISSES and all(key in fields for key in keys):
+            # Lines of one format put their keys in the same places, so the
+            # heads of its lines stop being decoded after a few such misses.
+            self.misses += 1
+        default: Any = self.default
+        return [fields.get(key, default) for key in keys]
@@ -0,0 +1,75 @@
+"""Read back whole log files."""
+
+import os
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Type
+from typing import Union
+
+from pylogformats.parse.filters import RecordFilter
+from pylogformats.parse.json import BunyanParser
+from pylogformats.parse.json import JsonParser
+from pylogformats.parse.records import LineParser
+from pylogformats.parse.records import ParsedRecord
+from pylogformats.parse.text import CompactTextParser
+from pylogformats.parse.text import SimpleTextParser
+
+
+PARSERS: Dict[str, Type[LineParser]] = {
+    parser.name: parser
+    for parser in (JsonParser, BunyanParser, CompactTextParser, SimpleTextParser)
+}
+
+
+def get_parser(parser: Union[str, LineParser]) -> LineParser:
+    """Resolve a parser by name.
+
+    :param parser: A `LineParser` instance, or the name of a format: \
+``"json"`` (for `JsonFormat` and `AdvJsonFormat`), ``"bunyan"``, \
+``"compact"`` or ``"simple"``.
+    :type parser: str | LineParser
+    :raises ValueError: When the format name is not known.
+    :return: A ready to use parser.
+    :rtype: LineParser
+    """
+    if isinstance(parser, LineParser):
+        return parser
+
+    if parser not in PARSERS:
+        raise ValueError(
+            f"Unknown format {parser!r}, expected one of {', '.join(PARSERS)}"
+        )
+
+    return PARSERS[parser]()
+
+
+def read_records(
+    path: Union[str, "os.PathLike[str]"],
+    parser: Union[str, LineParser] = "json",
+    encoding: str = "utf-8",
+    record_filter: Optional[RecordFilter] = None,
+) -> Iterator[ParsedRecord]:
+    """Read the records of a log file, one at a time.
+
+    The file is read line by line, so files of any size are read in constant
+    memory. Undecodable bytes are replaced rather than stopping the read.
+
+    :param path: The log file.
+    :type path: str | os.PathLike
+    :param parser: The format of the file, see `get_parser`.
+    :type parser: str | LineParser
+    :param encoding: The encoding of the file.
+    :type encoding: str
+    :param record_filter: Only yield the records this accepts, skipping \
+lines it rules out before they are parsed.
+    :type record_filter: RecordFilter | None
+    :yield: Each record in the file, in order.
+    :rtype: Iterator[ParsedRecord]
+    """
+    line_parser: LineParser = get_parser(parser)
+    with open(path, encoding=encoding, errors="replace") as lines:
+        if record_filter is None:
+            yield from line_parser.parse(lines)
+        else:
+            yield from record_filter.filter(line_parser, lines)
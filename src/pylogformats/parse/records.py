@@ -0,0 +1,297 @@
+"""The records parsers produce, and the base class for parsers."""
+
+import logging
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from pylogformats.baseline import BASELINE_KEYS
+from pylogformats.timestamps import parse_timestamp
+
+
+class ParsedRecord:
+    """A log record read back from a formatted line.
+
+    :ivar timestamp: The time of the record, as it was written.
+    :ivar level: The level name, such as ``"ERROR"``.
+    :ivar logger: The name of the logger, if the format records it.
+    :ivar message: The log message.
+    :ivar fields: Everything else the line holds, such as extras.
+    """
+
+    __slots__ = ("timestamp", "level", "logger", "message", "fields")
+
+    def __init__(
+        self,
+        timestamp: str,
+        level: str,
+        logger: Optional[str],
+        message: str,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Hold the parts of a parsed record.
+
+        :param timestamp: The time of the record, as it was written.
+        :type timestamp: str
+        :param level: The level name.
+        :type level: str
+        :param logger: The name of the logger, if known.
+        :type logger: str | None
+        :param message: The log message.
+        :type message: str
+        :param fields: Any other values of the record.
+        :type fields: Dict[str, Any] | None
+        """
+        self.timestamp: str = timestamp
+        self.level: str = level
+        self.logger: Optional[str] = logger
+        self.message: str = message
+        self.fields: Dict[str, Any] = {} if fields is None else fields
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the record as its constructor arguments.
+
+        Records are sent back from the worker processes of
+        `pylogformats.parse.read_parallel`, and this is about twice as fast to
+        pickle as the default for classes with ``__slots__``.
+
+        :return: The class and its arguments.
+        :rtype: Tuple[Any, ...]
+        """
+        return (
+            ParsedRecord,
+            (self.timestamp, self.level, self.logger, self.message, self.fields),
+        )
+
+    @property
+    def created(self) -> Optional[float]:
+        """Read the timestamp as a POSIX timestamp.
+
+        :return: The time of the record, or `None` if it can not be read.
+        :rtype: float | None
+        """
+        return parse_timestamp(self.timestamp)
+
+    @property
+    def levelno(self) -> int:
+        """Read the level as a number.
+
+        :return: The ``levelno`` field if the line records it, otherwise the \
+number of the level name, or `logging.NOTSET` for names which are not known.
+        :rtype: int
+        """
+        levelno: Any = self.fields.get("levelno")
+        if isinstance(levelno, int) and not isinstance(levelno, bool):
+            return levelno
+        return _level_number(self.level)
+
+    def to_log_record(self) -> logging.LogRecord:
+        """Rebuild a `logging.LogRecord`, to format the record again.
+
+        Fields the formatters write, such as the process or the location, are
+        put back into the record attributes they came from. Tracebacks are put
+        into ``exc_text``. Any other fields become extras.
+
+        :return: A record with the message already merged with its arguments.
+        :rtype: logging.LogRecord
+        """
+        attributes: Dict[str, Any] = dict(_RECORD_DEFAULTS)
+        attributes["name"] = self.logger or "root"
+        attributes["msg"] = self.message
+        attributes["levelname"] = self.level
+        attributes["levelno"] = _level_number(self.level)
+
+        created: Optional[float] = self.created
+        if created is not None:
+            attributes["created"] = created
+            attributes["msecs"] = (created - int(created)) * 1000
+
+        for key, value in self.fields.items():
+            attribute: Optional[str] = _RENAMED_FIELDS.get(key)
+            if attribute is not None:
+                attributes[attribute] = value
+            elif key in _NESTED_FIELDS and isinstance(value, dict):
+                for nested_key, attribute in _NESTED_FIELDS[key].items():
+                    if nested_key in value:
+                        attributes[attribute] = value[nested_key]
+            elif key not in BASELINE_KEYS and key not in _DROPPED_FIELDS:
+                attributes[key] = value
+
+        # `logging.makeLogRecord` without running `logging.LogRecord.__init__`,
+        # as every attribute it sets is replaced.
+        record: logging.LogRecord = logging.LogRecord.__new__(logging.LogRecord)
+        record.__dict__.update(attributes)
+        return record
+
+    def __repr__(self) -> str:
+        """Describe the record.
+
+        :return: The record's level, logger and message.
+        :rtype: str
+        """
+        return (
+            f"ParsedRecord({self.timestamp!r}, {self.level!r}, {self.logger!r}, "
+            f"{self.message!r})"
+        )
+
+
+class LineParser(ABC):
+    """Parses the lines written by one of the `pylogformats` formatters.
+
+    :cvar name: The name the parser is registered under.
+    :cvar multiline: Whether lines which are not records continue the record \
+before them, as tracebacks do in the text formats.
+    """
+
+    name: str = ""
+    multiline: bool = False
+
+    @abstractmethod
+    def parse_line(self, line: str) -> Optional[ParsedRecord]:
+        """Parse a single line.
+
+        :param line: The line, without its line ending.
+        :type line: str
+        """
+
+    def scan_line(self, line: str) -> Tuple[Optional[str], Optional[int]]:
+        """Read the logger name and level number of a line, without parsing it.
+
+        Used by `pylogformats.parse.RecordFilter` to skip lines cheaply.
+        Formats which can not tell them apart from the raw line return `None`
+        for either, and lines are then parsed in full.
+
+        :param line: The line, without its line ending.
+        :type line: str
+        :return: The logger name and the level number, each `None` if unknown.
+        :rtype: Tuple[str | None, int | None]
+        """
+        return None, None
+
+    def value_scanner(
+        self, keys: Sequence[str], default: Any = None
+    ) -> Optional[Callable[[str], Optional[List[Any]]]]:
+        """Return a function reading some values of a line, without parsing it.
+
+        Used by `pylogformats.parse.read_columns` to read only the values it
+        keeps. Formats which can not read values from the raw line return
+        `None`, and lines are then parsed in full.
+
+        :param keys: The keys of the values to read.
+        :type keys: Sequence[str]
+        :param default: Stands in for the values of keys a line does not have.
+        :type default: Any
+        :return: A function returning the value of each key of a line, in \
+order, or `None` for lines which are not records.
+        :rtype: Callable[[str], List[Any] | None] | None
+        """
+        return None
+
+    def continue_record(self, record: ParsedRecord, line: str) -> None:
+        """Add a line which is not a record of its own to the record before it.
+
+        :param record: The record being continued.
+        :type record: ParsedRecord
+        :param line: The continuation line, without its line ending.
+        :type line: str
+        """
+        continuation: Optional[str] = record.fields.get("continuation")
+        record.fields["continuation"] = (
+            line if continuation is None else f"{continuation}\n{line}"
+        )
+
+    def parse(self, lines: Iterable[str]) -> Iterator[ParsedRecord]:
+        """Parse lines into records, one at a time.
+
+        Only the record being parsed is held in memory, so any number of lines
+        can be parsed. Lines which are not records are skipped, or continue the
+        record before them in multiline formats.
+
+        :param lines: The lines to parse, with or without line endings.
+        :type lines: Iterable[str]
+        :yield: Each record, in order.
+        :rtype: Iterator[ParsedRecord]
+        """
+        parse_line = self.parse_line
+
+        if not self.multiline:
+            for line in lines:
+                record: Optional[ParsedRecord] = parse_line(line.rstrip("\r\n"))
+                if record is not None:
+                    yield record
+            return
+
+        pending: Optional[ParsedRecord] = None
+        for line in lines:
+            line = line.rstrip("\r\n")
+            record = parse_line(line)
+            if record is None:
+                if pending is not None:
+                    self.continue_record(pending, line)
+                continue
+
+            if pending is not None:
+                yield pending
+            pending = record
+
+        if pending is not None:
+            yield pending
+
+
+def _level_number(level: str) -> int:
+    number: Any = logging.getLevelName(level)
+    if isinstance(number, int):
+        return number
+    # `logging.getLevelName` names levels it does not know as ``"Level 35"``.
+    if level.startswith("Level ") and level[6:].lstrip("-").isdigit():
+        return int(level[6:])
+    return logging.NOTSET
+
+
+# The attributes of a record rebuilt from a line, before it is filled in.
+# Process and thread details are not known unless the line records them.
+_RECORD_DEFAULTS: Dict[str, Any] = {
+    **vars(logging.makeLogRecord({})),
+    "process": None,
+    "processName": None,
+    "thread": None,
+    "threadName": None,
+}
+
+# Fields the formatters write which are not record attributes.
+_DROPPED_FIELDS: FrozenSet[str] = frozenset({"v", "rtimestamp"})
+
+# Fields holding a record attribute under another name.
+_RENAMED_FIELDS: Dict[str, str] = {
+    "function": "funcName",
+    "pid": "process",
+    "filename": "filename",
+    "lineno": "lineno",
+    "stack_info": "stack_info",
+    "levelno": "levelno",
+    "continuation": "exc_text",
+}
+
+# Objects holding several record attributes.
+_NESTED_FIELDS: Dict[str, Dict[str, str]] = {
+    "process": {"number": "process", "name": "processName"},
+    "thread": {"number": "thread", "name": "threadName"},
+    "location": {
+        "pathname": "pathname",
+        "module": "module",
+        "filename": "filename",
+        "function": "funcName",
+        "line": "lineno",
+    },
+    "exception": {"traceback": "exc_text"},
+    "err": {"stack": "exc_text"},
+}
@@ -0,0 +1,131 @@
+"""Parsers for the lines written by the text formatters.
+
+Text records may run over several lines, such as when a traceback follows
+the message. Lines which do not start a record are kept, joined by newlines,
+in the ``"continuation"`` field of the record before them.
+"""
+
+import re
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Pattern
+
+from pylogformats.parse.records import LineParser
+from pylogformats.parse.records import ParsedRecord
+
+
+class SimpleTextParser(LineParser):
+    """Parse lines written by `SimpleTextFormat`.
+
+    >>> from pylogformats.parse import SimpleTextParser
+    >>>
+    >>> SimpleTextParser().parse_line("[DEBUG] [2021-02-04 23:01:46] A Test Debug Log")
+    ParsedRecord('2021-02-04 23:01:46', 'DEBUG', None, 'A Test Debug Log')
+    """
+
+    name = "simple"
+    multiline = True
+
+    _line: Pattern[str] = re.compile(
+        r"\[(?P<level>[^\]]*)\] "
+        r"\[(?P<timestamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] "
+        r"(?P<message>.*)"
+    )
+
+    def parse_line(self, line: str) -> Optional[ParsedRecord]:
+        """Parse a single line.
+
+        :param line: The line, without its line ending.
+        :type line: str
+        :return: The record, or `None` if the line does not start a record.
+        :rtype: ParsedRecord | None
+        """
+        match = self._line.match(line)
+        if match is None:
+            return None
+
+        return ParsedRecord(
+            match.group("timestamp"), match.group("level"), None, match.group("message")
+        )
+
+
+class CompactTextParser(LineParser):
+    """Parse lines written by `CompactTextFormat`.
+
+    The format only keeps the first letter of the level, which is turned back
+    into the name of the standard level it stands for. Extras are read back as
+    the strings they were written as.
+
+    >>> from pylogformats.parse import CompactTextParser
+    >>>
+    >>> record = CompactTextParser().parse_line(
+    ...     "[D 2021-02-04 23:01:46 l:root f:app.py ln:5] A Test Log "
+    ...     "[includesExtras:Yes]"
+    ... )
+    >>> record
+    ParsedRecord('2021-02-04 23:01:46', 'DEBUG', 'root', 'A Test Log')
+    >>> record.fields
+    {'filename': 'app.py', 'lineno': 5, 'includesExtras': 'Yes'}
+    """
+
+    name = "compact"
+    multiline = True
+
+    _line: Pattern[str] = re.compile(
+        r"\[(?P<level>\S) (?P<timestamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) "
+        r"l:(?P<logger>.*?) f:(?P<filename>.*?) ln:(?P<lineno>-?\d+)\] "
+        r"(?P<rest>.*)"
+    )
+    # Extras follow the message as ``[key:value]``, separated by spaces.
+    _with_extras: Pattern[str] = re.compile(
+        r"(?P<message>.*?) (?P<extras>\[[A-Za-z_][\w.]*:.*\])"
+    )
+    _extra: Pattern[str] = re.compile(
+        r"\[(?P<key>[A-Za-z_][\w.]*):(?P<value>.*?)\](?: (?=\[[A-Za-z_][\w.]*:)|$)"
+    )
+
+    def parse_line(self, line: str) -> Optional[ParsedRecord]:
+        """Parse a single line.
+
+        :param line: The line, without its line ending.
+        :type line: str
+        :return: The record, or `None` if the line does not start a record.
+        :rtype: ParsedRecord | None
+        """
+        match = self._line.match(line)
+        if match is None:
+            return None
+
+        fields: Dict[str, Any] = {
+            "filename": match.group("filename"),
+            "lineno": int(match.group("lineno")),
+        }
+
+        # Records without extras end in the space which would separate them.
+        rest: str = match.group("rest")
+        tail = None if rest.endswith(" ") else self._with_extras.fullmatch(rest)
+        if tail is None:
+            message: str = rest[:-1] if rest.endswith(" ") else rest
+        else:
+            message = tail.group("message")
+            for extra in self._extra.finditer(tail.group("extras")):
+                fields[extra.group("key")] = extra.group("value")
+
+        letter: str = match.group("level")
+        return ParsedRecord(
+            match.group("timestamp"),
+            _LEVEL_LETTERS.get(letter, letter),
+            match.group("logger"),
+            message,
+            fields,
+        )
+
+
+_LEVEL_LETTERS: Dict[str, str] = {
+    "D": "DEBUG",
+    "I": "INFO",
+    "W": "WARNING",
+    "E": "ERROR",
+    "C": "CRITICAL",
+}
@@ -0,0 +1,262 @@
+"""Rate limit floods of the same log call.
+
+During an incident a single ``logger.warning("Connection to %s failed", host)``
+can log millions of nearly identical records. `RateLimitFilter` allows each
+log call, told apart by its logger, level and message template (``msg``
+before the arguments are merged), a burst of records followed by a steady
+rate, using a token bucket per call. It can also drop records repeating the
+last message of the call, arguments and all, within a window of time.
+
+Records the filter drops are counted. The next record of the same call which
+is let through carries the count as a ``suppressed_count`` extra, which the
+JSON formatters write with the other extras. `RateLimitFilter.summaries`
+turns the counts not yet reported into summary records, and
+`RateLimitFilter.log_summaries` logs them. Neither happens on its own: call
+one now and then, and before shutting down.
+
+The filter remembers at most ``max_keys`` calls, forgetting the least
+recently seen first, so its memory stays bounded however many different
+messages are logged. The dropped records of forgotten calls not yet reported
+are added to a single count, reported in one summary record of its own.
+
+>>> import logging
+>>> from pylogformats.ratelimit import RateLimitFilter
+>>>
+>>> rate_limit = RateLimitFilter(rate=1, burst=2)
+>>> records = [
+...     logging.makeLogRecord({"msg": "Connection to %s failed", "args": (host,)})
+...     for host in ["db1", "db2", "db3", "db4"]
+... ]
+>>> [rate_limit.filter(record) for record in records]
+[True, True, False, False]
+>>> [record.getMessage() for record in rate_limit.summaries()]
+["2 records like 'Connection to %s failed' were suppressed"]
+
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from pylogformats.message import get_message
+
+
+# The extra the number of dropped records is reported in.
+SUPPRESSED_KEY = "suppressed_count"
+
+# The message of summary records.
+SUMMARY_MESSAGE = "%d records like %r were suppressed"
+
+# The message of the summary record of calls which were forgotten.
+FORGOTTEN_MESSAGE = "%d records of log calls no longer remembered were suppressed"
+
+_Key = Tuple[str, int, Hashable]
+
+
+class _Call:
+    """What the filter remembers about one log call."""
+
+    __slots__ = ("tokens", "updated", "suppressed", "last_message", "last_time")
+
+    def __init__(self, tokens: float, now: float) -> None:
+        self.tokens: float = tokens
+        self.updated: float = now
+        self.suppressed: int = 0
+        self.last_message: Optional[str] = None
+        self.last_time: float = now
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through a steady rate of records from each log call, and count the rest.
+
+    :ivar suppressed: The number of records dropped so far, in total.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        window: Optional[float] = None,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create the filter.
+
+        :param rate: The records per second let through from each log call.
+        :type rate: float
+        :param burst: The most records let through at once from a log call \
+which was quiet, or `None` for ``rate``.
+        :type burst: float | None
+        :param window: Drop records whose message, with its arguments, is the \
+same as the last one let through from the call within this many seconds, or \
+`None` to not look at the messages.
+        :type window: float | None
+        :param max_keys: The most log calls remembered at once.
+        :type max_keys: int
+        :param clock: Returns the time in seconds, only ever increasing.
+        :type clock: Callable[[], float]
+        """
+        super().__init__()
+        self.rate: float = rate
+        self.burst: float = max(1.0, rate if burst is None else burst)
+        self.window: Optional[float] = window
+        self.max_keys: int = max(1, max_keys)
+        self.clock: Callable[[], float] = clock
+        self.suppressed: int = 0
+
+        self._calls: "OrderedDict[_Key, _Call]" = OrderedDict()
+        # The unreported drops of calls which were forgotten, and their
+        # highest level.
+        self._forgotten: int = 0
+        self._forgotten_level: int = logging.NOTSET
+        # Filters on loggers are not run under any handler's lock.
+        self._lock: threading.Lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:  # noqa: A003
+        """Decide whether to let a record through.
+
+        :param record: The record being logged.
+        :type record: logging.LogRecord
+        :return: Whether the record is let through. Records let through after \
+others of the same call were dropped carry the number dropped in \
+``suppressed_count``.
+        :rtype: bool
+        """
+        if record.msg is SUMMARY_MESSAGE or record.msg is FORGOTTEN_MESSAGE:
+            return True
+
+        key: _Key = (record.name, record.levelno, _template(record.msg))
+        message: Optional[str] = None if self.window is None else get_message(record)
+
+        with self._lock:
+            now: float = self.clock()
+            call: _Call = self._call(key, now)
+
+            call.tokens = min(
+                self.burst, call.tokens + (now - call.updated) * self.rate
+            )
+            call.updated = now
+            repeated: bool = (
+                self.window is not None
+                and message == call.last_message
+                and now - call.last_time < self.window
+            )
+            if repeated or call.tokens < 1:
+                call.suppressed += 1
+                self.suppressed += 1
+                return False
+
+            call.tokens -= 1
+            call.last_message = message
+            call.last_time = now
+            suppressed: int = call.suppressed
+            call.suppressed = 0
+
+        if suppressed:
+            setattr(record, SUPPRESSED_KEY, suppressed)
+        return True
+
+    def summaries(self) -> List[logging.LogRecord]:
+        """Report the records dropped and not yet reported, for each call.
+
+        Call this before shutting down, or now and then, to report records
+        dropped from calls which have gone quiet since.
+
+        :return: A record for each call with dropped records, at the call's \
+logger and level, carrying the number dropped in ``suppressed_count``. The \
+records dropped from calls which were forgotten since are reported together \
+in a last record, at this module's logger and their highest level.
+        :rtype: List[logging.LogRecord]
+        """
+        with self._lock:
+            pending: Dict[_Key, int] = {}
+            for key, call in self._calls.items():
+                if call.suppressed:
+                    pending[key] = call.suppressed
+                    call.suppressed = 0
+            forgotten: int = self._forgotten
+            forgotten_level: int = self._forgotten_level
+            self._forgotten = 0
+            self._forgotten_level = logging.NOTSET
+
+        summaries: List[logging.LogRecord] = [
+            _summary(name, level, SUMMARY_MESSAGE, (count, template), count)
+            for (name, level, template), count in pending.items()
+        ]
+        if forgotten:
+            summaries.append(
+                _summary(
+                    __name__,
+                    forgotten_level,
+                    FORGOTTEN_MESSAGE,
+                    (forgotten,),
+                    forgotten,
+                )
+            )
+        return summaries
+
+    def log_summaries(self, handler: Optional[logging.Handler] = None) -> None:
+        """Log the records returned by `summaries`.
+
+        The filter lets summary records through, so it can sit on the same
+        logger or handler they are logged to.
+
+        :param handler: The handler to log the summaries to, or `None` to log \
+each through the logger it is for.
+        :type handler: logging.Handler | None
+        """
+        for summary in self.summaries():
+            if handler is None:
+                logging.getLogger(summary.name).handle(summary)
+            else:
+                handler.handle(summary)
+
+    def _call(self, key: _Key, now: float) -> _Call:
+        call: Optional[_Call] = self._calls.get(key)
+        if call is not None:
+            self._calls.move_to_end(key)
+            return call
+
+        call = self._calls[key] = _Call(self.burst, now)
+        if len(self._calls) > self.max_keys:
+            forgotten_key, forgotten = self._calls.popitem(last=False)
+            if forgotten.suppressed:
+                self._forgotten += forgotten.suppressed
+                self._forgotten_level = max(self._forgotten_level, forgotten_key[1])
+        return call
+
+
+def _summary(
+    name: str, level: int, msg: str, args: Tuple[Any, ...], count: int
+) -> logging.LogRecord:
+    """Make a summary record."""
+    return logging.makeLogRecord(
+        {
+            "name": name,
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+            "msg": msg,
+            "args": args,
+            SUPPRESSED_KEY: count,
+        }
+    )
+
+
+def _template(msg: Any) -> Hashable:
+    """Return the message template, or a string standing for it."""
+    if isinstance(msg, str):
+        return msg
+    try:
+        hash(msg)
+    except TypeError:
+        return str(msg)
+    template: Hashable = msg
+    return template
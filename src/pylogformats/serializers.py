@@ -0,0 +1,366 @@
+"""JSON serializer backends for the JSON Format classes.
+
+The JSON formatters serialize every record through a `Serializer`. The
+default, `StdlibSerializer`, produces exactly the output of `json.dumps`.
+Faster third party libraries are used when requested by name:
+
+- ``"orjson"`` - `orjson <https://github.com/ijl/orjson>`_
+- ``"msgspec"`` - `msgspec <https://github.com/jcrist/msgspec>`_
+- ``"ujson"`` - `ujson <https://github.com/ultrajson/ultrajson>`_
+
+All backends keep the key order of the record, but none writes exactly the
+output of `json.dumps`. orjson and msgspec write compact separators
+(``{"a":1}``) and non-ASCII characters as UTF-8 rather than ``\\u`` escapes.
+ujson is set up to come close, but writes some floats differently (``1e-7``
+rather than ``1e-07``). All of it is still valid JSON which any JSON parser
+reads back to the same values. `Serializer.matches_json_dumps` tells the
+backends apart, and ``"auto"`` only picks one whose output matches.
+
+Values JSON has no type for, such as dates or arbitrary objects in extras,
+are encoded with `pylogformats.encoders.encode_default` rather than failing.
+"""
+
+import importlib
+import json
+import threading
+from abc import ABC
+from abc import abstractmethod
+from json import encoder as json_encoder
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Type
+from typing import Union
+
+from pylogformats.encoders import encode_default
+
+
+def _encode_bool(value: bool) -> str:
+    return "true" if value else "false"
+
+
+def _encode_none(value: None) -> str:
+    return "null"
+
+
+class Serializer(ABC):
+    """Turns a JSON compatible record into a string.
+
+    :cvar name: The name the backend is registered under.
+    :cvar item_separator: The separator written between items.
+    :cvar key_separator: The separator written between a key and its value.
+    :cvar splices_values: Whether field plans encode each value on its own and \
+splice it into pre-encoded JSON. Backends whose per-call overhead outweighs \
+serializing the whole record leave this off.
+    :cvar native_bytes: Whether the backend produces bytes rather than a string.
+    :cvar matches_json_dumps: Whether the output is the same as `json.dumps`.
+    """
+
+    name: str = ""
+    item_separator: str = ", "
+    key_separator: str = ": "
+    splices_values: bool = False
+    native_bytes: bool = False
+    matches_json_dumps: bool = False
+
+    def __init__(self) -> None:
+        """Collect the value encoders."""
+        self._encoders: Dict[type, Callable[[Any], str]] = self.value_encoders()
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str:
+        """Serialize an object into a JSON string.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        """
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize an object into UTF-8 encoded JSON.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :return: The JSON document.
+        :rtype: bytes
+        """
+        return self.dumps(obj).encode("utf-8")
+
+    def encode_str(self, value: str) -> str:
+        """Serialize a single string.
+
+        :param value: The string to serialize.
+        :type value: str
+        :return: The JSON string literal.
+        :rtype: str
+        """
+        return self.dumps(value)
+
+    def value_encoders(self) -> Dict[type, Callable[[Any], str]]:
+        """Return fast encoders for common values, keyed on their exact type.
+
+        :return: A mapping of types to functions encoding a single value.
+        :rtype: Dict[type, Callable[[Any], str]]
+        """
+        return {
+            str: self.encode_str,
+            int: int.__repr__,
+            bool: _encode_bool,
+            type(None): _encode_none,
+        }
+
+    def encode_values(self, values: Sequence[Any]) -> List[str]:
+        """Serialize each value of a sequence separately.
+
+        :param values: The values to serialize.
+        :type values: Sequence[Any]
+        :return: The JSON form of every value, in order.
+        :rtype: List[str]
+        """
+        encoders = self._encoders
+        dumps = self.dumps
+        return [encoders.get(type(value), dumps)(value) for value in values]
+
+
+class StdlibSerializer(Serializer):
+    """Serialize with Python's `json` module.
+
+    Produces exactly the output of `json.dumps`. The underlying encoder is
+    built once, rather than on every call as `json.dumps` does.
+    """
+
+    name = "json"
+    splices_values = True
+    matches_json_dumps = True
+
+    def __init__(self) -> None:
+        """Build the encoder."""
+        self._encoder: json.JSONEncoder = json.JSONEncoder(default=encode_default)
+        self._c_make_encoder: Optional[Callable[..., Any]] = getattr(
+            json_encoder, "c_make_encoder", None
+        )
+        # Each thread has its own encoder, as the containers being encoded
+        # are tracked in a dict to detect circular references.
+        self._local: threading.local = threading.local()
+        super().__init__()
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize an object into a JSON string.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :raises ValueError: When the object refers to itself.
+        :return: The JSON string.
+        :rtype: str
+        """
+        if self._c_make_encoder is None:  # pragma: no cover
+            return self._encoder.encode(obj)
+
+        local: threading.local = self._local
+        try:
+            iterencode: Callable[[Any, int], List[str]] = local.iterencode
+        except AttributeError:
+            local.markers = {}
+            iterencode = local.iterencode = self._c_make_encoder(
+                local.markers,
+                encode_default,
+                json_encoder.encode_basestring_ascii,
+                None,
+                self.key_separator,
+                self.item_separator,
+                False,
+                False,
+                True,
+            )
+
+        try:
+            return "".join(iterencode(obj, 0))
+        except BaseException:
+            # The encoder leaves the containers it was in the middle of.
+            local.markers.clear()
+            raise
+
+    def encode_str(self, value: str) -> str:
+        """Serialize a single string.
+
+        :param value: The string to serialize.
+        :type value: str
+        :return: The JSON string literal.
+        :rtype: str
+        """
+        return json_encoder.encode_basestring_ascii(value)
+
+    def value_encoders(self) -> Dict[type, Callable[[Any], str]]:
+        """Return fast encoders for common values, keyed on their exact type.
+
+        :return: A mapping of types to functions encoding a single value.
+        :rtype: Dict[type, Callable[[Any], str]]
+        """
+        encoders = super().value_encoders()
+        # Skip the method call, this is the C function `json.dumps` uses.
+        encoders[str] = json_encoder.encode_basestring_ascii
+        return encoders
+
+
+class OrjsonSerializer(Serializer):
+    """Serialize with `orjson`."""
+
+    name = "orjson"
+    item_separator = ","
+    key_separator = ":"
+    native_bytes = True
+
+    def __init__(self) -> None:
+        """Import orjson."""
+        self._orjson: Any = importlib.import_module("orjson")
+        self._option: int = self._orjson.OPT_NON_STR_KEYS
+        super().__init__()
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize an object into a JSON string.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :return: The JSON string.
+        :rtype: str
+        """
+        return str(self.dumps_bytes(obj), "utf-8")
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize an object into UTF-8 encoded JSON.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :return: The JSON document.
+        :rtype: bytes
+        """
+        result: bytes = self._orjson.dumps(
+            obj, default=encode_default, option=self._option
+        )
+        return result
+
+
+class MsgspecSerializer(Serializer):
+    """Serialize with `msgspec`."""
+
+    name = "msgspec"
+    item_separator = ","
+    key_separator = ":"
+    native_bytes = True
+
+    def __init__(self) -> None:
+        """Import msgspec and build the encoder."""
+        msgspec: Any = importlib.import_module("msgspec")
+        self._encode: Callable[[Any], bytes] = msgspec.json.Encoder(
+            enc_hook=encode_default
+        ).encode
+        super().__init__()
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize an object into a JSON string.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :return: The JSON string.
+        :rtype: str
+        """
+        return str(self.dumps_bytes(obj), "utf-8")
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize an object into UTF-8 encoded JSON.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :raises ValueError: When the object refers to itself, or is nested too \
+deeply.
+        :return: The JSON document.
+        :rtype: bytes
+        """
+        try:
+            return self._encode(obj)
+        except RecursionError as error:
+            # Logging lets a RecursionError escape the logging call.
+            raise ValueError(str(error)) from error
+
+
+class UjsonSerializer(Serializer):
+    """Serialize with `ujson`, set up to write close to the output of `json`."""
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        """Import ujson."""
+        self._ujson: Any = importlib.import_module("ujson")
+        super().__init__()
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize an object into a JSON string.
+
+        :param obj: The object to serialize.
+        :type obj: Any
+        :return: The JSON string.
+        :rtype: str
+        """
+        result: str = self._ujson.dumps(
+            obj,
+            ensure_ascii=True,
+            escape_forward_slashes=False,
+            separators=(self.item_separator, self.key_separator),
+            default=encode_default,
+        )
+        return result
+
+
+SERIALIZERS: Dict[str, Type[Serializer]] = {
+    serializer.name: serializer
+    for serializer in (
+        StdlibSerializer,
+        OrjsonSerializer,
+        MsgspecSerializer,
+        UjsonSerializer,
+    )
+}
+
+# The order backends are tried in by ``"auto"``, fastest first. Only the ones
+# writing the same output as `json.dumps` take part, the others are opt-in.
+AUTO_ORDER: List[str] = [
+    name
+    for name in ("orjson", "msgspec", "ujson", "json")
+    if SERIALIZERS[name].matches_json_dumps
+]
+
+
+def get_serializer(serializer: Union[str, Serializer, None] = None) -> Serializer:
+    """Resolve a serializer by name.
+
+    :param serializer: A `Serializer` instance, a backend name, ``"auto"`` to \
+use the fastest installed backend writing the same output as `json.dumps`, \
+or `None` for the standard library. The other backends are only used when \
+named.
+    :type serializer: str | Serializer | None
+    :raises ValueError: When the backend name is not known.
+    :return: A ready to use serializer.
+    :rtype: Serializer
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+
+    if serializer is None:
+        return StdlibSerializer()
+
+    if serializer == "auto":
+        for name in AUTO_ORDER:  # pragma: no branch
+            try:
+                return SERIALIZERS[name]()
+            except ImportError:
+                continue
+
+    if serializer not in SERIALIZERS:
+        raise ValueError(
+            f"Unknown serializer {serializer!r}, expected one of "
+            f"{', '.join(['auto', *SERIALIZERS])}"
+        )
+
+    return SERIALIZERS[serializer]()
@@ -1,11 +1,20 @@
 """Compact Text Format."""
 
 import logging
+from typing import Any
+from typing import Dict
+from typing import Optional
 
-from pylogformats.baseline import BASELINE
+from pylogformats.base import BaseFormat
+from pylogformats.baseline import BASELINE_KEYS
+from pylogformats.context import record_context
+from pylogformats.limits import SizeLimits
+from pylogformats.message import get_message
+from pylogformats.timestamps import StrftimeTimestamp
+from pylogformats.tracebacks import error_text
 
 
-class CompactTextFormat(logging.Formatter):
+class CompactTextFormat(BaseFormat):
     """A formatter for an opinionated Compact Text format.
 
     Extends the `logging.Formatter` class to correctly format a log record using
@@ -45,6 +54,27 @@ class CompactTextFormat(logging.Formatter):
 
     """
 
+    def __init__(
+        self, *args: Any, limits: Optional[SizeLimits] = None, **kwargs: Any
+    ) -> None:
+        """Initialise the formatter.
+
+        :param args: Positional arguments passed to `logging.Formatter`.
+        :type args: Any
+        :param limits: Cut oversized messages and extras down to size, see \
+`pylogformats.limits`.
+        :type limits: SizeLimits | None
+        :param kwargs: Keyword arguments passed to `logging.Formatter`.
+        :type kwargs: Any
+        """
+        super().__init__(*args, **kwargs)
+        self.limits: Optional[SizeLimits] = limits
+        # Look the converter up on a cache miss, so it can still be swapped out
+        # after construction just like with `logging.Formatter.formatTime`.
+        self._timestamp: StrftimeTimestamp = StrftimeTimestamp(
+            "%Y-%m-%d %H:%M:%S", lambda created: self.converter(created)
+        )
+
     def format(self, record: logging.LogRecord) -> str:
         """Format LogRecords into an Compact Text log format.
 
@@ -55,18 +85,24 @@ information about the event being logged.
         :rtype: str
         """
         log_level: str = record.levelname[0].upper()
-        date_str: str = self.formatTime(record, "%Y-%m-%d %H:%M:%S")
+        date_str: str = self._timestamp(record.created)
         preamble: str = (
             f"[{log_level} {date_str} l:{record.name} f:{record.filename or 'unknown'} "
             f"ln:{record.lineno}]"
         )
 
-        extras: str = " ".join(
-            [
-                f"[{key}:{value}]"
+        message: str = get_message(record)
+        values: Dict[str, Any] = {
+            **record_context(record),
+            **{
+                key: value
                 for key, value in vars(record).items()
-                if key not in BASELINE
-            ]
-        )
+                if key not in BASELINE_KEYS
+            },
+        }
+        if self.limits is not None:
+            message, values = self.limits.limit_record(message, values)
+
+        extras: str = " ".join([f"[{key}:{value}]" for key, value in values.items()])
 
-        return f"{preamble} {record.getMessage()} {extras}"
+        return f"{preamble} {message} {extras}{error_text(record)}"
@@ -1,9 +1,17 @@
 """Compact Text Format."""
 
 import logging
+from typing import Any
+from typing import Optional
 
+from pylogformats.base import BaseFormat
+from pylogformats.limits import SizeLimits
+from pylogformats.message import get_message
+from pylogformats.timestamps import StrftimeTimestamp
+from pylogformats.tracebacks import error_text
 
-class SimpleTextFormat(logging.Formatter):
+
+class SimpleTextFormat(BaseFormat):
     """A formatter for an opinionated Compact Text format.
 
     Extends the `logging.Formatter` class to correctly format a log record using
@@ -43,6 +51,27 @@ class SimpleTextFormat(logging.Formatter):
 
     """
 
+    def __init__(
+        self, *args: Any, limits: Optional[SizeLimits] = None, **kwargs: Any
+    ) -> None:
+        """Initialise the formatter.
+
+        :param args: Positional arguments passed to `logging.Formatter`.
+        :type args: Any
+        :param limits: Cut oversized messages down to size, see \
+`pylogformats.limits`.
+        :type limits: SizeLimits | None
+        :param kwargs: Keyword arguments passed to `logging.Formatter`.
+        :type kwargs: Any
+        """
+        super().__init__(*args, **kwargs)
+        self.limits: Optional[SizeLimits] = limits
+        # Look the converter up on a cache miss, so it can still be swapped out
+        # after construction just like with `logging.Formatter.formatTime`.
+        self._timestamp: StrftimeTimestamp = StrftimeTimestamp(
+            "%Y-%m-%d %H:%M:%S", lambda created: self.converter(created)
+        )
+
     def format(self, record: logging.LogRecord) -> str:
         """Format LogRecords into an simplified Text log format.
 
@@ -53,7 +82,13 @@ information about the event being logged.
         :rtype: str
         """
         log_level: str = record.levelname.upper()
-        date_str: str = self.formatTime(record, "%Y-%m-%d %H:%M:%S")
+        date_str: str = self._timestamp(record.created)
         preamble: str = f"[{log_level}] [{date_str}]"
 
-        return f"{preamble} {record.getMessage()}"
+        message: str = get_message(record)
+        if self.limits is not None:
+            message, marks = self.limits.limit_record(message, {})
+            if marks:
+                message = f"{message} [truncated]"
+
+        return f"{preamble} {message}{error_text(record)}"
@@ -0,0 +1,222 @@
+"""Timestamp rendering with a per-second cache.
+
+Log records arrive many times a second, but everything in a rendered
+timestamp down to the whole second is shared between them. The classes here
+render that part once per second and only append the fractional part per
+record, producing exactly the same strings as the `datetime` and `time`
+calls they replace.
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+
+def split_timestamp(created: float) -> Tuple[int, int]:
+    """Split a POSIX timestamp into whole seconds and microseconds.
+
+    Rounds half to even, exactly like `datetime.fromtimestamp`.
+
+    :param created: A POSIX timestamp, such as `logging.LogRecord.created`.
+    :type created: float
+    :return: The whole seconds and the microseconds within that second.
+    :rtype: Tuple[int, int]
+    """
+    fraction, whole = math.modf(created)
+    second: int = int(whole)
+    micros: int = round(fraction * 1e6)
+
+    if micros >= 1_000_000:
+        second += 1
+        micros -= 1_000_000
+    elif micros < 0:
+        second -= 1
+        micros += 1_000_000
+
+    return second, micros
+
+
+class TimestampCache:
+    """Remember the rendered form of the most recently seen second.
+
+    The cached value is swapped as a single tuple, so the cache can be shared
+    between threads without a lock.
+    """
+
+    __slots__ = ("_render", "_last")
+
+    def __init__(self, render: Callable[[int], str]) -> None:
+        """Create a cache around a renderer.
+
+        :param render: Renders a whole POSIX second into a string.
+        :type render: Callable[[int], str]
+        """
+        self._render: Callable[[int], str] = render
+        self._last: Tuple[Optional[int], str] = (None, "")
+
+    def __call__(self, second: int) -> str:
+        """Return the rendered second, rendering it only on a cache miss.
+
+        :param second: A whole POSIX second.
+        :type second: int
+        :return: The rendered second.
+        :rtype: str
+        """
+        last = self._last
+        if last[0] == second:
+            return last[1]
+
+        rendered: str = self._render(second)
+        self._last = (second, rendered)
+        return rendered
+
+
+class IsoTimestamp:
+    """Render timestamps like ``datetime.fromtimestamp(created).isoformat()``.
+
+    >>> from pylogformats.timestamps import IsoTimestamp
+    >>> from datetime import datetime
+    >>>
+    >>> render = IsoTimestamp()
+    >>> created = 1612479772.522958
+    >>> render(created) == datetime.fromtimestamp(created).isoformat()
+    True
+
+    """
+
+    __slots__ = ("_last",)
+
+    def __init__(self) -> None:
+        """Create the renderer with an empty cache."""
+        self._last: Tuple[Optional[int], str] = (None, "")
+
+    def __call__(self, created: float) -> str:
+        """Render a timestamp.
+
+        :param created: A POSIX timestamp.
+        :type created: float
+        :return: The timestamp in local time, in ISO 8601 format.
+        :rtype: str
+        """
+        # `split_timestamp` inlined, as this runs for every record.
+        fraction, whole = math.modf(created)
+        second: int = int(whole)
+        micros: int = round(fraction * 1e6)
+        if not 0 <= micros < 1_000_000:
+            second, micros = split_timestamp(created)
+
+        last = self._last
+        if last[0] != second:
+            last = (second, datetime.fromtimestamp(second).isoformat() + ".")
+            self._last = last
+
+        # `isoformat` leaves the fraction out entirely when it is zero.
+        if micros:
+            return last[1] + str(micros).zfill(6)
+        return last[1][:-1]
+
+
+# Every possible millisecond suffix of a Bunyan timestamp.
+_BUNYAN_MILLIS: Tuple[str, ...] = tuple(f".{millis:03d}Z" for millis in range(1000))
+
+
+class BunyanTimestamp:
+    """Render timestamps in Bunyan's millisecond precision ISO 8601 format.
+
+    Matches ``datetime.fromtimestamp(created).strftime("%Y-%m-%dT%H:%M:%S.%f")``
+    with the last three digits replaced by ``Z``.
+    """
+
+    __slots__ = ("_last",)
+
+    def __init__(self) -> None:
+        """Create the renderer with an empty cache."""
+        self._last: Tuple[Optional[int], str] = (None, "")
+
+    def __call__(self, created: float) -> str:
+        """Render a timestamp.
+
+        :param created: A POSIX timestamp.
+        :type created: float
+        :return: The timestamp in local time, with truncated milliseconds.
+        :rtype: str
+        """
+        fraction, whole = math.modf(created)
+        second: int = int(whole)
+        micros: int = round(fraction * 1e6)
+        if not 0 <= micros < 1_000_000:
+            second, micros = split_timestamp(created)
+
+        last = self._last
+        if last[0] != second:
+            prefix: str = datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S")
+            last = (second, prefix)
+            self._last = last
+
+        return last[1] + _BUNYAN_MILLIS[micros // 1000]
+
+
+class StrftimeTimestamp:
+    """Render timestamps with second precision `time.strftime` formats.
+
+    Matches `logging.Formatter.formatTime`, which converts the timestamp with
+    a `time` converter (`time.localtime` by default) before formatting it.
+    """
+
+    __slots__ = ("_cache",)
+
+    def __init__(
+        self,
+        datefmt: str,
+        converter: Callable[[Optional[float]], time.struct_time] = time.localtime,
+    ) -> None:
+        """Create the renderer with an empty cache.
+
+        :param datefmt: A `time.strftime` format string without sub-second fields.
+        :type datefmt: str
+        :param converter: Converts a timestamp into a `time.struct_time`.
+        :type converter: Callable[[float | None], time.struct_time]
+        """
+        self._cache: TimestampCache = TimestampCache(
+            lambda second: time.strftime(datefmt, converter(second))
+        )
+
+    def __call__(self, created: float) -> str:
+        """Render a timestamp.
+
+        :param created: A POSIX timestamp.
+        :type created: float
+        :return: The formatted timestamp.
+        :rtype: str
+        """
+        # The `time` converters truncate towards negative infinity.
+        return self._cache(math.floor(created))
+
+
+def parse_timestamp(timestamp: str) -> Optional[float]:
+    """Turn a timestamp written by any of the formatters back into a number.
+
+    Every format writes local time, including Bunyan's, despite its ``Z``
+    suffix, so the timestamp is read as local time.
+
+    >>> from pylogformats.timestamps import BunyanTimestamp
+    >>> from pylogformats.timestamps import parse_timestamp
+    >>>
+    >>> parse_timestamp(BunyanTimestamp()(1612479772.5))
+    1612479772.5
+    >>> parse_timestamp("not a timestamp") is None
+    True
+
+    :param timestamp: A timestamp rendered by `IsoTimestamp`, `BunyanTimestamp` \
+or the text formats.
+    :type timestamp: str
+    :return: The POSIX timestamp, or `None` if it can not be read.
+    :rtype: float | None
+    """
+    try:
+        return datetime.fromisoformat(timestamp.rstrip("Z")).timestamp()
+    except ValueError:
+        return None
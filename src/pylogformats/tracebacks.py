@@ -0,0 +1,174 @@
+"""Render exceptions once, however often they are logged.
+
+Walking a traceback and formatting it is far more expensive than formatting
+the rest of a record. Code which retries an operation may log the same
+exception object many times, so `render_exception` keeps the renderings of
+the last few exceptions and reuses one while its traceback is unchanged.
+Only weak references to the exceptions are kept, so the frames of their
+tracebacks, and the locals in them, are not kept alive. Exceptions which do
+not support weak references, such as those of the built-in classes, are
+rendered every time they are logged.
+
+>>> import sys
+>>> from pylogformats.tracebacks import render_exception
+>>>
+>>> class RetryFailed(Exception):
+...     pass
+>>>
+>>> try:
+...     raise RetryFailed("Something went wrong")
+... except RetryFailed:
+...     exc_info = sys.exc_info()
+>>>
+>>> rendered = render_exception(exc_info)
+>>> rendered.exc_type, rendered.exc_message
+('RetryFailed', 'Something went wrong')
+>>> render_exception(exc_info) is rendered
+True
+
+"""
+
+import logging
+import threading
+import traceback
+import weakref
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+# The most exceptions whose renderings are kept at once.
+CACHE_SIZE = 32
+
+
+class RenderedException:
+    """An exception rendered for log output.
+
+    :ivar exc_type: The name of the exception class.
+    :ivar exc_message: The exception as a string.
+    :ivar frames: The frames of the traceback, outermost first.
+    :ivar text: The traceback as `logging.Formatter.formatException` renders it.
+    """
+
+    __slots__ = ("exc_type", "exc_message", "frames", "text")
+
+    def __init__(
+        self,
+        exc_type: str,
+        exc_message: str,
+        frames: List[Dict[str, Any]],
+        text: str,
+    ) -> None:
+        """Hold a rendered exception.
+
+        :param exc_type: The name of the exception class.
+        :type exc_type: str
+        :param exc_message: The exception as a string.
+        :type exc_message: str
+        :param frames: The frames of the traceback, outermost first.
+        :type frames: List[Dict[str, Any]]
+        :param text: The formatted traceback.
+        :type text: str
+        """
+        self.exc_type: str = exc_type
+        self.exc_message: str = exc_message
+        self.frames: List[Dict[str, Any]] = frames
+        self.text: str = text
+
+
+def render_exception(exc_info: Any) -> Optional[RenderedException]:
+    """Render an exception, reusing an earlier rendering where possible.
+
+    :param exc_info: A ``(type, value, traceback)`` tuple, as in \
+`logging.LogRecord.exc_info`.
+    :type exc_info: Tuple | None
+    :return: The rendered exception, or `None` if there is no exception.
+    :rtype: RenderedException | None
+    """
+    if not exc_info or exc_info[1] is None:
+        return None
+
+    exc_type, exc, tb = exc_info
+
+    # Keyed on the traceback too, which changes when the exception is raised
+    # again. The weak reference tells whether the entry is for this exception
+    # or for an earlier one which had the same id.
+    key: _Key = (id(exc_type), id(exc), id(tb))
+    with _cache_lock:
+        cached: Optional[Tuple[Any, RenderedException]] = _cache.get(key)
+        if cached is not None and cached[0]() is exc:
+            _cache.move_to_end(key)
+            return cached[1]
+
+    rendered = RenderedException(
+        exc_type.__name__,
+        _safe_str(exc),
+        [
+            {
+                "filename": frame.filename,
+                "line": frame.lineno,
+                "function": frame.name,
+                "code": frame.line,
+            }
+            for frame in traceback.extract_tb(tb)
+        ],
+        _EXCEPTION_FORMATTER.formatException(exc_info),
+    )
+
+    try:
+        reference: Any = weakref.ref(exc)
+    except TypeError:
+        return rendered
+
+    with _cache_lock:
+        _cache[key] = (reference, rendered)
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return rendered
+
+
+def error_text(record: logging.LogRecord) -> str:
+    """Return the exception and stack of a record as trailing lines of text.
+
+    Laid out like `logging.Formatter.format` appends them to a message.
+
+    :param record: The record being formatted.
+    :type record: logging.LogRecord
+    :return: The traceback and stack, each on new lines, or an empty string.
+    :rtype: str
+    """
+    text: str = ""
+
+    rendered: Optional[RenderedException] = render_exception(record.exc_info)
+    if rendered is not None:
+        text += "\n" + rendered.text
+    elif record.exc_text:
+        text += "\n" + record.exc_text
+
+    if record.stack_info:
+        text += "\n" + record.stack_info
+
+    return text
+
+
+# Exceptions are formatted exactly as `logging` formats them.
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+# The ids of an exception's type, value and traceback.
+_Key = Tuple[int, int, int]
+
+# The latest renderings, oldest first, with weak references to the exceptions
+# they render.
+_cache: "OrderedDict[_Key, Tuple[Any, RenderedException]]" = OrderedDict()
+_cache_lock: threading.Lock = threading.Lock()
+
+
+def _safe_str(exc: BaseException) -> str:
+    try:
+        return str(exc)
+    except Exception:  # noqa: B902
+        return f"<exception str() failed: {type(exc).__name__}>"
@@ -3,6 +3,7 @@
 import datetime
 import json
 import logging
+import os
 import re
 from typing import Dict
 from typing import Optional
@@ -11,6 +12,7 @@ from typing import Union
 
 import pytest
 
+from pylogformats.identity import ProcessIdentity
 from pylogformats.json import BunyanFormat
 
 
@@ -190,3 +192,30 @@ def test_bunyan_date_formatter(
     just_time_format: str = bunyan_formatter.formatTime(log_record, "%H:%m:%S")
     assert isinstance(just_time_format, str)
     assert re.search(r"\d{2}:\d{2}:\d{2}", just_time_format) is not None
+
+
+def test_bunyan_explicit_hostname(log_record: logging.LogRecord) -> None:
+    """Test that an explicit hostname is used for every record."""
+    del log_record.__dict__["hostname"]
+    formatter: BunyanFormat = BunyanFormat(hostname="OtherPc")
+
+    valid_json: Dict[str, object] = json.loads(formatter.format(log_record))
+
+    assert valid_json["hostname"] == "OtherPc"
+
+
+def test_bunyan_shared_identity(log_record: logging.LogRecord) -> None:
+    """Test that a shared identity fills in the hostname and a missing pid."""
+    del log_record.__dict__["hostname"]
+    log_record.process = None
+    formatter: BunyanFormat = BunyanFormat(identity=ProcessIdentity("SharedPc"))
+
+    valid_json: Dict[str, object] = json.loads(formatter.format(log_record))
+
+    assert valid_json["hostname"] == "SharedPc"
+    assert valid_json["pid"] == os.getpid()
+
+
+def test_bunyan_has_no_field_plan(bunyan_formatter: BunyanFormat) -> None:
+    """Test that no field plan is compiled for the records built directly."""
+    assert not hasattr(bunyan_formatter, "_plan")
@@ -3,6 +3,7 @@
 import datetime
 import json
 import logging
+import os
 import re
 from typing import Any
 from typing import Dict
@@ -12,7 +13,9 @@ from typing import Union
 
 import pytest
 
+from pylogformats.identity import ProcessIdentity
 from pylogformats.json import JsonFormat
+from pylogformats.json.base import BaseJsonFormat
 
 
 USE_DATETIME = datetime.datetime.utcnow()
@@ -204,3 +207,22 @@ def test_json_extras(
     assert valid_json["int_extra"] == 2
     assert "float_extra" in valid_json
     assert valid_json["float_extra"] == 1.5
+
+
+def test_json_identity_fallback(log_record: logging.LogRecord) -> None:
+    """Test that a cached identity fills in missing process details."""
+    log_record.process = None
+    log_record.processName = None
+
+    default_json: Dict[str, Any] = json.loads(JsonFormat().format(log_record))
+    assert default_json["process"] == {"number": 0, "name": "unknown"}
+
+    formatter: JsonFormat = JsonFormat(identity=ProcessIdentity())
+    valid_json: Dict[str, Any] = json.loads(formatter.format(log_record))
+    assert valid_json["process"] == {"number": os.getpid(), "name": "MainProcess"}
+
+
+def test_json_base_requires_fields() -> None:
+    """Test that JSON formats must describe their layout."""
+    with pytest.raises(TypeError, match="abstract"):
+        BaseJsonFormat()  # type: ignore[abstract]
@@ -0,0 +1,187 @@
+"""Test cases for aggregating logs from many processes."""
+
+import json
+import logging
+import multiprocessing
+import os
+import pickle  # noqa: S403
+import queue
+import sys
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+
+from pylogformats.handlers import AggregatedWriter
+from pylogformats.handlers import RecordShippingHandler
+from pylogformats.handlers.aggregate import _write_records
+from pylogformats.json import JsonFormat
+
+
+class Unpicklable:
+    """An extra which can not be pickled."""
+
+    def __reduce__(self) -> Any:
+        """Refuse to be pickled."""
+        raise TypeError("not picklable")
+
+    def __repr__(self) -> str:
+        """Return a fixed representation."""
+        return "<unpicklable>"
+
+
+class Trickle:
+    """Hands out one record at a time, as if each arrived on its own.
+
+    Every other record is followed by a moment with nothing left to write.
+    """
+
+    def __init__(self, records: "queue.Queue[Any]") -> None:
+        """Wrap a queue."""
+        self.records = records
+        self.handed_out = 0
+
+    def get(self) -> Any:
+        """Return the next record."""
+        self.handed_out += 1
+        return self.records.get_nowait()
+
+    def get_nowait(self) -> Any:
+        """Report that the next record has not arrived yet."""
+        raise queue.Empty
+
+    def empty(self) -> bool:
+        """Report whether the writer has caught up."""
+        return self.handed_out % 2 == 1
+
+
+class FailingFormat(logging.Formatter):
+    """Fails to format records with a ``fail`` extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format the message, unless the record asks to fail."""
+        if getattr(record, "fail", False):
+            raise ValueError("failed")
+        return record.getMessage()
+
+
+def _ship(records: "queue.Queue[Any]", **extra: Any) -> None:
+    logger = logging.getLogger(f"aggregate.{len(extra)}")
+    logger.propagate = False
+    handler = RecordShippingHandler(records)
+    logger.addHandler(handler)
+    try:
+        try:
+            raise ValueError("Shipped exception")
+        except ValueError:
+            logger.exception("Record %s", "shipped", extra=extra)
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_write_records(tmp_path: Path) -> None:
+    """Test that shipped records are formatted and written in order."""
+    records: "queue.Queue[Any]" = queue.Queue()
+    _ship(records)
+    _ship(records, unpicklable=Unpicklable(), numbers=[1, 2])
+    RecordShippingHandler(records).handle(logging.makeLogRecord({"msg": "Plain"}))
+    records.put(None)
+
+    output: Path = tmp_path / "out.log"
+    _write_records(Trickle(records), str(output), JsonFormat, 1024, 10)
+
+    lines: List[Dict[str, Any]] = [
+        json.loads(line) for line in output.read_text().splitlines()
+    ]
+    assert [line["message"] for line in lines] == ["Record shipped"] * 2 + ["Plain"]
+    assert lines[0]["process"]["number"] == os.getpid()
+    assert lines[1]["unpicklable"] == "<unpicklable>"
+    assert lines[1]["numbers"] == [1, 2]
+
+
+def test_write_records_formatting_errors(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that a record which fails to format does not lose its batch."""
+    records: "queue.Queue[Any]" = queue.Queue()
+    _ship(records)
+    _ship(records, fail=True)
+    _ship(records)
+    records.put(None)
+
+    output: Path = tmp_path / "out.log"
+    _write_records(records, str(output), FailingFormat, 1024, 10)
+
+    assert output.read_text() == "Record shipped\nRecord shipped\n"
+    assert "ValueError: failed" in capsys.readouterr().err
+
+
+def test_prepare_keeps_exception_text() -> None:
+    """Test that exception text rendered by another handler is kept."""
+    handler = RecordShippingHandler(None)
+    try:
+        raise ValueError("Shipped exception")
+    except ValueError:
+        record = logging.makeLogRecord(
+            {"msg": "Shipped", "exc_info": sys.exc_info(), "exc_text": "Rendered"}
+        )
+
+    state: Dict[str, Any] = pickle.loads(handler.prepare(record))  # noqa: S301
+
+    assert (state["exc_info"], state["exc_text"]) == (None, "Rendered")
+
+
+def test_shipping_errors() -> None:
+    """Test that records which can not be shipped go to `handleError`."""
+    errors: List[logging.LogRecord] = []
+    handler = RecordShippingHandler(queue.Queue())
+    handler.handleError = errors.append  # type: ignore[assignment]
+
+    handler.handle(logging.makeLogRecord({"msg": "Lost %d", "args": ("one",)}))
+
+    assert len(errors) == 1
+
+
+def _worker(handler: logging.Handler, index: int) -> None:  # pragma: no cover
+    logger = logging.getLogger("aggregate.worker")
+    logger.addHandler(handler)
+    logger.warning("Worker %d", index)
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="workers inherit the handler through fork"
+)
+def test_aggregated_writer(tmp_path: Path) -> None:
+    """Test that records keep the process details of the worker logging them."""
+    context = multiprocessing.get_context("fork")
+    output: Path = tmp_path / "out.log"
+    writer = AggregatedWriter(str(output), JsonFormat, context=context)
+    writer.start()
+
+    workers = [
+        context.Process(
+            target=_worker, args=(writer.handler(), index), name=f"w{index}"
+        )
+        for index in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    writer.stop()
+    writer.stop()
+
+    lines: List[Dict[str, Any]] = [
+        json.loads(line) for line in output.read_text().splitlines()
+    ]
+    assert sorted(line["message"] for line in lines) == [
+        "Worker 0",
+        "Worker 1",
+        "Worker 2",
+    ]
+    assert {(line["process"]["number"], line["process"]["name"]) for line in lines} == {
+        (worker.pid, worker.name) for worker in workers
+    }
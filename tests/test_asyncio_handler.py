@@ -0,0 +1,271 @@
+"""Test cases for the asyncio handler."""
+
+import asyncio
+import json
+import logging
+import pathlib
+import threading
+from typing import List
+from typing import Tuple
+
+import pytest
+
+from pylogformats import JsonFormat
+from pylogformats.handlers import AsyncioHandler
+from pylogformats.handlers import AsyncTarget
+from pylogformats.handlers import FileTarget
+from pylogformats.handlers import StreamTarget
+
+
+def _record(msg: str = "A demo log message", *args: object) -> logging.LogRecord:
+    return logging.makeLogRecord({"name": "root", "msg": msg, "args": args})
+
+
+class Collector:
+    """A socket server collecting everything sent to it."""
+
+    def __init__(self) -> None:
+        """Start with nothing received."""
+        self.data: bytearray = bytearray()
+        self.done: asyncio.Event = asyncio.Event()
+
+    async def __call__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read a connection until it is closed."""
+        self.data += await reader.read()
+        writer.close()
+        self.done.set()
+
+    def messages(self) -> List[str]:
+        """Decode the received lines."""
+        return [json.loads(line)["message"] for line in self.data.splitlines()]
+
+
+class RecordingTarget(AsyncTarget):
+    """Keeps the batches written to it."""
+
+    def __init__(self) -> None:
+        """Start with no batches."""
+        self.batches: List[bytes] = []
+        self.closed: bool = False
+
+    async def write(self, data: bytes) -> None:
+        """Keep a batch."""
+        self.batches.append(data)
+
+    async def close(self) -> None:
+        """Note the close."""
+        self.closed = True
+
+
+def test_tcp_socket() -> None:
+    """Test records from the loop and other threads are written to a socket."""
+
+    async def main() -> Tuple[Collector, AsyncioHandler]:
+        collector = Collector()
+        server = await asyncio.start_server(collector, "127.0.0.1", 0)
+        port: int = server.sockets[0].getsockname()[1]
+
+        handler = AsyncioHandler(await StreamTarget.connect("127.0.0.1", port))
+        handler.setFormatter(JsonFormat())
+        for index in range(50):
+            handler.handle(_record("Loop %d", index))
+
+        thread = threading.Thread(
+            target=lambda: [
+                handler.handle(_record("Thread %d", index)) for index in range(50)
+            ]
+        )
+        await asyncio.get_running_loop().run_in_executor(None, thread.run)
+        await handler.drain()
+        assert handler.pending == 0
+
+        await handler.aclose()
+        await collector.done.wait()
+        server.close()
+        await server.wait_closed()
+        return collector, handler
+
+    collector, handler = asyncio.run(main())
+
+    messages: List[str] = collector.messages()
+    assert messages[:50] == [f"Loop {index}" for index in range(50)]
+    assert sorted(messages[50:]) == sorted(f"Thread {index}" for index in range(50))
+    assert (handler.queued, handler.written, handler.dropped) == (100, 100, 0)
+    assert 0 < handler.latency(50) <= handler.latency(99) == handler.latency(100)
+
+
+@pytest.mark.skipif(not hasattr(asyncio, "open_unix_connection"), reason="Unix")
+def test_unix_socket(tmp_path: pathlib.Path) -> None:
+    """Test records are written to a Unix socket."""
+
+    async def main() -> Collector:
+        collector = Collector()
+        path: str = str(tmp_path / "log.sock")
+        server = await asyncio.start_unix_server(collector, path)
+
+        handler = AsyncioHandler(await StreamTarget.connect_unix(path))
+        handler.setFormatter(JsonFormat())
+        handler.handle(_record("Over a Unix socket"))
+        await handler.aclose()
+
+        await collector.done.wait()
+        server.close()
+        return collector
+
+    assert asyncio.run(main()).messages() == ["Over a Unix socket"]
+
+
+def test_file(tmp_path: pathlib.Path) -> None:
+    """Test records are written to a file, with a plain formatter."""
+    path: pathlib.Path = tmp_path / "app.log"
+
+    async def main() -> None:
+        handler = AsyncioHandler(FileTarget(path))
+        handler.setFormatter(logging.Formatter("> %(message)s"))
+        handler.handle(_record("Written %s", "later"))
+        await handler.drain()
+        assert path.read_text() == "> Written later\n"
+        await handler.aclose()
+
+    asyncio.run(main())
+
+
+def test_batches() -> None:
+    """Test queued records are formatted and written in batches."""
+    target = RecordingTarget()
+
+    async def main() -> None:
+        handler = AsyncioHandler(target, batch_size=3)
+        handler.setFormatter(JsonFormat())
+        for index in range(10):
+            handler.handle(_record(f"Record {index}"))
+        await handler.aclose()
+
+        # Closing again, or logging after closing, does nothing.
+        await handler.aclose()
+        handler.handle(_record("Too late"))
+        assert handler.dropped == 1
+
+    asyncio.run(main())
+
+    assert [batch.count(b"\n") for batch in target.batches] == [3, 3, 3, 1]
+    assert target.closed
+
+
+def test_full_queue_drops() -> None:
+    """Test records are dropped, not waited for, when the queue is full."""
+
+    async def main() -> AsyncioHandler:
+        handler = AsyncioHandler(RecordingTarget(), maxsize=2)
+        for _ in range(10):
+            handler.handle(_record())
+        assert handler.latency() == 0.0
+        await handler.aclose()
+        return handler
+
+    handler: AsyncioHandler = asyncio.run(main())
+
+    assert (handler.queued, handler.written, handler.dropped) == (2, 2, 8)
+
+
+class FailingTarget(AsyncTarget):
+    """A target which can not be written to."""
+
+    async def write(self, data: bytes) -> None:
+        """Fail."""
+        raise OSError("Disconnected")
+
+
+def test_errors(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test failing writes and records are reported like any handler error."""
+
+    async def main() -> AsyncioHandler:
+        handler = AsyncioHandler(FailingTarget())
+        handler.handle(_record("Lost"))
+        handler.handle(_record("%d", "not a number"))
+        await handler.aclose()
+        return handler
+
+    handler: AsyncioHandler = asyncio.run(main())
+
+    assert (handler.queued, handler.written, handler.dropped) == (1, 0, 1)
+    errors: str = capsys.readouterr().err
+    assert "OSError: Disconnected" in errors
+    assert "TypeError" in errors
+
+
+def test_base_target() -> None:
+    """Test targets have to implement writing."""
+
+    with pytest.raises(TypeError, match="abstract"):
+        AsyncTarget()  # type: ignore[abstract]
+
+    class Target(AsyncTarget):
+        async def write(self, data: bytes) -> None:
+            """Drop the batch."""
+
+    async def main() -> None:
+        await Target().close()
+
+    asyncio.run(main())
+
+
+def test_needs_a_running_loop() -> None:
+    """Test the handler is created on a running event loop."""
+    with pytest.raises(RuntimeError):
+        AsyncioHandler(RecordingTarget())
+
+
+def test_close_from_another_thread() -> None:
+    """Test closing from another thread waits for the queue to be written."""
+    target = RecordingTarget()
+
+    async def main() -> None:
+        handler = AsyncioHandler(target)
+        handler.handle(_record())
+        await asyncio.get_running_loop().run_in_executor(None, handler.close)
+        assert target.closed
+
+    asyncio.run(main())
+
+
+def test_close_on_the_loop() -> None:
+    """Test closing on the loop's thread schedules writing out the queue."""
+    target = RecordingTarget()
+
+    async def main() -> None:
+        handler = AsyncioHandler(target)
+        handler.handle(_record())
+        handler.close()
+        assert not target.closed
+        assert handler._closer is not None
+        await handler._closer
+        assert target.closed
+
+    asyncio.run(main())
+
+
+def test_close_outside_the_loop() -> None:
+    """Test closing once the loop has stopped, or has been closed."""
+    target = RecordingTarget()
+    loop = asyncio.new_event_loop()
+
+    async def create() -> AsyncioHandler:
+        return AsyncioHandler(target)
+
+    try:
+        handler: AsyncioHandler = loop.run_until_complete(create())
+        handler.handle(_record())
+        handler.close()
+        assert len(target.batches) == 1
+        assert target.closed
+    finally:
+        loop.close()
+
+    handler = AsyncioHandler.__new__(AsyncioHandler)
+    logging.Handler.__init__(handler)
+    handler.loop = loop
+    handler._closing = False
+    handler.close()
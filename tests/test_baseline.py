@@ -0,0 +1,46 @@
+"""Test cases for the LogRecord baseline attributes."""
+
+import logging
+from typing import FrozenSet
+
+from pylogformats.baseline import BASELINE
+from pylogformats.baseline import BASELINE_KEYS
+from pylogformats.baseline import build_baseline
+
+
+def test_baseline_keys_match_log_record() -> None:
+    """Test that every attribute of a plain LogRecord is in the baseline."""
+    record: logging.LogRecord = logging.makeLogRecord({"msg": "A demo log message"})
+
+    assert isinstance(BASELINE_KEYS, frozenset)
+    assert set(vars(record)) <= BASELINE_KEYS
+    assert set(BASELINE) <= BASELINE_KEYS
+
+
+def test_baseline_excludes_extras() -> None:
+    """Test that user supplied extras are not part of the baseline."""
+    record: logging.LogRecord = logging.makeLogRecord(
+        {"msg": "A extra log message", "str_extra": "Extra 1"}
+    )
+
+    extras = [key for key in vars(record) if key not in BASELINE_KEYS]
+
+    assert extras == ["str_extra"]
+
+
+def test_build_baseline_versions() -> None:
+    """Test that version specific attributes follow the requested version."""
+    old: FrozenSet[str] = build_baseline((3, 7))
+    new: FrozenSet[str] = build_baseline((3, 12))
+
+    assert "taskName" not in old
+    assert "taskName" in new
+    assert new - old == {"taskName"}
+
+
+def test_build_baseline_extra_keys() -> None:
+    """Test that additional internal keys can be registered."""
+    keys: FrozenSet[str] = build_baseline(extra_keys=["_internal"])
+
+    assert "_internal" in keys
+    assert "_internal" not in BASELINE_KEYS
@@ -0,0 +1,57 @@
+"""Test cases for batch formatting."""
+
+import logging
+from typing import Iterator
+from typing import List
+from typing import Type
+
+import pytest
+
+from pylogformats.base import BaseFormat
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+
+
+FORMATTERS: List[Type[BaseFormat]] = [
+    JsonFormat,
+    AdvJsonFormat,
+    BunyanFormat,
+    SimpleTextFormat,
+    CompactTextFormat,
+]
+
+
+def _records() -> Iterator[logging.LogRecord]:
+    for index in range(5):
+        yield logging.makeLogRecord(
+            {"name": "root", "msg": "Record %d ünïcödé", "args": (index,), "n": index}
+        )
+
+
+@pytest.mark.parametrize("formatter_class", FORMATTERS)
+def test_format_batch_matches_format(formatter_class: Type[BaseFormat]) -> None:
+    """Test that a batch is every record formatted on its own line."""
+    formatter = formatter_class()
+    records: List[logging.LogRecord] = list(_records())
+    expected: str = "".join(f"{formatter.format(record)}\n" for record in records)
+
+    assert formatter.format_batch(iter(records)) == expected
+    assert formatter.format_batch(records, "utf-8") == expected.encode("utf-8")
+
+
+def test_format_batch_terminator() -> None:
+    """Test that every record is followed by the terminator."""
+    formatter = SimpleTextFormat()
+    batch: str = formatter.format_batch(list(_records())[:2], terminator="\r\n")
+
+    assert batch.count("\r\n") == 2
+    assert batch.endswith("\r\n")
+
+
+def test_format_batch_empty() -> None:
+    """Test that an empty batch formats to an empty buffer."""
+    assert JsonFormat().format_batch([]) == ""
+    assert JsonFormat().format_batch([], "utf-8") == b""
@@ -0,0 +1,261 @@
+"""Test cases for the buffered file handler."""
+
+import gc
+import logging
+import os
+import pathlib
+import threading
+import time
+import weakref
+from typing import List
+
+import pytest
+
+from pylogformats.handlers import BufferedFileHandler
+from pylogformats.handlers.buffered import _LOCK_POLL
+from pylogformats.handlers.buffered import _flush_at_exit
+from pylogformats.handlers.buffered import _flush_periodically
+from pylogformats.json import JsonFormat
+from pylogformats.text import SimpleTextFormat
+
+
+def _record(
+    msg: str = "A demo log message", level: int = logging.INFO
+) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {
+            "name": "root",
+            "msg": msg,
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+        }
+    )
+
+
+def _messages(path: pathlib.Path) -> List[str]:
+    return [line.split(" - ")[-1] for line in path.read_text().splitlines()]
+
+
+def _handler(path: pathlib.Path, **kwargs: object) -> BufferedFileHandler:
+    kwargs.setdefault("interval", None)
+    handler = BufferedFileHandler(path, **kwargs)  # type: ignore[arg-type]
+    handler.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
+    return handler
+
+
+def test_records_wait_in_the_buffer(tmp_path: pathlib.Path) -> None:
+    """Test records are only written once flushed or closed."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path)
+
+    handler.handle(_record("First"))
+    handler.handle(_record("Second"))
+    assert path.read_text() == ""
+    assert handler.pending == len("INFO - First\nINFO - Second\n")
+
+    handler.flush()
+    assert _messages(path) == ["First", "Second"]
+    assert handler.pending == 0
+
+    handler.handle(_record("Third"))
+    handler.close()
+    handler.close()
+    handler.flush()
+    assert _messages(path) == ["First", "Second", "Third"]
+
+
+def test_full_buffer_is_written(tmp_path: pathlib.Path) -> None:
+    """Test a record which does not fit is written with the buffer before it."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, buffer_size=40)
+
+    handler.handle(_record("1" * 10))
+    handler.handle(_record("2" * 10))
+    assert path.read_text() == ""
+
+    handler.handle(_record("3" * 10))
+    assert _messages(path) == ["1" * 10, "2" * 10, "3" * 10]
+
+    # Records larger than the buffer are written as they are.
+    handler.handle(_record("4" * 100))
+    assert _messages(path)[-1] == "4" * 100
+    handler.close()
+
+
+def test_record_count_is_written(tmp_path: pathlib.Path) -> None:
+    """Test the buffer is written once it holds ``max_records`` records."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, max_records=3)
+
+    for index in range(7):
+        handler.handle(_record(str(index)))
+    assert _messages(path) == ["0", "1", "2", "3", "4", "5"]
+    handler.close()
+
+
+def test_errors_are_written_straight_away(tmp_path: pathlib.Path) -> None:
+    """Test an error is written at once, with the records before it."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path)
+
+    handler.handle(_record("Working"))
+    handler.handle(_record("Broken", logging.ERROR))
+    assert _messages(path) == ["Working", "Broken"]
+    handler.close()
+
+
+def test_interval(tmp_path: pathlib.Path) -> None:
+    """Test a background thread writes the buffer every ``interval`` seconds."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, interval=0.01)
+
+    handler.handle(_record("Later"))
+    deadline: float = time.monotonic() + 5
+    while not path.read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert _messages(path) == ["Later"]
+    handler.close()
+
+
+def test_timer_stops_with_its_handler(tmp_path: pathlib.Path) -> None:
+    """Test the timer does not keep the handler alive, and stops without it."""
+    handler = _handler(tmp_path / "app.log", interval=0.01)
+    fd: int = handler.fd
+    timer = handler._timer
+    assert timer is not None
+
+    del handler
+    gc.collect()
+    timer.join(5)
+    os.close(fd)
+
+    assert not timer.is_alive()
+
+
+def test_close_holding_the_lock(tmp_path: pathlib.Path) -> None:
+    """Test closing while holding the lock, as at shutdown, does not hang."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, interval=0.01)
+    handler.handle(_record("At shutdown"))
+
+    def shutdown() -> None:
+        # As in `logging.shutdown`, after the timer has woken up.
+        handler.acquire()
+        try:
+            time.sleep(0.05)
+            handler.flush()
+            handler.close()
+        finally:
+            handler.release()
+
+    closer = threading.Thread(target=shutdown, daemon=True)
+    closer.start()
+    closer.join(5)
+
+    assert not closer.is_alive()
+    assert _messages(path) == ["At shutdown"]
+
+
+def test_timer_waits_for_the_lock(tmp_path: pathlib.Path) -> None:
+    """Test the timer waits for the lock while the handler is open."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path)
+    handler.handle(_record("Waited"))
+
+    handler.acquire()
+    flusher = threading.Thread(target=handler._flush_on_timer, daemon=True)
+    flusher.start()
+    time.sleep(_LOCK_POLL * 3)
+    assert path.read_text() == ""
+    handler.release()
+    flusher.join(5)
+    assert _messages(path) == ["Waited"]
+
+    handler.close()
+    handler._flush_on_timer()
+
+
+def test_timer_reports_errors(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test failing to write on the timer is reported, and the timer goes on."""
+    handler = _handler(tmp_path / "app.log")
+
+    def fail() -> None:
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(handler, "_flush_on_timer", fail)
+    stop = threading.Event()
+    timer = threading.Thread(
+        target=_flush_periodically, args=(weakref.ref(handler), stop, 0.01)
+    )
+    timer.start()
+    deadline: float = time.monotonic() + 5
+    errors: str = ""
+    while "OSError: Disk full" not in errors and time.monotonic() < deadline:
+        time.sleep(0.01)
+        errors += capsys.readouterr().err
+    stop.set()
+    timer.join()
+    handler.close()
+
+    assert "OSError: Disk full" in errors
+
+
+def test_flush_at_exit(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the buffer is written at exit, for handlers which were not closed."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path)
+    handler.handle(_record("Before exit"))
+
+    handler._at_exit()
+    assert _messages(path) == ["Before exit"]
+
+    # Failing to write, or the handler being gone, is ignored at exit.
+    def fail() -> None:
+        raise ValueError("I/O operation on closed file")
+
+    monkeypatch.setattr(handler, "flush", fail)
+    handler._at_exit()
+    monkeypatch.undo()
+    handler.close()
+
+    reference = weakref.ref(handler)
+    del handler
+    gc.collect()
+    _flush_at_exit(reference)
+
+
+def test_json_and_modes(tmp_path: pathlib.Path) -> None:
+    """Test adding to and replacing a file, with a bytes formatter."""
+    path: pathlib.Path = tmp_path / "app.log"
+    path.write_text("old\n")
+
+    handler = BufferedFileHandler(path)
+    handler.setFormatter(JsonFormat())
+    handler.handle(_record("Added"))
+    handler.close()
+    assert path.read_text().startswith("old\n{")
+
+    handler = BufferedFileHandler(path, mode="w")
+    handler.setFormatter(SimpleTextFormat())
+    handler.handle(_record("Replaced"))
+    handler.close()
+    assert path.read_text().count("\n") == 1
+    assert "Replaced" in path.read_text()
+
+    with pytest.raises(ValueError):
+        BufferedFileHandler(path, mode="r")
+
+
+def test_errors(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test records logged after closing are reported like any handler error."""
+    handler = _handler(tmp_path / "app.log")
+    handler.close()
+
+    handler.handle(_record())
+
+    assert "ValueError: I/O operation on closed file" in capsys.readouterr().err
@@ -0,0 +1,131 @@
+"""Test cases for parsing log files in parallel."""
+
+import collections
+import logging
+import multiprocessing
+import pathlib
+import pickle  # noqa: S403
+import sys
+from typing import Counter
+from typing import Iterable
+from typing import List
+
+from pylogformats.json import BunyanFormat
+from pylogformats.parse import BunyanParser
+from pylogformats.parse import CompactTextParser
+from pylogformats.parse import ParsedRecord
+from pylogformats.parse import chunk_boundaries
+from pylogformats.parse import parse_chunk
+from pylogformats.parse import read_parallel
+from pylogformats.parse import read_records
+from pylogformats.text import CompactTextFormat
+
+
+def count_levels(records: Iterable[ParsedRecord]) -> Counter[str]:
+    """Count the records of each level in a chunk."""
+    return collections.Counter(record.level for record in records)
+
+
+def write_log(path: pathlib.Path, formatter: logging.Formatter, count: int) -> None:
+    """Write numbered records, with a traceback on every third."""
+    try:
+        raise ValueError("Something went wrong")
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    with open(path, "w", encoding="utf-8") as output:
+        for index in range(count):
+            failed: bool = index % 3 == 0
+            record = logging.makeLogRecord(
+                {
+                    "name": "root",
+                    "msg": f"Record {index}",
+                    "levelno": logging.ERROR if failed else logging.INFO,
+                    "levelname": "ERROR" if failed else "INFO",
+                    "exc_info": exc_info if failed else None,
+                }
+            )
+            output.write(formatter.format(record) + "\n")
+
+
+def test_read_parallel_matches_read_records(tmp_path: pathlib.Path) -> None:
+    """Test that parallel parsing yields every record, in order."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, BunyanFormat(), 500)
+
+    records: List[ParsedRecord] = list(
+        read_parallel(
+            path,
+            "bunyan",
+            processes=2,
+            chunk_size=4096,
+            context=multiprocessing.get_context("fork"),
+        )
+    )
+
+    assert [record.message for record in records] == [
+        record.message for record in read_records(path, "bunyan")
+    ]
+    assert len(records) == 500
+
+
+def test_read_parallel_reduce(tmp_path: pathlib.Path) -> None:
+    """Test reducing chunks to summaries in the workers."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, BunyanFormat(), 300)
+
+    results: List[Counter[str]] = list(
+        read_parallel(path, "bunyan", processes=1, chunk_size=2048, reduce=count_levels)
+    )
+
+    assert len(results) > 3
+    assert sum(results, collections.Counter()) == {"ERROR": 100, "INFO": 200}
+
+
+def test_multiline_records_not_split(tmp_path: pathlib.Path) -> None:
+    """Test that chunks of multiline formats start on a record."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, CompactTextFormat(), 90)
+    parser = CompactTextParser()
+
+    boundaries = chunk_boundaries(path, 100, parser)
+    content: bytes = path.read_bytes()
+    for start, end in boundaries:
+        assert content[start:].startswith(b"[")
+    assert boundaries[-1][1] == len(content)
+
+    records: List[ParsedRecord] = list(read_parallel(path, parser, chunk_size=1 << 20))
+    assert len(records) == 90
+    assert records[0].fields["continuation"].endswith("Something went wrong")
+
+
+def test_small_and_empty_files(tmp_path: pathlib.Path) -> None:
+    """Test files which are empty, or have no final newline."""
+    path: pathlib.Path = tmp_path / "app.log"
+    path.write_bytes(b"")
+    assert chunk_boundaries(path, 10) == []
+    assert list(read_parallel(path, "json")) == []
+
+    path.write_bytes(b'{"message": "one"}\n{"message": "two"}')
+    assert chunk_boundaries(path, 1) == [(0, 19), (19, 37)]
+    assert [record.message for record in read_parallel(path, "json")] == [
+        "one",
+        "two",
+    ]
+
+
+def test_parse_chunk_in_process(tmp_path: pathlib.Path) -> None:
+    """Test parsing a single chunk, as the worker processes do."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, BunyanFormat(), 6)
+    end: int = path.stat().st_size
+
+    assert parse_chunk(path, 0, end, BunyanParser(), count_levels) == {
+        "ERROR": 2,
+        "INFO": 4,
+    }
+
+    record: ParsedRecord = parse_chunk(path, 0, end, BunyanParser())[0]
+    copied: ParsedRecord = pickle.loads(pickle.dumps(record))  # noqa: S301
+    assert repr(copied) == repr(record)
+    assert copied.fields == record.fields
@@ -0,0 +1,104 @@
+"""Test cases for bytes output."""
+
+import io
+import logging
+import os
+from typing import List
+from typing import Type
+
+import pytest
+
+from pylogformats.handlers import BytesStreamHandler
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.json.base import BaseJsonFormat
+from pylogformats.serializers import SERIALIZERS
+from pylogformats.text import SimpleTextFormat
+
+
+def _record() -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {"name": "root", "msg": "A ünïcödé message", "args": None, "extra": 1.5}
+    )
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+@pytest.mark.parametrize("formatter_class", [JsonFormat, AdvJsonFormat, BunyanFormat])
+def test_format_bytes_matches_format(
+    formatter_class: Type[BaseJsonFormat], name: str
+) -> None:
+    """Test that the bytes output is the encoded string output."""
+    try:
+        formatter = formatter_class(serializer=name)
+    except ImportError:  # pragma: no cover
+        pytest.skip(f"{name} is not installed")
+
+    record = _record()
+
+    assert formatter.format_bytes(record) == formatter.format(record).encode("utf-8")
+
+
+def test_handler_writes_to_binary_stream() -> None:
+    """Test that records are written to a binary stream, one per line."""
+    buffer = io.BytesIO()
+    handler = BytesStreamHandler(buffer)
+    handler.setFormatter(JsonFormat())
+    record = _record()
+
+    handler.handle(record)
+    handler.handle(record)
+    handler.flush()
+
+    line: bytes = JsonFormat().format_bytes(record) + b"\n"
+    assert buffer.getvalue() == line * 2
+
+
+def test_handler_writes_to_file_descriptor() -> None:
+    """Test that records are written straight to a file descriptor."""
+    read_fd, write_fd = os.pipe()
+    handler = BytesStreamHandler(write_fd)
+    handler.setFormatter(SimpleTextFormat())
+    record = _record()
+
+    try:
+        handler.handle(record)
+        handler.flush()
+        written: bytes = os.read(read_fd, 65536)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    assert written == SimpleTextFormat().format(record).encode("utf-8") + b"\n"
+
+
+def test_handler_reports_write_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that failed writes go to `handleError`."""
+    errors: List[logging.LogRecord] = []
+    handler = BytesStreamHandler(io.BytesIO())
+    handler.target.close()  # type: ignore[union-attr]
+    monkeypatch.setattr(handler, "handleError", errors.append)
+
+    handler.handle(_record())
+
+    assert len(errors) == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "writev"), reason="requires os.writev")
+def test_handler_finishes_partial_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a partial write is followed by writes of the remainder."""
+    read_fd, write_fd = os.pipe()
+    handler = BytesStreamHandler(write_fd)
+    handler.setFormatter(JsonFormat())
+    record = _record()
+
+    writev = os.writev
+    monkeypatch.setattr(os, "writev", lambda fd, chunks: writev(fd, [chunks[0][:1]]))
+    try:
+        handler.handle(record)
+        written: bytes = os.read(read_fd, 65536)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    assert written == JsonFormat().format_bytes(record) + b"\n"
@@ -0,0 +1,244 @@
+"""Test cases for the log converter."""
+
+import io
+import json
+import logging
+import pathlib
+import runpy
+import sys
+from typing import Any
+from typing import List
+
+import pytest
+
+from pylogformats import cli
+from pylogformats.json import BunyanFormat
+from pylogformats.parse import ParsedRecord
+from pylogformats.parse import read_records
+from pylogformats.text import SimpleTextFormat
+
+
+def write_log(path: pathlib.Path, count: int) -> None:
+    """Write a Bunyan log with numbered records."""
+    formatter = BunyanFormat(hostname="SomePc")
+    with open(path, "w", encoding="utf-8") as output:
+        for index in range(count):
+            record = logging.makeLogRecord(
+                {
+                    "name": "app",
+                    "msg": "Record %d",
+                    "args": (index,),
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "user": "someone",
+                }
+            )
+            output.write(formatter.format(record) + "\n")
+
+
+def test_convert_file(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test converting a Bunyan file into compact text."""
+    source: pathlib.Path = tmp_path / "app.log"
+    target: pathlib.Path = tmp_path / "app.txt"
+    write_log(source, 3)
+
+    assert (
+        cli.main(
+            [
+                "--from",
+                "bunyan",
+                "--to",
+                "compact",
+                str(source),
+                "-o",
+                str(target),
+                "--stats",
+            ]
+        )
+        == 0
+    )
+
+    lines: List[str] = target.read_text().splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith("[W ")
+    assert lines[0].endswith("Record 0 [hostname:SomePc] [user:someone]")
+    assert "Converted 3 records" in capsys.readouterr().err
+
+
+def test_round_trip_through_every_format(tmp_path: pathlib.Path) -> None:
+    """Test that records survive conversion through every format."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, 2)
+
+    source: str = "bunyan"
+    for target in ["json", "advjson", "compact", "simple", "bunyan"]:
+        converted: pathlib.Path = tmp_path / f"app.{target}"
+        cli.main(["--from", source, "--to", target, str(path), "-o", str(converted)])
+        path, source = converted, target
+
+    records = list(read_records(path, "bunyan"))
+    assert [(record.level, record.message) for record in records] == [
+        ("WARNING", "Record 0"),
+        ("WARNING", "Record 1"),
+    ]
+
+
+def test_convert_in_processes(tmp_path: pathlib.Path) -> None:
+    """Test converting files in chunks across processes."""
+    source: pathlib.Path = tmp_path / "app.log"
+    target: pathlib.Path = tmp_path / "app.json"
+    write_log(source, 200)
+
+    cli.main(
+        [
+            "--from",
+            "bunyan",
+            "--to",
+            "json",
+            "-p",
+            "2",
+            "--chunk-size",
+            "4096",
+            str(source),
+            str(source),
+            "-o",
+            str(target),
+        ]
+    )
+
+    messages: List[str] = [
+        json.loads(line)["message"] for line in target.read_text().splitlines()
+    ]
+    assert messages == [f"Record {index}" for index in range(200)] * 2
+
+
+def test_convert_chunk(tmp_path: pathlib.Path) -> None:
+    """Test the converter used in the worker processes."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, 2)
+
+    count, data = cli.ConvertChunk("simple")(read_records(path, "bunyan"))
+
+    assert count == 2
+    assert data.decode().splitlines()[1].endswith("Record 1")
+
+
+def test_convert_stdin(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test converting standard input to standard output."""
+    line: str = BunyanFormat().format(logging.makeLogRecord({"msg": "Piped"}))
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(
+        sys, "stdin", io.TextIOWrapper(io.BytesIO(f"{line}\n".encode()))
+    )
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    assert cli.main(["--from", "bunyan", "--to", "simple"]) == 0
+
+    assert stdout.buffer.getvalue().decode().endswith("Piped\n")
+
+
+class BrokenStdout:
+    """Standard output whose reader has gone away."""
+
+    def __init__(self, fileno: int) -> None:
+        """Use a file descriptor which is safe to replace."""
+        self._fileno = fileno
+        self.buffer = self
+
+    def write(self, data: bytes) -> int:
+        """Fail like a closed pipe."""
+        raise BrokenPipeError()
+
+    def fileno(self) -> int:
+        """Return the file descriptor."""
+        return self._fileno
+
+
+def test_broken_pipe(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a reader going away stops the converter quietly."""
+    source: pathlib.Path = tmp_path / "app.log"
+    write_log(source, 2)
+
+    with open(tmp_path / "stdout", "wb") as stdout:
+        monkeypatch.setattr(sys, "stdout", BrokenStdout(stdout.fileno()))
+        assert cli.main(["--from", "bunyan", "--to", "simple", str(source)]) == 1
+
+
+def test_bad_arguments(capsys: Any) -> None:
+    """Test that unknown formats are refused."""
+    with pytest.raises(SystemExit):
+        cli.main(["--from", "xml", "--to", "json"])
+    assert "invalid choice" in capsys.readouterr().err
+
+
+def test_convert_batches() -> None:
+    """Test that records are formatted in batches of the given size."""
+    records: List[ParsedRecord] = [ParsedRecord("", "INFO", None, "One")] * 3
+
+    batches = list(cli.convert(records, SimpleTextFormat(), batch_size=2))
+
+    assert [count for count, _ in batches] == [2, 1]
+    assert list(cli.convert([], SimpleTextFormat())) == []
+
+
+def test_module_entry_point(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test running the converter with ``python -m pylogformats``."""
+    source: pathlib.Path = tmp_path / "app.log"
+    target: pathlib.Path = tmp_path / "app.txt"
+    write_log(source, 1)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "pylogformats",
+            "--from",
+            "bunyan",
+            "--to",
+            "simple",
+            str(source),
+            "-o",
+            str(target),
+        ],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        runpy.run_module("pylogformats", run_name="__main__")
+
+    assert exit_info.value.code == 0
+    assert target.read_text().endswith("Record 0\n")
+
+
+def test_convert_filtered(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test only the records of a level and logger are converted."""
+    source: pathlib.Path = tmp_path / "app.log"
+    formatter = BunyanFormat()
+    with open(source, "w", encoding="utf-8") as output:
+        for name, level in [("app", 20), ("app.db", 40), ("web", 40), ("app", 50)]:
+            record = logging.makeLogRecord(
+                {
+                    "name": name,
+                    "msg": f"{name} {level}",
+                    "levelno": level,
+                    "levelname": logging.getLevelName(level),
+                }
+            )
+            output.write(formatter.format(record) + "\n")
+
+    arguments: List[str] = ["--from", "bunyan", "--to", "json", str(source)]
+    assert cli.main([*arguments, "--level", "error", "--logger", "app"]) == 0
+
+    lines: List[str] = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["message"] for line in lines] == ["app.db 40", "app 50"]
+
+    assert cli.main([*arguments, "--logger", "web", "-p", "2"]) == 0
+    assert capsys.readouterr().out.count("\n") == 1
+
+    with pytest.raises(SystemExit):
+        cli.main([*arguments, "--level", "LOUD"])
+    assert "Unknown level 'LOUD'" in capsys.readouterr().err
@@ -0,0 +1,345 @@
+"""Test cases for collecting parsed records into columns."""
+
+import ast
+import csv
+import io
+import logging
+import pathlib
+import zipfile
+from array import array
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.parse import BunyanParser
+from pylogformats.parse import JsonParser
+from pylogformats.parse import LogColumns
+from pylogformats.parse import ParsedRecord
+from pylogformats.parse import SimpleTextParser
+from pylogformats.parse import StringColumn
+from pylogformats.parse import get_parser
+from pylogformats.parse import read_columns
+from pylogformats.parse.columns import MISSING_TIMESTAMP
+
+
+def epoch_micros(text: str) -> int:
+    """Convert a local time to microseconds since the epoch."""
+    moment: datetime = datetime.fromisoformat(text)
+    return round(moment.replace(microsecond=0).timestamp()) * 1_000_000 + (
+        moment.microsecond
+    )
+
+
+def read_npy(data: bytes) -> Dict[str, Any]:
+    """Read the header and data of a ``.npy`` file."""
+    assert data[:8] == b"\x93NUMPY\x01\x00"
+    header_length: int = int.from_bytes(data[8:10], "little")
+    assert (10 + header_length) % 64 == 0
+    header: Dict[str, Any] = ast.literal_eval(data[10 : 10 + header_length].decode())
+    header["data"] = data[10 + header_length :]
+    return header
+
+
+def test_columns_hold_each_part_of_the_records() -> None:
+    """Test that records are split into typed columns."""
+    columns = LogColumns(fields=["request", "user"])
+    columns.extend(
+        [
+            ParsedRecord(
+                "2021-02-04T23:01:46.5",
+                "ERROR",
+                "app",
+                "Failed",
+                {"request": "a1", "user": {"id": 7}},
+            ),
+            ParsedRecord("2021-02-04T23:01:46.123456", "INFO", "db", "Connected"),
+            ParsedRecord("2021-02-04 23:01:47", "DEBUG", "app", "Naïve ✓"),
+        ]
+    )
+
+    assert len(columns) == 3
+    assert columns.timestamps.tolist() == [
+        epoch_micros("2021-02-04T23:01:46.500000"),
+        epoch_micros("2021-02-04T23:01:46.123456"),
+        epoch_micros("2021-02-04T23:01:47"),
+    ]
+    assert columns.levels.tolist() == [40, 20, 10]
+    assert columns.logger_codes.tolist() == [0, 1, 0]
+    assert columns.loggers == ["app", "db"]
+    assert list(columns.messages) == ["Failed", "Connected", "Naïve ✓"]
+    assert list(columns.fields["request"]) == ["a1", "", ""]
+    assert list(columns.fields["user"]) == ['{"id": 7}', "", ""]
+
+
+def test_columns_read_other_timestamps() -> None:
+    """Test timestamps with time zones, Bunyan's suffix, and broken ones."""
+    columns = LogColumns()
+    for timestamp in [
+        "2021-02-04T23:01:46+00:00",
+        "2021-02-04T23:01:46.250Z",
+        "2021-02-04T23:01:46.250Z",
+        "not a time",
+        "yesterday, about noon",
+    ]:
+        columns.append(ParsedRecord(timestamp, "INFO", None, "A Test Log"))
+
+    assert columns.timestamps.tolist() == [
+        1612479706_000_000,
+        epoch_micros("2021-02-04T23:01:46.250"),
+        epoch_micros("2021-02-04T23:01:46.250"),
+        MISSING_TIMESTAMP,
+        MISSING_TIMESTAMP,
+    ]
+    assert columns.loggers == [""]
+
+
+def test_columns_levels() -> None:
+    """Test levels come from ``levelno`` if recorded, and unknown ones are 0."""
+    columns = LogColumns()
+    columns.extend(
+        [
+            ParsedRecord("", "Level 35", None, "", {"levelno": 35}),
+            ParsedRecord("", "WARNING", None, ""),
+            ParsedRecord("", "NOTICE", None, ""),
+            ParsedRecord("", "HUGE", None, "", {"levelno": 1 << 20}),
+        ]
+    )
+
+    assert columns.levels.tolist() == [35, 30, 0, 0]
+
+
+def test_string_column() -> None:
+    """Test strings are stored in one buffer, with offsets."""
+    column = StringColumn()
+    for value in ["a", "", "€uro"]:
+        column.append(value)
+
+    assert len(column) == 3
+    assert column.offsets.tolist() == [0, 1, 1, 7]
+    assert bytes(column.data) == "a€uro".encode()
+    assert column[-1] == "€uro"
+    assert list(column) == ["a", "", "€uro"]
+
+
+def test_arrow_buffers_share_the_columns() -> None:
+    """Test the buffers are laid out as Arrow arrays."""
+    columns = LogColumns(fields=["request"])
+    columns.append(ParsedRecord("2021-02-04T23:01:46", "INFO", "app", "Hi"))
+
+    buffers = columns.arrow_buffers()
+
+    assert sorted(buffers) == [
+        "level",
+        "logger",
+        "loggers",
+        "message",
+        "request",
+        "timestamp",
+    ]
+    assert all(column[0] is None for column in buffers.values())
+    assert buffers["level"][1] is not None
+    assert buffers["level"][1].tolist() == [20]
+    assert buffers["timestamp"][1] is not None
+    assert buffers["timestamp"][1].itemsize == 8
+    assert buffers["logger"][1] is not None
+    assert buffers["logger"][1].itemsize == 4
+    assert [bytes(buffer or b"") for buffer in buffers["loggers"]] == [
+        b"",
+        bytes(array("q", [0, 3])),
+        b"app",
+    ]
+    assert bytes(buffers["message"][2] or b"") == b"Hi"
+    assert bytes(buffers["request"][1] or b"") == bytes(array("q", [0, 0]))
+
+
+def test_to_csv() -> None:
+    """Test the columns are written as CSV."""
+    columns = LogColumns(fields=["request"])
+    columns.extend(
+        [
+            ParsedRecord(
+                "2021-02-04T23:01:46", "INFO", "app", 'Say "hi", then', {"request": "a"}
+            ),
+            ParsedRecord("never", "ERROR", None, "Failed"),
+        ]
+    )
+
+    output = io.StringIO(newline="")
+    columns.to_csv(output)
+    output.seek(0)
+
+    assert list(csv.reader(output)) == [
+        ["timestamp", "level", "logger", "message", "request"],
+        [str(epoch_micros("2021-02-04T23:01:46")), "20", "app", 'Say "hi", then', "a"],
+        ["", "40", "", "Failed", ""],
+    ]
+
+
+def test_to_npz(tmp_path: pathlib.Path) -> None:
+    """Test the columns are written as ``.npy`` arrays in a zip archive."""
+    columns = LogColumns(fields=["request"])
+    columns.extend(
+        [
+            ParsedRecord("2021-02-04T23:01:46", "INFO", "app", "Hi", {"request": "a"}),
+            ParsedRecord("2021-02-04T23:01:46", "ERROR", "db", "Bye"),
+        ]
+    )
+
+    path: pathlib.Path = tmp_path / "app.npz"
+    columns.to_npz(path)
+
+    with zipfile.ZipFile(path) as archive:
+        arrays: Dict[str, Dict[str, Any]] = {
+            name[: -len(".npy")]: read_npy(archive.read(name))
+            for name in archive.namelist()
+        }
+
+    assert sorted(arrays) == [
+        "level",
+        "logger",
+        "loggers_data",
+        "loggers_offsets",
+        "message_data",
+        "message_offsets",
+        "request_data",
+        "request_offsets",
+        "timestamp",
+    ]
+    assert arrays["timestamp"]["descr"] == "<i8"
+    assert arrays["timestamp"]["shape"] == (2,)
+    assert arrays["timestamp"]["data"] == bytes(columns.timestamps)
+    assert arrays["level"]["descr"] == "<i2"
+    assert array("h", arrays["level"]["data"]).tolist() == [20, 40]
+    assert arrays["logger"]["descr"] == "<i4"
+    assert arrays["logger"]["fortran_order"] is False
+    assert arrays["loggers_data"]["descr"] == "|u1"
+    assert arrays["loggers_data"]["data"] == b"appdb"
+    assert array("q", arrays["loggers_offsets"]["data"]).tolist() == [0, 3, 5]
+    assert arrays["message_data"]["shape"] == (5,)
+    assert arrays["request_data"]["data"] == b"a"
+
+
+def test_read_columns(tmp_path: pathlib.Path) -> None:
+    """Test a log file is read straight into columns."""
+    path: pathlib.Path = tmp_path / "app.log"
+    formatter = JsonFormat()
+    lines: List[str] = []
+    for index in range(5):
+        record = logging.makeLogRecord(
+            {
+                "name": "app.db" if index % 2 else "app",
+                "msg": f"Record {index}",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "request": f"r{index}",
+            }
+        )
+        lines.append(formatter.format(record))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    columns: LogColumns = read_columns(path, "json", fields=["request"])
+
+    assert len(columns) == 5
+    assert columns.loggers == ["app", "app.db"]
+    assert columns.logger_codes.tolist() == [0, 1, 0, 1, 0]
+    assert set(columns.levels) == {30}
+    assert MISSING_TIMESTAMP not in columns.timestamps
+    assert list(columns.fields["request"]) == [f"r{index}" for index in range(5)]
+
+
+# Lines whose values are read from the raw line, and lines left to the parser.
+AWKWARD_LINES: List[str] = [
+    '{"logger": "app", "message": "Plain", "level": "INFO", "levelno": 20}',
+    '{"logger": "app", "message": "Nested", "user": {"request": "no"}, '
+    '"request": "yes"}',
+    '{"message": "Braces { [ in \\"quotes\\"", "items": [1, {"a": "}"}], '
+    '"request": "after", "levelno": 35}',
+    '{"message": "Escaped \\\\ backslash", "request": "slow"}',
+    '{"message":"Compact","level":"ERROR","request":{"id":7}}',
+    '{"message": "Only nested", "user": {"request": "inner"}}',
+    '{"timestamp": null, "message": 12, "level": "HUGE", "levelno": true}',
+    '{"message": "Broken", "request": }',
+    '{"message": "Two" "strings"}',
+    '{"message": "Key \\"request\\": inside", "request": "real"}',
+    '{"x\\"request": "escaped key", "message": "Odd key"}',
+    '{"message": "Truncated", "request": "r1"',
+    '["not", "an", "object"]',
+    "",
+]
+
+
+@pytest.mark.parametrize("fields", [["request", "message"], ["request", "items"]])
+def test_read_columns_matches_parsing(
+    tmp_path: pathlib.Path, fields: List[str]
+) -> None:
+    """Test reading values from raw lines gives the columns of parsed records."""
+    path: pathlib.Path = tmp_path / "app.log"
+    path.write_text("\n".join(AWKWARD_LINES) + "\n", encoding="utf-8")
+
+    columns: LogColumns = read_columns(path, "json", fields=fields)
+    parsed = LogColumns(fields)
+    parsed.extend(JsonParser().parse(AWKWARD_LINES))
+
+    assert columns.arrow_buffers() == parsed.arrow_buffers()
+    assert columns.loggers == parsed.loggers
+    assert len(columns) == 9
+    assert list(columns.fields["request"])[:4] == ["", "yes", "after", "slow"]
+
+
+@pytest.mark.parametrize(
+    ("formatter", "parser"),
+    [(JsonFormat(), "json"), (BunyanFormat(), "bunyan"), (None, "simple")],
+)
+def test_read_columns_of_every_format(
+    tmp_path: pathlib.Path, formatter: Any, parser: str
+) -> None:
+    """Test every format reads into the columns of its parsed records."""
+    path: pathlib.Path = tmp_path / "app.log"
+    lines: List[str] = []
+    for index, level in enumerate([logging.DEBUG, 25, logging.ERROR]):
+        record = logging.makeLogRecord(
+            {
+                "name": f"app.{index}",
+                "msg": f'Record "{index}"',
+                "levelno": level,
+                "levelname": logging.getLevelName(level),
+                "request": {"id": index},
+            }
+        )
+        lines.append((formatter or logging.Formatter()).format(record))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    columns: LogColumns = read_columns(path, parser, fields=["request"])
+    parsed = LogColumns(["request"])
+    parsed.extend(get_parser(parser).parse(lines))
+
+    assert columns.arrow_buffers() == parsed.arrow_buffers()
+    assert len(columns) == (3 if formatter else 0)
+
+
+def test_value_scanner() -> None:
+    """Test which parsers and keys values can be read from raw lines for."""
+    assert SimpleTextParser().value_scanner(["message"]) is None
+    assert BunyanParser().value_scanner(["msg"]) is not None
+
+    scan: Any = JsonParser().value_scanner(["message", "caf\u00e9"], default="")
+    assert scan('{"message": "Hi", "caf\\u00e9": 1, "user": {}}') == ["Hi", 1]
+    assert scan('{"message": "Hi", "user": {"caf\u00e9": 2}}') == ["Hi", ""]
+    assert scan('{"message": "Hi", "caf\u00e9": 3, "user": {}}') == ["Hi", 3]
+    assert scan('["message"]') is None
+    for _ in range(10):
+        assert scan('{"message": "Hi", "user": {}, "caf\u00e9": 4}') == ["Hi", 4]
+    assert scan("{") is None
+
+    class EscapedParser(JsonParser):
+        message_key = 'the "message"'
+
+    path_lines: List[str] = ['{"the \\"message\\"": "Escaped"}']
+    columns = LogColumns()
+    columns._extend_lines(EscapedParser(), path_lines)
+    assert list(columns.messages) == ["Escaped"]
@@ -0,0 +1,101 @@
+"""Test cases for the compression codecs."""
+
+import gzip
+import lzma
+import pathlib
+import sys
+import types
+import zlib
+from typing import Any
+from typing import Callable
+
+import pytest
+
+from pylogformats.compression import CODECS
+from pylogformats.compression import Codec
+from pylogformats.compression import GzipCodec
+from pylogformats.compression import LzmaCodec
+from pylogformats.compression import ZstdCodec
+from pylogformats.compression import get_codec
+
+
+DATA = b"".join(b'{"message": "Record %d"}\n' % index for index in range(1000))
+
+
+@pytest.mark.parametrize(
+    "codec, decompress",
+    [
+        (GzipCodec(), gzip.decompress),
+        (GzipCodec(level=1), gzip.decompress),
+        (LzmaCodec(), lzma.decompress),
+        (LzmaCodec(level=1), lzma.decompress),
+    ],
+)
+def test_streams_can_be_joined(
+    codec: Codec, decompress: Callable[[bytes], bytes]
+) -> None:
+    """Test compressed streams, one after the other, read as one."""
+    data: bytes = b""
+    for part in (DATA[:100], DATA[100:]):
+        compressor: Any = codec.compressor()
+        data += compressor.compress(part) + compressor.flush()
+
+    assert decompress(data) == DATA
+    assert len(data) < len(DATA) / 5
+
+
+def test_compress_file(tmp_path: pathlib.Path) -> None:
+    """Test compressing a file into another."""
+    source: pathlib.Path = tmp_path / "app.log"
+    source.write_bytes(DATA)
+
+    GzipCodec().compress_file(source, tmp_path / "app.log.gz")
+
+    assert gzip.decompress((tmp_path / "app.log.gz").read_bytes()) == DATA
+
+
+def fake_zstandard() -> types.ModuleType:
+    """Build a stand in for `zstandard`, compressing with zlib."""
+    module = types.ModuleType("zstandard")
+
+    class ZstdCompressor:
+        def __init__(self, level: int) -> None:
+            self.level = level
+
+        def compressobj(self) -> Any:
+            return zlib.compressobj(self.level)
+
+    module.ZstdCompressor = ZstdCompressor  # type: ignore[attr-defined]
+    return module
+
+
+def test_zstd(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test Zstandard is used when installed, and picked first by auto."""
+    monkeypatch.setitem(sys.modules, "zstandard", fake_zstandard())
+
+    codec: Codec = get_codec("auto")
+    compressor: Any = codec.compressor()
+    data: bytes = compressor.compress(DATA) + compressor.flush()
+
+    assert isinstance(codec, ZstdCodec)
+    assert codec.suffix == ".zst"
+    assert zlib.decompress(data) == DATA
+    assert ZstdCodec(level=19)._compressor.level == 19
+
+
+def test_get_codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test codecs are found by name, and auto falls back to gzip."""
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    assert isinstance(get_codec("auto"), GzipCodec)
+    assert isinstance(get_codec(), GzipCodec)
+    assert {name: type(get_codec(name)) for name in ["gzip", "lzma"]} == {
+        "gzip": CODECS["gzip"],
+        "lzma": CODECS["lzma"],
+    }
+    with pytest.raises(ImportError):
+        get_codec("zstd")
+    with pytest.raises(ValueError):
+        get_codec("zip")
+    with pytest.raises(TypeError, match="abstract"):
+        Codec()  # type: ignore[abstract]
@@ -0,0 +1,217 @@
+"""Test cases for context values added to every record."""
+
+import asyncio
+import json
+import logging
+import logging.handlers
+import pickle  # noqa: S403
+import queue
+import sys
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+
+from pylogformats import AdvJsonFormat
+from pylogformats import BunyanFormat
+from pylogformats import CompactTextFormat
+from pylogformats import JsonFormat
+from pylogformats.context import CONTEXT_KEY
+from pylogformats.context import ContextSnapshotFilter
+from pylogformats.context import bind
+from pylogformats.context import get_context
+from pylogformats.context import log_context
+from pylogformats.context import reset
+from pylogformats.context import unbind
+from pylogformats.handlers import AsyncioHandler
+from pylogformats.handlers import AsyncTarget
+from pylogformats.handlers import QueueFormatHandler
+from pylogformats.handlers import RecordShippingHandler
+from pylogformats.limits import SizeLimits
+
+
+def _record(msg: str = "A demo log message", **extra: Any) -> logging.LogRecord:
+    return logging.makeLogRecord({"name": "root", "msg": msg, **extra})
+
+
+def _json(line: str) -> Dict[str, Any]:
+    document: Dict[str, Any] = json.loads(line)
+    return document
+
+
+class Collector(logging.Handler):
+    """Collects formatted records, and the threads which formatted them."""
+
+    def __init__(self) -> None:
+        """Format with `JsonFormat`."""
+        super().__init__()
+        self.setFormatter(JsonFormat())
+        self.lines: List[Dict[str, Any]] = []
+        self.threads: List[int] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Collect a record."""
+        self.threads.append(threading.get_ident())
+        self.lines.append(_json(self.format(record)))
+
+
+def test_bind_and_reset() -> None:
+    """Test values are bound, replaced, removed and restored."""
+    assert dict(get_context()) == {}
+
+    first = bind(request_id="abc", tenant="acme")
+    second = bind(request_id="def")
+    assert dict(get_context()) == {"request_id": "def", "tenant": "acme"}
+
+    third = unbind("tenant", "unknown")
+    assert dict(get_context()) == {"request_id": "def"}
+    with pytest.raises(TypeError):
+        get_context()["tenant"] = "changed"  # type: ignore[index]
+
+    reset(third)
+    reset(second)
+    assert dict(get_context()) == {"request_id": "abc", "tenant": "acme"}
+    reset(first)
+    assert dict(get_context()) == {}
+
+
+@pytest.mark.parametrize("formatter", [JsonFormat(), AdvJsonFormat(), BunyanFormat()])
+def test_json_formatters(formatter: logging.Formatter) -> None:
+    """Test the JSON formatters write context values before extras."""
+    with log_context(request_id="abc", tenant="acme"):
+        plain: Dict[str, Any] = _json(formatter.format(_record()))
+        extras: Dict[str, Any] = _json(
+            formatter.format(_record(tenant="override", user="someone"))
+        )
+
+    assert list(plain)[-2:] == ["request_id", "tenant"]
+    assert list(extras)[-3:] == ["request_id", "tenant", "user"]
+    assert extras["tenant"] == "override"
+    assert "request_id" not in _json(formatter.format(_record()))
+
+
+def test_json_formatters_with_errors_and_limits() -> None:
+    """Test context values are written and limited like extras."""
+    formatter = JsonFormat(limits=SizeLimits(max_string_bytes=3))
+    try:
+        raise ValueError("Oops")
+    except ValueError:
+        record: logging.LogRecord = _record(exc_info=sys.exc_info())
+
+    with log_context(request_id="abcdef"):
+        line: Dict[str, Any] = _json(formatter.format(record))
+        data: bytes = formatter.format_bytes(_record())
+
+    assert "exception" in line
+    assert (line["request_id"], line["truncated"]) == ("abc", True)
+    assert _json(data.decode())["request_id"] == "abc"
+
+
+def test_compact_text_formatter() -> None:
+    """Test the compact text formatter writes context values before extras."""
+    formatter = CompactTextFormat()
+
+    with log_context(request_id="abc"):
+        line: str = formatter.format(_record(user="someone"))
+
+    assert line.endswith("A demo log message [request_id:abc] [user:someone]")
+
+
+def test_asyncio_tasks() -> None:
+    """Test each task logs with the values it bound."""
+    collector = Collector()
+    logger: logging.Logger = logging.getLogger("tests.context.tasks")
+    logger.propagate = False
+    logger.addHandler(collector)
+
+    async def serve(request_id: str) -> None:
+        bind(request_id=request_id)
+        await asyncio.sleep(0)
+        logger.warning("Served")
+
+    async def main() -> None:
+        with log_context(tenant="acme"):
+            await asyncio.gather(serve("first"), serve("second"))
+        logger.warning("Done")
+
+    try:
+        asyncio.run(main())
+    finally:
+        logger.removeHandler(collector)
+
+    assert sorted(
+        (line.get("tenant", ""), line.get("request_id", "")) for line in collector.lines
+    ) == [("", ""), ("acme", "first"), ("acme", "second")]
+
+
+@pytest.mark.parametrize("defer_messages", [False, True])
+def test_queue_format_handler(defer_messages: bool) -> None:
+    """Test records formatted in the background keep the caller's context."""
+    collector = Collector()
+    handler = QueueFormatHandler(collector, defer_messages=defer_messages)
+
+    with log_context(request_id="abc"):
+        handler.handle(_record())
+    handler.handle(_record())
+    handler.close()
+
+    assert collector.threads[0] != threading.get_ident()
+    assert [line.get("request_id") for line in collector.lines] == ["abc", None]
+
+
+def test_asyncio_handler() -> None:
+    """Test records written later by the loop keep the caller's context."""
+    written: List[bytes] = []
+
+    class Target(AsyncTarget):
+        async def write(self, data: bytes) -> None:
+            written.append(data)
+
+    async def main() -> None:
+        handler = AsyncioHandler(Target())
+        handler.setFormatter(JsonFormat())
+        with log_context(request_id="abc"):
+            handler.handle(_record())
+        await handler.aclose()
+
+    asyncio.run(main())
+
+    assert _json(written[0].decode())["request_id"] == "abc"
+
+
+def test_record_shipping_handler() -> None:
+    """Test shipped records carry the context, as a ``repr`` if need be."""
+    handler = RecordShippingHandler(None)
+
+    with log_context(request_id="abc"):
+        state: Dict[str, Any] = pickle.loads(handler.prepare(_record()))  # noqa: S301
+        with log_context(lock=threading.Lock()):
+            unpicklable: Dict[str, Any] = pickle.loads(  # noqa: S301
+                handler.prepare(_record())
+            )
+
+    assert state[CONTEXT_KEY] == {"request_id": "abc"}
+    assert unpicklable[CONTEXT_KEY]["request_id"] == "abc"
+    assert unpicklable[CONTEXT_KEY]["lock"].startswith("<unlocked _thread.lock")
+    line: Dict[str, Any] = _json(JsonFormat().format(logging.makeLogRecord(state)))
+    assert line["request_id"] == "abc"
+
+
+def test_snapshot_filter() -> None:
+    """Test the filter snapshots the context for the standard queue handler."""
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    handler = logging.handlers.QueueHandler(records)
+    handler.addFilter(ContextSnapshotFilter())
+    collector = Collector()
+    listener = logging.handlers.QueueListener(records, collector)
+
+    listener.start()
+    try:
+        with log_context(request_id="abc"):
+            handler.handle(_record())
+    finally:
+        listener.stop()
+
+    assert collector.lines[0]["request_id"] == "abc"
@@ -0,0 +1,166 @@
+"""Test cases for encoding values JSON has no type for."""
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import gc
+import json
+import logging
+import uuid
+import weakref
+from typing import Any
+from typing import Dict
+from typing import Iterator
+
+import pytest
+
+from pylogformats import encoders
+from pylogformats.encoders import encode_default
+from pylogformats.encoders import register_encoder
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.serializers import SERIALIZERS
+
+
+class Colour(enum.Enum):
+    """An enum extra."""
+
+    RED = "red"
+
+
+@dataclasses.dataclass
+class User:
+    """A dataclass extra, holding a value which needs encoding itself."""
+
+    name: str
+    joined: datetime.date
+
+
+class Opaque:
+    """An object with no special encoding."""
+
+    def __repr__(self) -> str:
+        """Describe the object."""
+        return "<Opaque>"
+
+
+class Unrepresentable:
+    """An object whose repr fails."""
+
+    def __repr__(self) -> str:
+        """Fail."""
+        raise RuntimeError("no repr")
+
+
+class Unprintable(Exception):
+    """An exception whose str fails."""
+
+    def __str__(self) -> str:
+        """Fail."""
+        raise RuntimeError("no str")
+
+
+EXTRAS: Dict[str, Any] = {
+    "when": datetime.datetime(2020, 1, 31, 12, 30),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "amount": decimal.Decimal("1.10"),
+    "colour": Colour.RED,
+    "user": User("someone", datetime.date(2020, 1, 31)),
+    "tags": {"one"},
+    "raw": b"bytes",
+    "error": ValueError("Something went wrong"),
+    "opaque": Opaque(),
+}
+
+
+@pytest.fixture(autouse=True)
+def restore_encoders() -> Iterator[None]:
+    """Undo any encoders registered by a test."""
+    registered = dict(encoders.ENCODERS)
+    yield
+    encoders.ENCODERS.clear()
+    encoders.ENCODERS.update(registered)
+    encoders._RESOLVED.clear()
+
+
+def test_encode_default() -> None:
+    """Test the encoding of every supported type."""
+    assert [encode_default(value) for value in EXTRAS.values()] == [
+        "2020-01-31T12:30:00",
+        "12345678-1234-5678-1234-567812345678",
+        "1.10",
+        "red",
+        {"name": "someone", "joined": datetime.date(2020, 1, 31)},
+        ["one"],
+        "bytes",
+        {"exc_type": "ValueError", "exc_message": "Something went wrong"},
+        "<Opaque>",
+    ]
+    assert encode_default(datetime.time(9, 5)) == "09:05:00"
+    assert encode_default(frozenset()) == []
+    assert encode_default(bytearray(b"\xff")) == "\\xff"
+    assert encode_default(Unrepresentable()) == "<repr() failed: Unrepresentable>"
+    assert encode_default(Unprintable()) == {
+        "exc_type": "Unprintable",
+        "exc_message": "<exception str() failed: Unprintable>",
+    }
+
+
+def test_encoder_cached_per_type() -> None:
+    """Test that the encoder of a type is only looked up once."""
+    encode_default(Opaque())
+    assert encoders._RESOLVED[Opaque] is encoders._encode_repr
+
+    encoders._RESOLVED[Opaque] = lambda value: "cached"
+    assert encode_default(Opaque()) == "cached"
+
+
+def test_encoder_cache_lets_classes_go() -> None:
+    """Test that classes created on the fly are not kept alive by the cache."""
+    dynamic: Any = type("Dynamic", (Opaque,), {})
+    encode_default(dynamic())
+    assert dynamic in encoders._RESOLVED
+
+    dynamic_ref = weakref.ref(dynamic)
+    del dynamic
+    gc.collect()
+
+    assert dynamic_ref() is None
+
+
+def test_register_encoder() -> None:
+    """Test that registered encoders apply to subclasses and reset the cache."""
+
+    class SubOpaque(Opaque):
+        pass
+
+    assert encode_default(SubOpaque()) == "<Opaque>"
+
+    register_encoder(Opaque, lambda value: "registered")
+    assert encode_default(SubOpaque()) == "registered"
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+@pytest.mark.parametrize("formatter", [JsonFormat, BunyanFormat, AdvJsonFormat])
+def test_formatters_encode_extras(name: str, formatter: Any) -> None:
+    """Test that records with unusual extras are not lost by any formatter."""
+    try:
+        format_class: logging.Formatter = formatter(serializer=name)
+    except ImportError:  # pragma: no cover
+        pytest.skip(f"{name} is not installed")
+
+    record = logging.makeLogRecord({"name": "root", "msg": "Extras", **EXTRAS})
+    logged: Dict[str, Any] = json.loads(format_class.format(record))
+
+    # ujson writes decimals as numbers.
+    assert logged["amount"] in ("1.10", 1.1)
+    assert logged["colour"] == "red"
+    assert logged["user"]["name"] == "someone"
+    assert logged["user"]["joined"] == "2020-01-31"
+    assert logged["tags"] == ["one"]
+    assert logged["id"] == "12345678-1234-5678-1234-567812345678"
+    assert logged["when"].startswith("2020-01-31T12:30:00")
+    assert logged["error"]["exc_type"] == "ValueError"
+    assert logged["opaque"] == "<Opaque>"
@@ -0,0 +1,104 @@
+"""Test cases for the precompiled JSON record layouts."""
+
+import json
+import logging
+from typing import Any
+from typing import Dict
+
+import pytest
+
+from pylogformats.fieldplan import FieldPlan
+from pylogformats.fieldplan import FieldSpec
+from pylogformats.fieldplan import Static
+from pylogformats.serializers import SERIALIZERS
+from pylogformats.serializers import Serializer
+from pylogformats.serializers import StdlibSerializer
+from pylogformats.serializers import get_serializer
+
+
+FIELDS: FieldSpec = [
+    ("100% logger", "name"),
+    ("message", lambda record: record.getMessage()),
+    ("location", [("line", "lineno"), ("static", Static("%s ünïcödé"))]),
+    ("level", "levelno"),
+    ("empty", []),
+    ("v", Static(0)),
+]
+
+EXPECTED: Dict[str, Any] = {
+    "100% logger": "root",
+    "message": 'A "quoted" 50% message',
+    "location": {"line": 30, "static": "%s ünïcödé"},
+    "level": 20,
+    "empty": {},
+    "v": 0,
+}
+
+
+def _record() -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {
+            "name": "root",
+            "msg": 'A "quoted" %d%% message',
+            "args": (50,),
+            "lineno": 30,
+            "levelno": 20,
+        }
+    )
+
+
+def test_render_matches_json_dumps() -> None:
+    """Test that a plan renders exactly what `json.dumps` would."""
+    plan = FieldPlan(FIELDS, StdlibSerializer())
+    extras: Dict[str, Any] = {"float": 1.5, "list": [1, None, True], "none": None}
+
+    assert plan.render(_record(), {}) == json.dumps(EXPECTED)
+    assert plan.render(_record(), extras) == json.dumps({**EXPECTED, **extras})
+
+
+def test_render_extra_replacing_a_field() -> None:
+    """Test that an extra sharing a planned key replaces it in place."""
+    plan = FieldPlan(FIELDS, StdlibSerializer())
+    extras: Dict[str, Any] = {"level": "overridden", "other": 1}
+
+    assert plan.render(_record(), extras) == json.dumps({**EXPECTED, **extras})
+
+
+def test_build() -> None:
+    """Test that a plan builds the record as nested dictionaries."""
+    plan = FieldPlan(FIELDS, StdlibSerializer())
+
+    assert plan.build(_record()) == EXPECTED
+    assert plan.keys == frozenset(EXPECTED)
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def test_render_with_every_serializer(name: str) -> None:
+    """Test that plans render like the backend serializing the whole record."""
+    try:
+        serializer: Serializer = get_serializer(name)
+    except ImportError:  # pragma: no cover
+        pytest.skip(f"{name} is not installed")
+
+    plan = FieldPlan(FIELDS, serializer)
+    extras: Dict[str, Any] = {"float": 1.5, "text": "ünïcödé"}
+
+    assert plan.render(_record(), extras) == serializer.dumps({**EXPECTED, **extras})
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        [("logger", "name")],
+        [("logger", "name"), ("line", "lineno")],
+        [("message", lambda record: record.getMessage())],
+        [("v", Static(1))],
+    ],
+)
+def test_render_small_layouts(fields: FieldSpec) -> None:
+    """Test layouts with one or no values of each kind."""
+    plan = FieldPlan(fields, StdlibSerializer())
+
+    assert plan.render(_record(), {"n": 1}) == json.dumps(
+        {**plan.build(_record()), "n": 1}
+    )
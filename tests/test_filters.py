@@ -0,0 +1,217 @@
+"""Test cases for filtering records while reading them."""
+
+import logging
+import pathlib
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pytest
+
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.parse import BunyanParser
+from pylogformats.parse import CompactTextParser
+from pylogformats.parse import JsonParser
+from pylogformats.parse import LineParser
+from pylogformats.parse import ParsedRecord
+from pylogformats.parse import RecordFilter
+from pylogformats.parse import parse_chunk
+from pylogformats.parse import read_parallel
+from pylogformats.parse import read_records
+from pylogformats.text import CompactTextFormat
+
+
+def make_record(name: str, level: int, msg: str = "A Test Log") -> logging.LogRecord:
+    """Build a record of a logger and level."""
+    return logging.makeLogRecord(
+        {
+            "name": name,
+            "msg": msg,
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+            "user": {"id": 1},
+        }
+    )
+
+
+RECORDS: List[Tuple[str, int]] = [
+    ("app", logging.INFO),
+    ("app.db", logging.ERROR),
+    ("application", logging.ERROR),
+    ("app.db", logging.DEBUG),
+    ("web", logging.CRITICAL),
+    ("app", logging.WARNING),
+]
+
+
+def write_log(path: pathlib.Path, formatter: logging.Formatter) -> None:
+    """Write every record of `RECORDS`."""
+    with open(path, "w", encoding="utf-8") as output:
+        for name, level in RECORDS:
+            output.write(formatter.format(make_record(name, level)) + "\n")
+
+
+@pytest.mark.parametrize(
+    "formatter, parser",
+    [
+        (JsonFormat(), JsonParser()),
+        (AdvJsonFormat(), JsonParser()),
+        (JsonFormat(serializer="auto"), JsonParser()),
+        (BunyanFormat(), BunyanParser()),
+    ],
+)
+def test_scan_line(formatter: logging.Formatter, parser: LineParser) -> None:
+    """Test the logger and level are read from the lines the formatters write."""
+    line: str = formatter.format(make_record("app.db", logging.ERROR))
+
+    assert parser.scan_line(line) == ("app.db", logging.ERROR)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ('{"logger":"app","levelno":40}', ("app", 40)),
+        ('{"logger": "caf\\u00e9", "levelno": 40}', (None, 40)),
+        ('{"logger": null, "levelno": "high"}', (None, None)),
+        ('{"extra": {"logger": "app", "levelno": 40}}', (None, None)),
+        ('{"message": "{", "logger": "app", "levelno": 40}', (None, None)),
+        ('{"logger": "app', (None, None)),
+        ("not json", (None, None)),
+    ],
+)
+def test_scan_line_unknown_parts(
+    line: str, expected: Tuple[Optional[str], Optional[int]]
+) -> None:
+    """Test parts which can not be read safely are left unknown."""
+    assert JsonParser().scan_line(line) == expected
+
+
+def test_scan_line_text_formats() -> None:
+    """Test the text formats leave the scan to the full parse."""
+    assert CompactTextParser().scan_line("[E 2021-02-04 23:01:46 ...") == (None, None)
+
+
+def test_record_filter() -> None:
+    """Test records are selected by level and logger, with children."""
+    errors = RecordFilter("error", loggers=["app"])
+
+    assert errors.level == logging.ERROR
+    assert errors(ParsedRecord("", "ERROR", "app", ""))
+    assert errors(ParsedRecord("", "CRITICAL", "app.db", ""))
+    assert not errors(ParsedRecord("", "WARNING", "app", ""))
+    assert not errors(ParsedRecord("", "ERROR", "application", ""))
+    assert not errors(ParsedRecord("", "ERROR", None, ""))
+    assert errors.accepts(None, None)
+
+    assert RecordFilter(25)(ParsedRecord("", "Level 30", None, ""))
+    assert RecordFilter()(ParsedRecord("", "NOTICE", None, ""))
+
+
+def test_record_filter_unknown_level() -> None:
+    """Test unknown level names are refused."""
+    with pytest.raises(ValueError, match="Unknown level 'LOUD'"):
+        RecordFilter("LOUD")
+
+
+def test_levelno() -> None:
+    """Test the level number of parsed records."""
+    assert ParsedRecord("", "WARNING", None, "").levelno == logging.WARNING
+    assert ParsedRecord("", "Level 35", None, "").levelno == 35
+    assert ParsedRecord("", "NOTICE", None, "").levelno == logging.NOTSET
+    assert ParsedRecord("", "NOTICE", None, "", {"levelno": 25}).levelno == 25
+    assert ParsedRecord("", "INFO", None, "", {"levelno": True}).levelno == 20
+
+
+class CountingParser(BunyanParser):
+    """A Bunyan parser counting the lines it decodes."""
+
+    def __init__(self) -> None:
+        """Start counting."""
+        super().__init__()
+        self.parsed: int = 0
+
+    def parse_line(self, line: str) -> Optional[ParsedRecord]:
+        """Count and parse a line."""
+        self.parsed += 1
+        return super().parse_line(line)
+
+
+def test_filter_skips_decoding(tmp_path: pathlib.Path) -> None:
+    """Test lines ruled out by the scan are never decoded."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, BunyanFormat())
+    with open(path, "a", encoding="utf-8") as output:
+        output.write("not a record\n")
+    parser = CountingParser()
+
+    records: List[ParsedRecord] = list(
+        read_records(path, parser, record_filter=RecordFilter("ERROR", ["app"]))
+    )
+
+    assert [record.logger for record in records] == ["app.db"]
+    # Only the matching line, and the line the scan can not read, are decoded.
+    assert parser.parsed == 2
+
+
+def names(records: Iterable[ParsedRecord]) -> List[Tuple[Optional[str], str]]:
+    """Describe records by logger and level."""
+    return [(record.logger, record.level) for record in records]
+
+
+@pytest.mark.parametrize(
+    "formatter, parser",
+    [
+        (JsonFormat(), "json"),
+        (BunyanFormat(), "bunyan"),
+        (CompactTextFormat(), "compact"),
+    ],
+)
+def test_filter_matches_a_full_parse(
+    tmp_path: pathlib.Path, formatter: logging.Formatter, parser: str
+) -> None:
+    """Test filtering gives the records filtering after parsing would."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, formatter)
+    record_filter = RecordFilter("WARNING", ["app", "web"])
+
+    expected = [
+        record for record in read_records(path, parser) if record_filter(record)
+    ]
+    filtered = list(read_records(path, parser, record_filter=record_filter))
+
+    assert names(filtered) == names(expected)
+    assert names(filtered) == [
+        ("app.db", "ERROR"),
+        ("web", "CRITICAL"),
+        ("app", "WARNING"),
+    ]
+
+
+def test_filter_in_chunks(tmp_path: pathlib.Path) -> None:
+    """Test records are filtered chunk by chunk when parsing in parallel."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, BunyanFormat())
+    record_filter = RecordFilter("ERROR")
+
+    records: List[ParsedRecord] = list(
+        read_parallel(
+            path,
+            "bunyan",
+            processes=2,
+            chunk_size=256,
+            record_filter=record_filter,
+        )
+    )
+    chunk: List[ParsedRecord] = parse_chunk(
+        path, 0, path.stat().st_size, BunyanParser(), record_filter=record_filter
+    )
+
+    assert names(records) == names(chunk)
+    assert names(records) == [
+        ("app.db", "ERROR"),
+        ("application", "ERROR"),
+        ("web", "CRITICAL"),
+    ]
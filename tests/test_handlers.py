@@ -0,0 +1,128 @@
+"""Test cases for the background formatting handler."""
+
+import logging
+import threading
+from typing import List
+
+import pytest
+
+from pylogformats import JsonFormat
+from pylogformats.handlers import QueueFormatHandler
+
+
+class GatedHandler(logging.Handler):
+    """Collects formatted records, waiting for a gate before each one."""
+
+    def __init__(self) -> None:
+        """Create the handler with the gate open."""
+        super().__init__()
+        self.setFormatter(JsonFormat())
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.lines: List[str] = []
+        self.threads: List[int] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Wait for the gate, then collect the record."""
+        self.entered.set()
+        self.gate.wait()
+        self.threads.append(threading.get_ident())
+        self.lines.append(self.format(record))
+
+
+def _record(msg: str = "A demo log message") -> logging.LogRecord:
+    return logging.makeLogRecord({"name": "root", "msg": msg, "args": None})
+
+
+def _stall(target: GatedHandler, handler: QueueFormatHandler) -> None:
+    """Keep the background thread busy with a record, so the queue fills."""
+    target.gate.clear()
+    handler.handle(_record("stalled"))
+    assert target.entered.wait(5)
+
+
+def test_formats_in_background() -> None:
+    """Test that records are formatted off the caller's thread."""
+    target = GatedHandler()
+    handler = QueueFormatHandler(target)
+
+    args = {"user": "someone"}
+    record = logging.makeLogRecord(
+        {"name": "root", "msg": "Hello %(user)s", "args": args}
+    )
+    handler.handle(record)
+    args["user"] = "changed"
+    handler.close()
+
+    assert target.threads != [threading.get_ident()]
+    assert '"message": "Hello someone"' in target.lines[0]
+    assert (handler.queued, handler.dropped, handler.pending) == (1, 0, 0)
+
+
+def test_drop_policy() -> None:
+    """Test that records are dropped and counted while the queue is full."""
+    target = GatedHandler()
+    handler = QueueFormatHandler(target, maxsize=2, overflow="drop")
+    _stall(target, handler)
+
+    for _ in range(5):
+        handler.handle(_record())
+
+    assert (handler.queued, handler.dropped, handler.pending) == (3, 3, 2)
+
+    target.gate.set()
+    handler.close()
+    assert len(target.lines) == 3
+
+
+def test_block_policy_times_out() -> None:
+    """Test that the block policy drops records after its timeout."""
+    target = GatedHandler()
+    handler = QueueFormatHandler(target, maxsize=1, overflow="block", timeout=0.01)
+    _stall(target, handler)
+
+    handler.handle(_record())
+    handler.handle(_record())
+
+    assert (handler.queued, handler.dropped) == (2, 1)
+
+    target.gate.set()
+    handler.close()
+
+
+def test_sample_policy() -> None:
+    """Test that the sample policy thins records once the queue is half full."""
+    target = GatedHandler()
+    handler = QueueFormatHandler(target, maxsize=10, overflow="sample", sample_every=5)
+    _stall(target, handler)
+
+    for _ in range(15):
+        handler.handle(_record())
+
+    # Five fill half of the queue, then one in every five of the rest is kept.
+    assert (handler.queued, handler.dropped, handler.pending) == (8, 8, 7)
+
+    target.gate.set()
+    handler.close()
+    assert len(target.lines) == 8
+
+
+def test_close_with_a_full_queue() -> None:
+    """Test that closing writes out every queued record."""
+    target = GatedHandler()
+    handler = QueueFormatHandler(target, maxsize=1)
+    _stall(target, handler)
+    handler.handle(_record())
+
+    threading.Timer(0.05, target.gate.set).start()
+    handler.close()
+    handler.close()
+
+    assert len(target.lines) == 2
+
+
+def test_unknown_overflow_policy() -> None:
+    """Test that unknown overflow policies are rejected."""
+    with pytest.raises(ValueError, match="Unknown overflow policy"):
+        QueueFormatHandler(overflow="explode")
@@ -0,0 +1,62 @@
+"""Test cases for the cached process identity."""
+
+import os
+import platform
+import sys
+
+import pytest
+
+from pylogformats.identity import ProcessIdentity
+
+
+def test_identity_resolves_process() -> None:
+    """Test that the identity matches the running process."""
+    identity = ProcessIdentity()
+
+    assert identity.hostname == platform.node()
+    assert identity.pid == os.getpid()
+    assert identity.process_name == "MainProcess"
+
+
+def test_identity_explicit_hostname() -> None:
+    """Test that an explicit hostname survives a refresh."""
+    identity = ProcessIdentity(hostname="SomePc")
+    identity.refresh()
+
+    assert identity.hostname == "SomePc"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_identity_refresh_on_fork() -> None:
+    """Test that forked children see their own process id."""
+    identity = ProcessIdentity(refresh_on_fork=True)
+    read_fd, write_fd = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.write(write_fd, str(identity.pid).encode())
+        os._exit(0)
+
+    os.waitpid(pid, 0)
+    os.close(write_fd)
+    child_pid = int(os.read(read_fd, 64))
+    os.close(read_fd)
+
+    assert child_pid == pid
+    assert identity.pid == os.getpid()
+
+
+def test_identity_multiprocessing_name() -> None:
+    """Test that the process name comes from multiprocessing once imported."""
+    import multiprocessing
+
+    identity = ProcessIdentity()
+
+    assert identity.process_name == multiprocessing.current_process().name
+
+
+def test_identity_without_multiprocessing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the process name defaults until multiprocessing is imported."""
+    monkeypatch.delitem(sys.modules, "multiprocessing", raising=False)
+
+    assert ProcessIdentity().process_name == "MainProcess"
@@ -0,0 +1,313 @@
+"""Test cases for reading windows of time from log files."""
+
+import logging
+import os
+import pathlib
+from datetime import datetime
+from typing import List
+from typing import Optional
+
+import pytest
+
+from pylogformats.handlers import IndexingFileHandler
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.parse import JsonParser
+from pylogformats.parse import ParsedRecord
+from pylogformats.parse import TimeIndex
+from pylogformats.parse import build_index
+from pylogformats.parse import read_window
+from pylogformats.parse.index import index_path
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+
+
+# Records are a second apart, from this local time on.
+START: float = datetime(2021, 2, 4, 14, 0).timestamp()
+
+
+def make_record(index: int, exc_info: bool = False) -> logging.LogRecord:
+    """Build the record written at ``START + index`` seconds."""
+    record = logging.makeLogRecord(
+        {
+            "name": "app",
+            "msg": f"Record {index}",
+            "levelno": logging.INFO,
+            "levelname": "INFO",
+        }
+    )
+    record.created = START + index + 0.25
+    record.msecs = 250.0
+    if exc_info:
+        record.exc_text = "Traceback (most recent call last):\nValueError: Oops"
+    return record
+
+
+def write_log(path: pathlib.Path, formatter: logging.Formatter, count: int) -> None:
+    """Write records a second apart, with a traceback on every fifth."""
+    with open(path, "w", encoding="utf-8") as output:
+        for index in range(count):
+            output.write(formatter.format(make_record(index, index % 5 == 0)) + "\n")
+
+
+def messages(records: List[ParsedRecord]) -> List[str]:
+    """List the messages of some records."""
+    return [record.message for record in records]
+
+
+def window(first: int, last: int) -> List[str]:
+    """The messages of the records from ``first`` up to ``last``."""
+    return [f"Record {index}" for index in range(first, last)]
+
+
+@pytest.mark.parametrize(
+    "formatter, parser",
+    [
+        (JsonFormat(), "json"),
+        (AdvJsonFormat(), "json"),
+        (BunyanFormat(), "bunyan"),
+        (CompactTextFormat(), "compact"),
+        (SimpleTextFormat(), "simple"),
+    ],
+)
+def test_read_window_by_bisecting(
+    tmp_path: pathlib.Path, formatter: logging.Formatter, parser: str
+) -> None:
+    """Test windows are found in a file without an index."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, formatter, 300)
+
+    records: List[ParsedRecord] = list(
+        read_window(path, START + 120, START + 125, parser)
+    )
+
+    assert messages(records) == window(120, 125)
+    # Records keep their tracebacks, which run over several lines in text.
+    assert {"continuation", "exception", "err"} & set(records[0].fields)
+
+
+def test_read_window_edges(tmp_path: pathlib.Path) -> None:
+    """Test windows before, after and around the whole file."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, JsonFormat(), 50)
+
+    assert messages(list(read_window(path, 0, START + 3))) == window(0, 3)
+    assert messages(list(read_window(path, START + 48, START + 1e6))) == window(48, 50)
+    assert list(read_window(path, START + 100, START + 200)) == []
+    assert len(list(read_window(path, 0, START + 1e6))) == 50
+
+    empty: pathlib.Path = tmp_path / "empty.log"
+    empty.touch()
+    assert list(read_window(empty, 0, START)) == []
+
+
+def test_read_window_datetimes(tmp_path: pathlib.Path) -> None:
+    """Test windows given as local times."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, BunyanFormat(), 100)
+
+    records = read_window(
+        path, datetime(2021, 2, 4, 14, 1), datetime(2021, 2, 4, 14, 1, 3), "bunyan"
+    )
+
+    assert messages(list(records)) == window(60, 63)
+
+
+def test_read_window_skips_unreadable_lines(tmp_path: pathlib.Path) -> None:
+    """Test lines without a timestamp are skipped, and do not upset the search."""
+    path: pathlib.Path = tmp_path / "app.log"
+    formatter = JsonFormat()
+    with open(path, "w", encoding="utf-8") as output:
+        for index in range(100):
+            output.write(formatter.format(make_record(index)) + "\n")
+            output.write("not a record\n")
+            output.write('{"message": "no timestamp"}\n')
+
+    assert messages(list(read_window(path, START + 40, START + 42))) == window(40, 42)
+
+
+def test_build_index(tmp_path: pathlib.Path) -> None:
+    """Test indexing a file after the fact, and reading with the index."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, CompactTextFormat(), 100)
+
+    index: TimeIndex = build_index(path, "compact", every=10)
+
+    # 140 lines, with the tracebacks. Entries only point at records.
+    assert len(index) == 14
+    with open(path, "rb") as log_file:
+        for created, offset in zip(index.times, index.offsets):
+            log_file.seek(offset)
+            number: int = int(created - START)
+            assert f"] Record {number} ".encode() in log_file.readline()
+
+    saved: TimeIndex = TimeIndex.load(index_path(path))
+    assert list(saved.times) == list(index.times)
+    assert list(saved.offsets) == list(index.offsets)
+
+    records = read_window(path, START + 55, START + 57, "compact")
+    assert messages(list(records)) == window(55, 57)
+
+
+class CountingParser(JsonParser):
+    """A JSON parser counting the lines it parses."""
+
+    def __init__(self) -> None:
+        """Start counting."""
+        super().__init__()
+        self.parsed: int = 0
+
+    def parse_line(self, line: str) -> Optional[ParsedRecord]:
+        """Count and parse a line."""
+        self.parsed += 1
+        return super().parse_line(line)
+
+
+def test_read_window_uses_the_index(tmp_path: pathlib.Path) -> None:
+    """Test the index is used to seek, and the file only read from there."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, JsonFormat(), 1000)
+    build_index(path, every=100)
+    parser = CountingParser()
+
+    records = list(read_window(path, START + 450, START + 452, parser))
+
+    assert messages(records) == window(450, 452)
+    # One line to check the entry, then from record 400 to just past the end.
+    assert parser.parsed == 1 + 53
+
+    parser = CountingParser()
+    records = list(read_window(path, START - 10, START + 2, parser))
+    assert messages(records) == window(0, 2)
+    assert parser.parsed == 3
+
+
+def test_read_window_ignores_a_stale_index(tmp_path: pathlib.Path) -> None:
+    """Test an index which does not fit the file is not used."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, JsonFormat(), 200)
+    build_index(path, every=10)
+    write_log(path, JsonFormat(), 20)
+    with open(path, "a", encoding="utf-8") as output:
+        formatter = JsonFormat()
+        for index in range(20, 200):
+            output.write(formatter.format(make_record(index + 1000)) + "\n")
+
+    records = read_window(path, START + 1100, START + 1102)
+
+    assert messages(list(records)) == ["Record 1100", "Record 1101"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["", "something else\n", "pylogformats-index 1\nbroken 12\n"],
+)
+def test_read_window_ignores_a_broken_index(
+    tmp_path: pathlib.Path, content: str
+) -> None:
+    """Test index files which can not be read are not used."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, JsonFormat(), 100)
+    pathlib.Path(index_path(path)).write_text(content)
+
+    assert messages(list(read_window(path, START + 5, START + 7))) == window(5, 7)
+
+
+def test_load_a_cut_index(tmp_path: pathlib.Path) -> None:
+    """Test a last entry cut short while it was written is left out."""
+    path: pathlib.Path = tmp_path / "app.log.idx"
+    path.write_text("pylogformats-index 1\n1.5 0\n2.5 10\n3.5 2")
+
+    index: TimeIndex = TimeIndex.load(path)
+
+    assert list(index.offsets) == [0, 10]
+    assert index.entry_before(2.5) == 0
+    assert index.entry_before(1.0) == -1
+
+
+def test_indexing_file_handler(tmp_path: pathlib.Path) -> None:
+    """Test the handler writes the index while it writes the file."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = IndexingFileHandler(path, every=10)
+    handler.setFormatter(AdvJsonFormat())
+    for number in range(50):
+        handler.handle(make_record(number))
+    handler.close()
+    handler.close()
+
+    index: TimeIndex = TimeIndex.load(index_path(path))
+    assert list(index.times) == [START + number + 0.25 for number in range(0, 50, 10)]
+    with open(path, "rb") as log_file:
+        for offset, number in zip(index.offsets, range(0, 50, 10)):
+            log_file.seek(offset)
+            assert f'"Record {number}"'.encode() in log_file.readline()
+
+    # Adding to the file adds to its index.
+    handler = IndexingFileHandler(path, every=10, delay=True)
+    handler.setFormatter(AdvJsonFormat())
+    for number in range(50, 60):
+        handler.handle(make_record(number))
+    handler.close()
+
+    assert len(TimeIndex.load(index_path(path))) == 6
+    parser = CountingParser()
+    records = list(read_window(path, START + 51, START + 53, parser))
+    assert messages(records) == window(51, 53)
+    assert parser.parsed == 1 + 4
+
+
+def test_indexing_file_handler_replaces(tmp_path: pathlib.Path) -> None:
+    """Test replacing the file replaces its index, and adding starts one."""
+    path: pathlib.Path = tmp_path / "app.log"
+    path.write_text("old\n" * 10)
+
+    handler = IndexingFileHandler(path, every=1)
+    handler.setFormatter(JsonFormat())
+    handler.handle(make_record(0))
+    handler.close()
+    assert TimeIndex.load(index_path(path)).offsets.tolist() == [40]
+
+    handler = IndexingFileHandler(path, mode="w", every=1)
+    handler.setFormatter(JsonFormat())
+    handler.handle(make_record(1))
+    handler.close()
+    assert TimeIndex.load(index_path(path)).offsets.tolist() == [0]
+    assert os.path.getsize(path) > 0
+
+
+def test_indexing_file_handler_errors(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test failing to write the index is reported like any handler error."""
+    handler = IndexingFileHandler(tmp_path / "app.log", every=1)
+    handler.setFormatter(JsonFormat())
+    handler.handle(make_record(0))
+    assert handler.index is not None
+    handler.index.close()
+
+    handler.handle(make_record(1))
+    handler.close()
+
+    assert "ValueError" in capsys.readouterr().err
+
+
+def test_indexing_file_handler_failed_record(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test a record which fails to format gets no index entry."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = IndexingFileHandler(path, every=1)
+    handler.setFormatter(JsonFormat())
+    handler.handle(make_record(0))
+    handler.handle(logging.makeLogRecord({"msg": "%d", "args": ("text",)}))
+    handler.handle(make_record(1))
+    handler.close()
+
+    assert "TypeError" in capsys.readouterr().err
+    index: TimeIndex = TimeIndex.load(index_path(path))
+    assert list(index.times) == [START + 0.25, START + 1.25]
+    with open(path, "rb") as log_file:
+        for offset, number in zip(index.offsets, range(2)):
+            log_file.seek(offset)
+            assert f'"Record {number}"'.encode() in log_file.readline()
@@ -0,0 +1,240 @@
+"""Test cases for size bounded records."""
+
+import dataclasses
+import json
+import logging
+import sys
+from collections import deque
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.limits import SizeLimits
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+
+
+class Endless(list):  # type: ignore[type-arg]
+    """A list which never ends, so it can only be read in part."""
+
+    def __len__(self) -> int:
+        """Claim to be huge."""
+        return sys.maxsize
+
+    def __iter__(self) -> Any:
+        """Yield numbers forever."""
+        number = 0
+        while True:
+            yield number
+            number += 1
+
+
+def make_record(**extras: Any) -> logging.LogRecord:
+    """Create a record with a long message and the given extras."""
+    return logging.makeLogRecord(
+        {"name": "root", "msg": "x" * 10_000, "args": None, **extras}
+    )
+
+
+def test_strings_cut() -> None:
+    """Test that the message and string extras are cut to the string limit."""
+    formatter = JsonFormat(limits=SizeLimits(max_string_bytes=10))
+    logged = json.loads(formatter.format(make_record(payload="y" * 10_000)))
+
+    assert logged["message"] == "x" * 10
+    assert logged["payload"] == "y" * 10
+    assert logged["truncated"] is True
+
+
+def test_strings_cut_on_character_boundaries() -> None:
+    """Test that multi-byte characters are never split."""
+    limits = SizeLimits(max_string_bytes=5)
+
+    assert limits.limit_message("ééé") == "éé"
+    assert limits.limit_message("éé") == "éé"
+    assert limits.limit_message("abcde") == "abcde"
+
+
+def test_collections_and_depth_cut() -> None:
+    """Test that collections are cut to the item and depth limits."""
+    formatter = BunyanFormat(limits=SizeLimits(max_items=2, max_depth=2))
+    record = make_record(
+        ids=list(range(100)),
+        tags={"only"},
+        mapping={str(index): index for index in range(100)},
+        nested={"a": {"b": {"c": 1}}},
+        endless=Endless(),
+    )
+    logged = json.loads(formatter.format(record))
+
+    assert logged["msg"] == "x" * 10_000
+    assert logged["ids"] == [0, 1]
+    assert logged["tags"] == ["only"]
+    assert logged["mapping"] == {"0": 0, "1": 1}
+    assert logged["nested"] == {"a": {"b": "..."}}
+    assert logged["endless"] == [0, 1]
+    assert logged["truncated"] is True
+
+
+def test_record_budget() -> None:
+    """Test that extras past the record limit are cut and then left out."""
+    limits = SizeLimits(max_record_bytes=42)
+    message, extras = limits.limit_record(
+        "m" * 20, {"first": "f" * 10, "second": ["s" * 100, "more"], "third": "t"}
+    )
+
+    assert message == "m" * 20
+    assert extras == {"first": "f" * 10, "second": ["s"], "truncated": True}
+
+    _, extras = limits.limit_record("m" * 30, {"k": {"v": "v" * 100, "w": 1}})
+    assert extras == {"k": {"v": "vvvvvvvvvv"}, "truncated": True}
+
+    message, extras = limits.limit_record("m" * 100, {"first": "f"})
+    assert message == "m" * 42
+    assert extras == {"truncated": True}
+
+
+def test_other_values_encoded_before_limiting() -> None:
+    """Test that bytes and other objects are limited after encoding."""
+    limits = SizeLimits(max_string_bytes=3, max_record_bytes=1000)
+    _, extras = limits.limit_record(
+        "",
+        {
+            "raw": b"\xffabcdef",
+            "data": bytearray(b"ab"),
+            "when": 1.5,
+            "none": None,
+            "id": Decimal("1.2345"),
+        },
+    )
+
+    assert extras == {
+        "raw": "\\xf",
+        "data": "ab",
+        "when": 1.5,
+        "none": None,
+        "id": "1.2",
+        "truncated": True,
+    }
+
+
+def test_reprs_cut_while_rendering() -> None:
+    """Test that objects rendered by their repr are only rendered in part."""
+    limits = SizeLimits(max_string_bytes=10)
+    _, extras = limits.limit_record(
+        "",
+        {
+            "queue": deque(range(10**6)),
+            "short": deque([1]),
+            "deep": deque([deque([deque([])])]),
+        },
+    )
+    assert extras == {
+        "queue": "deque([0, ",
+        "short": "deque([1])",
+        "deep": "deque([deq",
+        "truncated": True,
+    }
+
+    _, extras = SizeLimits(max_items=1).limit_record("", {"queue": deque([1, 2])})
+    assert extras == {"queue": "deque([1, 2])"}
+
+
+def test_cycles_cut(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that values holding themselves are cut where they repeat."""
+    looped: Dict[str, Any] = {"name": "loop"}
+    looped["self"] = looped
+    listed: List[Any] = [1]
+    listed.append([listed])
+    shared: List[int] = [1]
+
+    @dataclasses.dataclass
+    class Node:
+        child: Any = None
+
+    node = Node()
+    node.child = node
+
+    logger: logging.Logger = logging.getLogger("tests.limits.cycles")
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormat(limits=SizeLimits(max_string_bytes=100)))
+    logger.addHandler(handler)
+    logger.warning(
+        "Cycles",
+        extra={
+            "looped": looped,
+            "listed": listed,
+            "node": node,
+            "twice": [shared, shared],
+        },
+    )
+    logger.removeHandler(handler)
+
+    logged: Dict[str, Any] = json.loads(capsys.readouterr().out)
+    assert logged["looped"] == {"name": "loop", "self": "<cycle>"}
+    assert logged["listed"] == [1, ["<cycle>"]]
+    assert logged["node"] == {"child": "<cycle>"}
+    assert logged["twice"] == [[1], [1]]
+    assert logged["truncated"] is True
+
+
+def test_message_limited_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the JSON formats limit the message along with the extras."""
+    calls: List[str] = []
+    limit_record = SizeLimits.limit_record
+
+    def counted_limit_record(self: SizeLimits, *args: Any) -> Any:
+        calls.append("record")
+        return limit_record(self, *args)
+
+    monkeypatch.setattr(SizeLimits, "limit_record", counted_limit_record)
+    monkeypatch.setattr(SizeLimits, "limit_message", lambda self, message: "")
+    limits = SizeLimits(max_string_bytes=10)
+
+    for formatter in (JsonFormat, AdvJsonFormat, BunyanFormat):
+        logged = json.loads(formatter(limits=limits).format(make_record()))
+        assert logged.get("message", logged.get("msg")) == "x" * 10
+    assert calls == ["record"] * 3
+
+    # Called on its own, the message is still limited.
+    assert JsonFormat(limits=limits)._message(make_record()) == ""
+
+
+def test_within_limits_unchanged() -> None:
+    """Test that records within the limits are not marked."""
+    limits = SizeLimits(1000, 1000, 10, 100_000)
+    record = logging.makeLogRecord(
+        {"name": "root", "msg": "Fine", "extra": {"list": [1, 2], 3: "int key"}}
+    )
+    plain: Dict[str, Any] = json.loads(AdvJsonFormat().format(record))
+    limited: Dict[str, Any] = json.loads(AdvJsonFormat(limits=limits).format(record))
+
+    assert limited == plain
+    assert "truncated" not in limited
+
+
+@pytest.mark.parametrize("formatter", [CompactTextFormat, SimpleTextFormat])
+def test_text_formats(formatter: Any) -> None:
+    """Test that the text formatters cut the message and mark the record."""
+    output: str = formatter(limits=SizeLimits(max_string_bytes=10)).format(
+        make_record()
+    )
+
+    assert "x" * 11 not in output
+    assert "x" * 10 in output
+    assert "truncated" in output
+    assert "truncated" not in formatter(limits=SizeLimits()).format(make_record())
+
+
+def test_compact_extras_cut() -> None:
+    """Test that the compact formatter cuts its extras."""
+    formatter = CompactTextFormat(limits=SizeLimits(max_items=1))
+    output: str = formatter.format(make_record(ids=[1, 2, 3]))
+
+    assert output.endswith("[ids:[1]] [truncated:True]")
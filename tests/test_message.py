@@ -0,0 +1,119 @@
+"""Test cases for the shared message memo."""
+
+import io
+import logging
+import logging.handlers
+import pickle
+import threading
+from typing import List
+
+from pylogformats.baseline import BASELINE_KEYS
+from pylogformats.handlers import QueueFormatHandler
+from pylogformats.json import JsonFormat
+from pylogformats.message import MEMO_KEY
+from pylogformats.message import get_message
+from pylogformats.message import lazy
+from pylogformats.message import set_message
+from pylogformats.text import CompactTextFormat
+
+
+class Counted:
+    """Counts how often it is turned into a string."""
+
+    def __init__(self) -> None:
+        """Start counting from zero."""
+        self.calls = 0
+
+    def __str__(self) -> str:
+        """Count the call."""
+        self.calls += 1
+        return "counted"
+
+
+def test_message_rendered_once_across_formatters() -> None:
+    """Test that formatters on different handlers share the rendered message."""
+    counted = Counted()
+    record = logging.makeLogRecord({"msg": "Value %s", "args": (counted,)})
+
+    JsonFormat().format(record)
+    CompactTextFormat().format(record)
+    JsonFormat().format(record)
+
+    assert counted.calls == 1
+    assert MEMO_KEY in BASELINE_KEYS
+    assert "_pylogformats_message" not in JsonFormat().format(record)
+    assert CompactTextFormat().format(record).endswith("Value counted ")
+
+
+def test_message_memo_invalidated() -> None:
+    """Test that replacing the message or its arguments renders it again."""
+    record = logging.makeLogRecord({"msg": "Value %s", "args": ("one",)})
+    assert get_message(record) == "Value one"
+
+    record.args = ("two",)
+    assert get_message(record) == "Value two"
+
+    record.msg = "Other %s"
+    assert get_message(record) == "Other two"
+
+    # Replaced arguments are freed, and new ones may be given their ids.
+    for number in range(1000):
+        record.args = None
+        record.args = (str(number),)
+        assert get_message(record) == f"Other {number}"
+
+    set_message(record, "Merged")
+    record.msg, record.args = "Again %s", None
+    assert get_message(record) == "Again %s"
+
+
+def test_memo_keeps_records_picklable() -> None:
+    """Test that the memo does not keep unpicklable arguments on the record."""
+    record = logging.makeLogRecord({"msg": "Holding %s", "args": (threading.Lock(),)})
+    JsonFormat().format(record)
+
+    socket_handler = logging.handlers.SocketHandler("localhost", None)
+    state = pickle.loads(socket_handler.makePickle(record)[4:])
+    socket_handler.close()
+
+    assert state["msg"].startswith("Holding <unlocked _thread.lock object")
+    assert get_message(logging.makeLogRecord(state)) == state["msg"]
+
+
+def test_lazy_arguments() -> None:
+    """Test that lazy arguments are computed once, and only when rendered."""
+    calls: List[int] = []
+
+    def compute(value: int, *, offset: int) -> int:
+        calls.append(value)
+        return value + offset
+
+    argument = lazy(compute, 1, offset=1)
+    record = logging.makeLogRecord({"msg": "%s %r", "args": (argument, argument)})
+    assert calls == []
+
+    assert get_message(record) == "2 2"
+    assert calls == [1]
+
+
+def test_queue_handler_defers_messages() -> None:
+    """Test that lazy arguments are left to handlers which accept the record."""
+    calls: List[int] = []
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(CompactTextFormat())
+    target.setLevel(logging.WARNING)
+    handler = QueueFormatHandler(
+        target, respect_handler_level=True, defer_messages=True
+    )
+
+    for level in (logging.INFO, logging.WARNING):
+        handler.handle(
+            logging.makeLogRecord(
+                {"msg": "%s", "args": (lazy(calls.append, level),), "levelno": level}
+            )
+        )
+    handler.close()
+
+    assert calls == [logging.WARNING]
+    assert stream.getvalue().count("\n") == 1
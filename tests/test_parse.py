@@ -0,0 +1,208 @@
+"""Test cases for reading logs back."""
+
+import logging
+import pathlib
+import sys
+from typing import Any
+from typing import List
+
+import pytest
+
+from pylogformats.json import AdvJsonFormat
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.parse import PARSERS
+from pylogformats.parse import BunyanParser
+from pylogformats.parse import CompactTextParser
+from pylogformats.parse import JsonParser
+from pylogformats.parse import LineParser
+from pylogformats.parse import ParsedRecord
+from pylogformats.parse import get_parser
+from pylogformats.parse import read_records
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+
+
+def make_records() -> List[logging.LogRecord]:
+    """Create records at several levels, one with extras and an exception."""
+    records: List[logging.LogRecord] = [
+        logging.makeLogRecord(
+            {
+                "name": "app.db",
+                "msg": "Query took %sms",
+                "args": (12,),
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+                "filename": "db.py",
+                "lineno": 7,
+                "table": "users",
+                "ids": [1, 2],
+            }
+        )
+    ]
+    try:
+        raise ValueError("Something went wrong")
+    except ValueError:
+        records.append(
+            logging.makeLogRecord(
+                {
+                    "name": "root",
+                    "msg": "Failed [badly]",
+                    "levelno": logging.ERROR,
+                    "levelname": "ERROR",
+                    "exc_info": sys.exc_info(),
+                }
+            )
+        )
+    return records
+
+
+def write_log(path: pathlib.Path, formatter: logging.Formatter) -> None:
+    """Write the records to a file."""
+    with open(path, "w", encoding="utf-8") as output:
+        for record in make_records():
+            output.write(formatter.format(record) + "\n")
+
+
+@pytest.mark.parametrize(
+    "formatter, parser",
+    [
+        (JsonFormat(), "json"),
+        (AdvJsonFormat(), "json"),
+        (BunyanFormat(), "bunyan"),
+        (CompactTextFormat(), "compact"),
+        (SimpleTextFormat(), "simple"),
+    ],
+)
+def test_round_trip(
+    tmp_path: pathlib.Path, formatter: logging.Formatter, parser: str
+) -> None:
+    """Test that every format reads back to the records it was written from."""
+    path: pathlib.Path = tmp_path / "app.log"
+    write_log(path, formatter)
+
+    records: List[ParsedRecord] = list(read_records(path, parser))
+
+    assert [record.level for record in records] == ["INFO", "ERROR"]
+    assert [record.message for record in records] == [
+        "Query took 12ms",
+        "Failed [badly]",
+    ]
+    assert records[0].timestamp
+    if parser != "simple":
+        assert records[0].logger == "app.db"
+        assert records[0].fields["table"] == "users"
+    assert "ValueError: Something went wrong" in str(records[1].fields)
+
+
+def test_compact_fields() -> None:
+    """Test the fields the compact format reads back."""
+    parser = CompactTextParser()
+    records: List[ParsedRecord] = list(
+        parser.parse(
+            [
+                "Not a record\n",
+                "[I 2021-02-04 23:01:46 l:root f:app.py ln:5] No extras \n",
+                "[W 2021-02-04 23:01:47 l:root f:app.py ln:6] Two [a:[1]] [b:x y]\n",
+                "[L 2021-02-04 23:01:48 l:root f:unknown ln:0] Cut",
+            ]
+        )
+    )
+
+    assert [(record.level, record.message) for record in records] == [
+        ("INFO", "No extras"),
+        ("WARNING", "Two"),
+        ("L", "Cut"),
+    ]
+    assert records[0].fields == {"filename": "app.py", "lineno": 5}
+    assert list(parser.parse([])) == []
+    assert records[1].fields == {
+        "filename": "app.py",
+        "lineno": 6,
+        "a": "[1]",
+        "b": "x y",
+    }
+
+
+def test_json_lines_which_are_not_records() -> None:
+    """Test that blank, broken and non-object lines are skipped."""
+    records: List[ParsedRecord] = list(
+        JsonParser().parse(["\n", "{broken\n", "[1, 2]\n", '{"message": "Only"}\n'])
+    )
+
+    assert len(records) == 1
+    assert repr(records[0]) == "ParsedRecord('', '', None, 'Only')"
+
+
+def test_bunyan_levels() -> None:
+    """Test that Bunyan's numeric levels are named."""
+    parser = BunyanParser()
+
+    for level, name in [(35, "Level 35"), (40, "ERROR"), ("warn", "warn")]:
+        record = parser.parse_line(
+            f'{{"level": {level!r}, "msg": "x"}}'.replace("'", '"')
+        )
+        assert record is not None
+        assert record.level == name
+
+
+def test_custom_loads() -> None:
+    """Test that another JSON decoder can be used."""
+    calls: List[str] = []
+
+    def loads(line: str) -> Any:
+        calls.append(line)
+        return {"message": line}
+
+    record = JsonParser(loads).parse_line("anything")
+
+    assert calls == ["anything"]
+    assert record is not None and record.message == "anything"
+
+
+def test_get_parser() -> None:
+    """Test resolving parsers by name."""
+    parser = JsonParser()
+
+    assert get_parser(parser) is parser
+    assert isinstance(get_parser("bunyan"), BunyanParser)
+    assert set(PARSERS) == {"json", "bunyan", "compact", "simple"}
+    with pytest.raises(ValueError, match="Unknown format"):
+        get_parser("xml")
+
+
+def test_base_parser() -> None:
+    """Test that the base parser has to be subclassed."""
+    with pytest.raises(TypeError, match="abstract"):
+        LineParser()  # type: ignore[abstract]
+
+
+def test_to_log_record() -> None:
+    """Test rebuilding log records from parsed records."""
+    record = ParsedRecord(
+        "2021-02-04T23:01:46.5",
+        "WARNING",
+        "app",
+        "Message",
+        {
+            "location": {"line": 3, "function": "main"},
+            "process": {"number": 10},
+            "thread": "not an object",
+            "levelno": 35,
+            "v": 1,
+            "msg": "not an extra",
+            "user": "someone",
+        },
+    ).to_log_record()
+
+    assert (record.name, record.getMessage(), record.levelno) == ("app", "Message", 35)
+    assert record.created == ParsedRecord("2021-02-04 23:01:46", "", None, "").created + 0.5  # type: ignore[operator]
+    assert (record.lineno, record.funcName, record.process) == (3, "main", 10)
+    assert record.processName is None
+    assert record.thread is None
+    assert record.user == "someone"  # type: ignore[attr-defined]
+    assert not hasattr(record, "v")
+
+    unknown = ParsedRecord("unknown", "CUSTOM", None, "Message").to_log_record()
+    assert unknown.levelno == logging.NOTSET
+    assert unknown.name == "root"
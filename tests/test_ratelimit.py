@@ -0,0 +1,223 @@
+"""Test cases for rate limiting log calls."""
+
+import json
+import logging
+from typing import Any
+from typing import Dict
+from typing import List
+
+from pylogformats import JsonFormat
+from pylogformats.ratelimit import RateLimitFilter
+
+
+class Clock:
+    """A clock which only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        """Tell the time."""
+        return self.now
+
+
+def _record(
+    msg: Any = "Connection to %s failed",
+    *args: object,
+    name: str = "app",
+    level: int = logging.WARNING,
+) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {
+            "name": name,
+            "msg": msg,
+            "args": args,
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+        }
+    )
+
+
+def test_token_bucket() -> None:
+    """Test a burst is let through, then a steady rate."""
+    clock = Clock()
+    rate_limit = RateLimitFilter(rate=2, burst=3, clock=clock)
+
+    assert [rate_limit.filter(_record("Flood %d", index)) for index in range(5)] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+
+    clock.now = 0.5
+    record: logging.LogRecord = _record("Flood %d", 5)
+    assert rate_limit.filter(record)
+    assert record.suppressed_count == 2  # type: ignore[attr-defined]
+    assert not rate_limit.filter(_record("Flood %d", 6))
+
+    # A long quiet spell only refills the bucket up to the burst.
+    clock.now = 100
+    assert (
+        sum(rate_limit.filter(_record("Flood %d", index)) for index in range(10)) == 3
+    )
+    assert rate_limit.suppressed == 10
+
+
+def test_calls_are_limited_apart() -> None:
+    """Test each logger, level and template has its own limit."""
+    rate_limit = RateLimitFilter(rate=1, clock=Clock())
+
+    records: List[logging.LogRecord] = [
+        _record(),
+        _record(name="db"),
+        _record(level=logging.ERROR),
+        _record("Another message"),
+        _record({"unhashable": "message"}),
+        _record(("hashable", "message")),
+    ]
+
+    assert all(rate_limit.filter(record) for record in records)
+    assert not any(rate_limit.filter(record) for record in records)
+    assert not hasattr(records[0], "suppressed_count")
+
+
+def test_repeats_are_dropped() -> None:
+    """Test the same message is dropped within the window, even with tokens."""
+    clock = Clock()
+    rate_limit = RateLimitFilter(rate=100, window=10, clock=clock)
+
+    assert rate_limit.filter(_record("Retrying %s", "db1"))
+    assert not rate_limit.filter(_record("Retrying %s", "db1"))
+    record: logging.LogRecord = _record("Retrying %s", "db2")
+    assert rate_limit.filter(record)
+    assert record.suppressed_count == 1  # type: ignore[attr-defined]
+    assert rate_limit.filter(_record("Retrying %s", "db1"))
+
+    clock.now = 9
+    assert not rate_limit.filter(_record("Retrying %s", "db1"))
+    clock.now = 20
+    record = _record("Retrying %s", "db1")
+    assert rate_limit.filter(record)
+    assert record.suppressed_count == 1  # type: ignore[attr-defined]
+
+
+def test_summaries() -> None:
+    """Test dropped records not yet reported are summarised, once."""
+    rate_limit = RateLimitFilter(rate=1, clock=Clock())
+    for host in ["db1", "db2", "db3"]:
+        rate_limit.filter(_record("Connection to %s failed", host))
+    rate_limit.filter(_record("Quiet", level=logging.INFO))
+
+    (summary,) = rate_limit.summaries()
+
+    assert (summary.name, summary.levelname) == ("app", "WARNING")
+    assert summary.getMessage() == (
+        "2 records like 'Connection to %s failed' were suppressed"
+    )
+    line: Dict[str, Any] = json.loads(JsonFormat().format(summary))
+    assert line["suppressed_count"] == 2
+    assert rate_limit.summaries() == []
+
+
+def test_keys_are_bounded() -> None:
+    """Test the least recently seen calls are forgotten first."""
+    rate_limit = RateLimitFilter(rate=1, max_keys=2, clock=Clock())
+
+    rate_limit.filter(_record("First"))
+    rate_limit.filter(_record("Second"))
+    rate_limit.filter(_record("First"))
+    rate_limit.filter(_record("Third"))
+
+    assert len(rate_limit._calls) == 2
+    # "Second" was forgotten, so it starts again with a full bucket.
+    assert rate_limit.filter(_record("Second"))
+    assert not rate_limit.filter(_record("Third"))
+
+
+def test_forgotten_drops_are_summarised() -> None:
+    """Test the drops of forgotten calls are reported together."""
+    rate_limit = RateLimitFilter(rate=1, max_keys=1, clock=Clock())
+
+    for msg in ["First", "First", "Second", "First", "First", "Second"]:
+        rate_limit.filter(_record(msg))
+    rate_limit.filter(_record("Third", level=logging.ERROR))
+    rate_limit.filter(_record("Third", level=logging.ERROR))
+    rate_limit.filter(_record("Fourth", level=logging.INFO))
+
+    (summary,) = rate_limit.summaries()
+
+    assert (summary.name, summary.levelname) == ("pylogformats.ratelimit", "ERROR")
+    assert summary.getMessage() == (
+        "3 records of log calls no longer remembered were suppressed"
+    )
+    assert summary.suppressed_count == 3  # type: ignore[attr-defined]
+    assert rate_limit.summaries() == []
+
+
+def test_forgotten_drops_are_bounded() -> None:
+    """Test forgetting many calls with drops leaves a single count behind."""
+    rate_limit = RateLimitFilter(rate=1, max_keys=10, clock=Clock())
+
+    for number in range(1000):
+        rate_limit.filter(_record(f"Message {number}"))
+        rate_limit.filter(_record(f"Message {number}"))
+
+    summaries: List[logging.LogRecord] = rate_limit.summaries()
+
+    assert len(summaries) == 11
+    assert sum(vars(summary)["suppressed_count"] for summary in summaries) == 1000
+    assert summaries[-1].suppressed_count == 990  # type: ignore[attr-defined]
+
+
+def test_log_summaries(caplog: Any) -> None:
+    """Test summaries are logged through their loggers, or a handler."""
+    logger: logging.Logger = logging.getLogger("tests.ratelimit.summaries")
+    rate_limit = RateLimitFilter(rate=1, max_keys=1)
+    logger.addFilter(rate_limit)
+    try:
+        with caplog.at_level(logging.INFO, logger="tests.ratelimit.summaries"):
+            for _ in range(3):
+                logger.warning("First")
+            for _ in range(2):
+                logger.warning("Second %s", "message")
+            caplog.clear()
+
+            rate_limit.log_summaries()
+
+            assert [record.getMessage() for record in caplog.records] == [
+                "1 records like 'Second %s' were suppressed",
+                "2 records of log calls no longer remembered were suppressed",
+            ]
+            assert [record.name for record in caplog.records] == [
+                logger.name,
+                "pylogformats.ratelimit",
+            ]
+
+            logger.warning("Third")
+            logger.warning("Third")
+            handler: logging.Handler = caplog.handler
+            caplog.clear()
+            rate_limit.log_summaries(handler)
+
+            assert [record.suppressed_count for record in caplog.records] == [1]
+    finally:
+        logger.removeFilter(rate_limit)
+
+
+def test_on_a_logger(caplog: Any) -> None:
+    """Test the filter on a logger, with the real clock."""
+    logger: logging.Logger = logging.getLogger("tests.ratelimit")
+    rate_limit = RateLimitFilter(rate=5)
+    logger.addFilter(rate_limit)
+    try:
+        with caplog.at_level(logging.INFO, logger="tests.ratelimit"):
+            for index in range(100):
+                logger.warning("Connection to %s failed", f"db{index}")
+    finally:
+        logger.removeFilter(rate_limit)
+
+    assert 5 <= len(caplog.records) < 100
+    assert rate_limit.suppressed == 100 - len(caplog.records)
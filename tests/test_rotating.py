@@ -0,0 +1,287 @@
+"""Test cases for the compressed rotating file handler."""
+
+import gc
+import gzip
+import logging
+import lzma
+import pathlib
+import threading
+import time
+import weakref
+from typing import List
+from typing import Tuple
+
+import pytest
+
+from pylogformats.compression import LzmaCodec
+from pylogformats.handlers import CompressedRotatingFileHandler
+from pylogformats.handlers.rotating import _LOCK_POLL
+from pylogformats.handlers.rotating import _sync_periodically
+from pylogformats.json import BunyanFormat
+from pylogformats.parse import BunyanParser
+
+
+def _record(msg: str = "A demo log message", created: float = 0.0) -> logging.LogRecord:
+    record = logging.makeLogRecord(
+        {"name": "app", "msg": msg, "levelno": logging.INFO, "levelname": "INFO"}
+    )
+    if created:
+        record.created = created
+    return record
+
+
+def _handler(path: pathlib.Path, **kwargs: object) -> CompressedRotatingFileHandler:
+    handler = CompressedRotatingFileHandler(path, **kwargs)  # type: ignore[arg-type]
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def _rotated(path: pathlib.Path, suffix: str = ".gz") -> List[pathlib.Path]:
+    """List the rotated files, oldest first."""
+
+    def order(segment: pathlib.Path) -> Tuple[str, int]:
+        name: str = segment.name[len(path.name) + 1 : -len(suffix)]
+        stamp, _, number = name.partition("_")
+        return stamp, int(number or 0)
+
+    return sorted(path.parent.glob(f"{path.name}.*{suffix}"), key=order)
+
+
+def _lines(data: bytes) -> List[str]:
+    return data.decode().splitlines()
+
+
+def test_rotate_by_size(tmp_path: pathlib.Path) -> None:
+    """Test files are rotated by size, compressed, and the newest kept."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, max_bytes=100, backup_count=2)
+
+    for index in range(40):
+        handler.handle(_record(f"Record {index:02d}"))
+    handler.close()
+
+    rotated: List[pathlib.Path] = _rotated(path)
+    assert len(rotated) == 2
+    # Only compressed files are left, named after the time, with a number
+    # when several files were rotated within a second.
+    assert sorted(tmp_path.iterdir()) == sorted([path, *rotated])
+    kept: List[str] = [
+        line
+        for segment in rotated
+        for line in _lines(gzip.decompress(segment.read_bytes()))
+    ] + path.read_text().splitlines()
+    assert kept == [f"Record {index:02d}" for index in range(40 - len(kept), 40)]
+
+
+def test_rotate_by_time(tmp_path: pathlib.Path) -> None:
+    """Test files are rotated when a record is logged after the interval."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, interval=3600, compression=LzmaCodec())
+    now: float = time.time()
+
+    handler.handle(_record("This hour", now))
+    handler.handle(_record("Next hour", now + 3600))
+    handler.handle(_record("Still next hour", now + 3601))
+    handler.close()
+
+    (segment,) = _rotated(path, ".xz")
+    assert _lines(lzma.decompress(segment.read_bytes())) == ["This hour"]
+    assert path.read_text().splitlines() == ["Next hour", "Still next hour"]
+    assert handler.rollover_at % 3600 == 0
+
+
+def test_empty_files_are_not_rotated(tmp_path: pathlib.Path) -> None:
+    """Test an empty file is kept, and rotating waits for the next interval."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, interval=60, delay=True)
+
+    handler.doRollover()
+    handler.handle(_record("First"))
+    handler.close()
+
+    assert _rotated(path) == []
+    assert path.read_text() == "First\n"
+
+
+def test_compress_active(tmp_path: pathlib.Path) -> None:
+    """Test the file is compressed while it is written, and readable as it is."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = CompressedRotatingFileHandler(
+        path, max_bytes=2000, compress_active=True, sync_interval=0
+    )
+    handler.setFormatter(BunyanFormat())
+    active: pathlib.Path = pathlib.Path(handler.active_path)
+
+    handler.handle(_record("Synced"))
+    # Everything logged before the last sync point can be read.
+    with gzip.open(active, "rt") as lines:
+        assert [record.message for record in BunyanParser().parse(lines)] == ["Synced"]
+
+    for index in range(200):
+        handler.handle(_record(f"Record {index}"))
+    handler.close()
+
+    assert active.name == "app.log.gz"
+    assert not path.exists()
+    rotated: List[pathlib.Path] = _rotated(path)
+    assert rotated
+    messages: List[str] = [
+        record.message
+        for segment in [*rotated, active]
+        for record in BunyanParser().parse(
+            _lines(gzip.decompress(segment.read_bytes()))
+        )
+    ]
+    assert messages == ["Synced", *[f"Record {index}" for index in range(200)]]
+
+
+def test_compress_active_waits_to_sync(tmp_path: pathlib.Path) -> None:
+    """Test sync points are only written every ``sync_interval`` seconds."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, compress_active=True, sync_interval=3600, delay=True)
+    active: pathlib.Path = pathlib.Path(handler.active_path)
+
+    handler.handle(_record("Held"))
+    # Nothing reaches the file until the stream is ended.
+    assert active.read_bytes() == b""
+
+    handler.flush()
+    assert gzip.decompress(active.read_bytes()) == b"Held\n"
+
+    handler.handle(_record("Flushed"))
+    handler.handle(_record("Closed"))
+    handler.flush()
+    assert gzip.decompress(active.read_bytes()) == b"Held\nFlushed\nClosed\n"
+    handler.close()
+    handler.flush()
+
+    assert gzip.decompress(active.read_bytes()) == b"Held\nFlushed\nClosed\n"
+
+
+def test_compress_active_syncs_on_a_timer(tmp_path: pathlib.Path) -> None:
+    """Test a background thread ends the stream every ``sync_interval`` seconds."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, compress_active=True, sync_interval=0.01)
+    active: pathlib.Path = pathlib.Path(handler.active_path)
+
+    handler.handle(_record("First"))
+    time.sleep(0.05)
+    handler.handle(_record("Second"))
+    handler.handle(_record("Third"))
+
+    # Without another record or a flush, the timer ends the stream.
+    assert handler._writer is not None
+    deadline: float = time.monotonic() + 5
+    while handler._writer._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert gzip.decompress(active.read_bytes()) == b"First\nSecond\nThird\n"
+    handler.close()
+
+
+def test_close_holding_the_lock(tmp_path: pathlib.Path) -> None:
+    """Test closing while holding the lock, as at shutdown, does not hang."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, compress_active=True, sync_interval=0.01)
+    handler.handle(_record("At shutdown"))
+
+    def shutdown() -> None:
+        # As in `logging.shutdown`, after the timer has woken up.
+        handler.acquire()
+        try:
+            time.sleep(0.05)
+            handler.flush()
+            handler.close()
+        finally:
+            handler.release()
+
+    closer = threading.Thread(target=shutdown, daemon=True)
+    closer.start()
+    closer.join(5)
+
+    assert not closer.is_alive()
+    assert gzip.decompress(pathlib.Path(handler.active_path).read_bytes()) == (
+        b"At shutdown\n"
+    )
+
+
+def test_timer(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the timer waits for the lock, reports errors and stops with the handler."""
+    handler = _handler(tmp_path / "app.log", compress_active=True, sync_interval=3600)
+    active: pathlib.Path = pathlib.Path(handler.active_path)
+    handler.handle(_record("Waited"))
+
+    handler.acquire()
+    syncing = threading.Thread(target=handler._sync_on_timer, daemon=True)
+    syncing.start()
+    time.sleep(_LOCK_POLL * 3)
+    assert active.read_bytes() == b""
+    handler.release()
+    syncing.join(5)
+    assert gzip.decompress(active.read_bytes()) == b"Waited\n"
+
+    def fail() -> None:
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(handler, "_sync_on_timer", fail)
+    stop = threading.Event()
+    timer = threading.Thread(
+        target=_sync_periodically, args=(weakref.ref(handler), stop, 0.01)
+    )
+    timer.start()
+    deadline: float = time.monotonic() + 5
+    errors: str = ""
+    while "OSError: Disk full" not in errors and time.monotonic() < deadline:
+        time.sleep(0.01)
+        errors += capsys.readouterr().err
+    stop.set()
+    timer.join()
+    monkeypatch.undo()
+    assert "OSError: Disk full" in errors
+
+    handler.close()
+    reference = weakref.ref(handler)
+    del handler
+    gc.collect()
+    timer = threading.Thread(
+        target=_sync_periodically, args=(reference, threading.Event(), 0.01)
+    )
+    timer.start()
+    timer.join(5)
+    assert not timer.is_alive()
+
+
+def test_errors(
+    tmp_path: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test failing to sync or compress is reported, and the records kept."""
+    path: pathlib.Path = tmp_path / "app.log"
+    handler = _handler(path, compress_active=True, sync_interval=0)
+
+    def fail() -> None:
+        raise OSError("Disk full")
+
+    assert handler._writer is not None
+    monkeypatch.setattr(handler._writer, "sync", fail)
+    handler.handle(_record())
+    monkeypatch.undo()
+    handler.close()
+    assert "OSError: Disk full" in capsys.readouterr().err
+
+    handler = _handler(path, max_bytes=1)
+    monkeypatch.setattr(handler.codec, "compress_file", lambda source, target: fail())
+    handler.handle(_record("Kept"))
+    handler.handle(_record("Rotating"))
+    handler.close()
+
+    assert "OSError: Disk full" in capsys.readouterr().err
+    # The rotated file is left as it is, uncompressed.
+    (segment,) = tmp_path.glob("app.log.*[0-9]")
+    assert segment.read_text() == "Kept\n"
+    assert path.read_text() == "Rotating\n"
@@ -0,0 +1,175 @@
+"""Test cases for the JSON serializer backends."""
+
+import json
+import logging
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pytest
+
+from pylogformats import serializers
+from pylogformats.json import JsonFormat
+from pylogformats.serializers import SERIALIZERS
+from pylogformats.serializers import Serializer
+from pylogformats.serializers import StdlibSerializer
+from pylogformats.serializers import get_serializer
+
+
+RECORD: Dict[Any, Any] = {
+    "logger": "root",
+    "message": 'A "quoted" message with ünïcödé and a / slash',
+    "levelno": 10,
+    "process": {"number": 1234, "name": "MainProcess"},
+    "float_extra": 1.5,
+    "none_extra": None,
+    "bool_extra": True,
+    "list_extra": [1, 2.5, "three"],
+    4: "int key",
+}
+
+
+def test_stdlib_serializer_matches_json_dumps() -> None:
+    """Test that the standard library backend is identical to `json.dumps`."""
+    serializer = StdlibSerializer()
+
+    assert serializer.dumps(RECORD) == json.dumps(RECORD)
+    assert serializer.dumps("just a string") == json.dumps("just a string")
+    assert serializer.dumps(float("nan")) == json.dumps(float("nan"))
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def test_serializers_keep_values_and_order(name: str) -> None:
+    """Test that every installed backend round-trips the record in order."""
+    try:
+        serializer: Serializer = get_serializer(name)
+    except ImportError:  # pragma: no cover
+        pytest.skip(f"{name} is not installed")
+
+    output: str = serializer.dumps(RECORD)
+    loaded: Dict[str, Any] = json.loads(output)
+
+    assert list(loaded) == [str(key) for key in RECORD]
+    assert loaded == json.loads(json.dumps(RECORD))
+    assert output.startswith(f'{{"logger"{serializer.key_separator}"root"')
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def test_serializers_encode_values_and_bytes(name: str) -> None:
+    """Test that single values and bytes match the serialized record."""
+    try:
+        serializer: Serializer = get_serializer(name)
+    except ImportError:  # pragma: no cover
+        pytest.skip(f"{name} is not installed")
+
+    values: List[Any] = ["ünïcödé", 1, True, False, None, 1.5, [1, "two"]]
+
+    assert serializer.encode_values(values) == [serializer.dumps(v) for v in values]
+    assert serializer.encode_str("a/b") == serializer.dumps("a/b")
+    assert serializer.dumps_bytes(RECORD) == serializer.dumps(RECORD).encode("utf-8")
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def test_serializers_matching_json_dumps(name: str) -> None:
+    """Test which backends write the same output as `json.dumps`."""
+    try:
+        serializer: Serializer = get_serializer(name)
+    except ImportError:  # pragma: no cover
+        pytest.skip(f"{name} is not installed")
+
+    record: Dict[Any, Any] = {**RECORD, "small_float": 1e-7}
+
+    assert serializer.matches_json_dumps == (name == "json")
+    if serializer.matches_json_dumps:
+        assert serializer.dumps(record) == json.dumps(record)
+    else:
+        assert serializer.dumps(record) != json.dumps(record)
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def test_serializers_reject_circular_values(name: str) -> None:
+    """Test a value referring to itself fails without a `RecursionError`."""
+    try:
+        serializer: Serializer = get_serializer(name)
+    except ImportError:  # pragma: no cover
+        pytest.skip(f"{name} is not installed")
+
+    circular: Dict[str, Any] = {"name": "circular"}
+    circular["self"] = circular
+
+    for _ in range(2):
+        with pytest.raises((ValueError, TypeError, OverflowError)):
+            serializer.dumps({"extra": circular})
+        # Nothing is left over from the failure, the same containers encode.
+        circular.pop("self")
+        assert json.loads(serializer.dumps({"extra": circular})) == {
+            "extra": {"name": "circular"}
+        }
+        circular["self"] = circular
+
+
+def test_circular_extra_is_a_handler_error(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test logging a circular extra is reported rather than raised."""
+    circular: Dict[str, Any] = {}
+    circular["self"] = circular
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormat())
+    logger = logging.getLogger("test_serializers.circular")
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    logger.warning("Circular", extra={"circular": circular})
+    logger.removeHandler(handler)
+
+    assert "ValueError: Circular reference detected" in capsys.readouterr().err
+
+
+def test_serializer_requires_dumps() -> None:
+    """Test that the base serializer leaves serializing to subclasses."""
+    with pytest.raises(TypeError, match="abstract"):
+        Serializer()  # type: ignore[abstract]
+
+
+def test_get_serializer() -> None:
+    """Test that serializers resolve from instances, names and defaults."""
+    serializer = StdlibSerializer()
+
+    assert get_serializer(serializer) is serializer
+    assert isinstance(get_serializer(), StdlibSerializer)
+    assert isinstance(get_serializer("json"), StdlibSerializer)
+    assert isinstance(get_serializer("auto"), StdlibSerializer)
+    assert serializers.AUTO_ORDER == ["json"]
+
+    with pytest.raises(ValueError, match="expected one of auto, json, orjson"):
+        get_serializer("pickle")
+
+
+def test_get_serializer_auto_skips_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that ``"auto"`` moves on from backends which are not installed."""
+
+    class MissingSerializer(Serializer):
+        def __init__(self) -> None:
+            raise ImportError("missing")
+
+        def dumps(self, obj: Any) -> str:
+            return ""  # pragma: no cover
+
+    monkeypatch.setitem(SERIALIZERS, "missing", MissingSerializer)
+    monkeypatch.setattr(serializers, "AUTO_ORDER", ["missing", "json"])
+
+    assert isinstance(get_serializer("auto"), StdlibSerializer)
+
+
+def test_formatter_serializer_option() -> None:
+    """Test that the JSON formatters serialize through the chosen backend."""
+    record: logging.LogRecord = logging.makeLogRecord(
+        {"name": "root", "msg": "A demo log message", "str_extra": "Extra 1"}
+    )
+
+    default_log: str = JsonFormat().format(record)
+    auto_log: str = JsonFormat(serializer="auto").format(record)
+
+    assert json.loads(auto_log) == json.loads(default_log)
+    assert JsonFormat(serializer="json").format(record) == default_log
@@ -0,0 +1,76 @@
+"""Test cases for the cached timestamp renderers."""
+
+import random
+import time
+from datetime import datetime
+from typing import List
+
+from pylogformats.timestamps import BunyanTimestamp
+from pylogformats.timestamps import IsoTimestamp
+from pylogformats.timestamps import StrftimeTimestamp
+from pylogformats.timestamps import TimestampCache
+from pylogformats.timestamps import split_timestamp
+
+
+def _timestamps() -> List[float]:
+    """Timestamps covering whole seconds, rounding edges and random values."""
+    rng = random.Random(1612479772)
+    values: List[float] = [
+        0.0,
+        1612479772.0,
+        1612479772.5,
+        1612479772.9999995,
+        1612479772.0000005,
+        1.9999999,
+        -0.5,
+    ]
+    values.extend(rng.uniform(0, 2e9) for _ in range(2000))
+    base: float = time.time()
+    values.extend(base + index * 0.000137 for index in range(2000))
+    return values
+
+
+def test_timestamps_match_sequentially() -> None:
+    """Test that every renderer matches the `datetime` and `time` reference."""
+    iso = IsoTimestamp()
+    bunyan = BunyanTimestamp()
+    text = StrftimeTimestamp("%Y-%m-%d %H:%M:%S")
+
+    for created in _timestamps():
+        as_datetime: datetime = datetime.fromtimestamp(created)
+
+        assert iso(created) == as_datetime.isoformat()
+        assert bunyan(created) == (
+            as_datetime.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        )
+        assert text(created) == time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(created)
+        )
+
+
+def test_strftime_timestamp_converter() -> None:
+    """Test that a custom converter is used for text timestamps."""
+    text = StrftimeTimestamp("%H:%M:%S", time.gmtime)
+
+    assert text(3661.75) == "01:01:01"
+
+
+def test_split_timestamp_rounding() -> None:
+    """Test that microseconds round half to even and carry into the second."""
+    assert split_timestamp(10.25) == (10, 250000)
+    assert split_timestamp(10.9999999) == (11, 0)
+    assert split_timestamp(-0.25) == (-1, 750000)
+
+
+def test_timestamp_cache_renders_once() -> None:
+    """Test that a second is only rendered once while it stays current."""
+    calls: List[int] = []
+
+    def render(second: int) -> str:
+        calls.append(second)
+        return str(second)
+
+    cache = TimestampCache(render)
+
+    assert [cache(1), cache(1), cache(2), cache(2), cache(1)] == list("11221")
+    assert calls == [1, 2, 1]
@@ -0,0 +1,228 @@
+"""Test cases for exception and stack rendering."""
+
+import gc
+import json
+import logging
+import pickle  # noqa: S403
+import sys
+import traceback
+import weakref
+from typing import Any
+from typing import List
+
+import pytest
+
+from pylogformats import tracebacks
+from pylogformats.json import BunyanFormat
+from pylogformats.json import JsonFormat
+from pylogformats.text import CompactTextFormat
+from pylogformats.text import SimpleTextFormat
+from pylogformats.tracebacks import CACHE_SIZE
+from pylogformats.tracebacks import render_exception
+
+
+class Failure(ValueError):
+    """An exception class supporting weak references, as Python classes do."""
+
+
+def fail() -> None:
+    """Raise an exception to be logged."""
+    raise Failure("Something went wrong")
+
+
+def exception_record(**kwargs: Any) -> logging.LogRecord:
+    """Create a record carrying the exception raised by `fail`."""
+    try:
+        fail()
+    except ValueError:
+        return logging.makeLogRecord(
+            {"name": "root", "msg": "Failed", "exc_info": sys.exc_info(), **kwargs}
+        )
+    raise AssertionError("fail did not raise")  # pragma: no cover
+
+
+def test_json_exception() -> None:
+    """Test that the JSON formatter describes the exception."""
+    logged = json.loads(JsonFormat().format(exception_record()))
+
+    exception = logged["exception"]
+    assert exception["exc_type"] == "Failure"
+    assert exception["exc_message"] == "Something went wrong"
+    assert exception["frames"][-1]["function"] == "fail"
+    assert exception["frames"][-1]["code"] == 'raise Failure("Something went wrong")'
+    assert exception["traceback"].startswith("Traceback (most recent call last):")
+    assert exception["traceback"].endswith("Failure: Something went wrong")
+    assert "stack_info" not in logged
+
+
+def test_bunyan_err() -> None:
+    """Test that the Bunyan formatter uses Bunyan's err object."""
+    logged = json.loads(BunyanFormat().format(exception_record()))
+
+    assert logged["err"]["name"] == "Failure"
+    assert logged["err"]["message"] == "Something went wrong"
+    assert logged["err"]["stack"].endswith("Failure: Something went wrong")
+    assert "exception" not in logged
+
+
+@pytest.mark.parametrize("formatter", [CompactTextFormat, SimpleTextFormat])
+def test_text_traceback(formatter: Any) -> None:
+    """Test that the text formatters append the traceback after the message."""
+    record = exception_record(stack_info="Stack (most recent call last):")
+    lines: List[str] = formatter().format(record).splitlines()
+
+    assert "Failed" in lines[0]
+    assert lines[1] == "Traceback (most recent call last):"
+    assert lines[-2].endswith("Failure: Something went wrong")
+    assert lines[-1] == "Stack (most recent call last):"
+
+
+def test_no_exception_unchanged() -> None:
+    """Test that records without exceptions gain no error fields."""
+    record = logging.makeLogRecord({"name": "root", "msg": "Fine"})
+
+    assert set(json.loads(JsonFormat().format(record))).isdisjoint(
+        {"exception", "stack_info"}
+    )
+    assert "err" not in json.loads(BunyanFormat().format(record))
+    assert "\n" not in CompactTextFormat().format(record)
+    assert render_exception(None) is None
+    assert render_exception((None, None, None)) is None
+
+
+def test_rendered_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an exception logged many times is rendered once."""
+    calls: List[int] = []
+    extract_tb = traceback.extract_tb
+
+    def counted_extract_tb(*args: Any) -> Any:
+        calls.append(1)
+        return extract_tb(*args)
+
+    monkeypatch.setattr(traceback, "extract_tb", counted_extract_tb)
+
+    record = exception_record()
+    for formatter in (JsonFormat(), BunyanFormat(), CompactTextFormat()):
+        formatter.format(record)
+        formatter.format(record)
+
+    assert len(calls) == 1
+
+
+def test_reraise_renders_again() -> None:
+    """Test that raising an exception again refreshes its rendering."""
+    record = exception_record()
+    exc: Any = record.exc_info[1]  # type: ignore[index]
+    first = render_exception(record.exc_info)
+
+    try:
+        raise exc
+    except ValueError:
+        second = render_exception(sys.exc_info())
+
+    assert first is not None and second is not None
+    assert second is not first
+    assert len(second.frames) == len(first.frames) + 1
+
+
+def test_rendered_exception_untouched() -> None:
+    """Test that caching the rendering leaves the exception as it was."""
+    record = exception_record()
+    JsonFormat().format(record)
+
+    exc: Any = record.exc_info[1]  # type: ignore[index]
+    assert vars(exc) == {}
+    assert str(pickle.loads(pickle.dumps(exc))) == "Something went wrong"  # noqa: S301
+
+
+def test_frames_not_kept_alive() -> None:
+    """Test that a cached rendering does not keep its exception alive."""
+    record = exception_record()
+    rendered = render_exception(record.exc_info)
+    exc = weakref.ref(record.exc_info[1])  # type: ignore[index]
+
+    del record
+    gc.collect()
+
+    assert rendered is not None
+    assert exc() is None
+
+
+def test_reused_id_renders_again() -> None:
+    """Test that a rendering is not reused for another exception of the same id."""
+    first, second = exception_record(), exception_record()
+    rendered = render_exception(first.exc_info)
+    exc_type, exc, tb = second.exc_info  # type: ignore[misc]
+    tracebacks._cache[(id(exc_type), id(exc), id(tb))] = tracebacks._cache[
+        next(reversed(tracebacks._cache))
+    ]
+
+    assert render_exception(second.exc_info) is not rendered
+
+
+def test_builtin_exceptions_not_cached() -> None:
+    """Test exceptions without weak reference support are rendered every time."""
+    try:
+        raise KeyError("missing")
+    except KeyError:
+        exc_info = sys.exc_info()
+
+    assert render_exception(exc_info) is not render_exception(exc_info)
+
+
+def test_oldest_rendering_dropped() -> None:
+    """Test that only the latest renderings are kept."""
+    records: List[logging.LogRecord] = [
+        exception_record() for _ in range(CACHE_SIZE + 1)
+    ]
+    first = render_exception(records[0].exc_info)
+    second = render_exception(records[1].exc_info)
+    for record in records[2:]:
+        render_exception(record.exc_info)
+
+    assert render_exception(records[1].exc_info) is second
+    assert render_exception(records[0].exc_info) is not first
+
+
+def test_exc_text_only() -> None:
+    """Test records whose exception was already rendered into text."""
+    record = logging.makeLogRecord(
+        {"name": "root", "msg": "Failed", "exc_text": "Traceback (shipped)"}
+    )
+
+    assert json.loads(JsonFormat().format(record))["exception"] == {
+        "traceback": "Traceback (shipped)"
+    }
+    assert json.loads(BunyanFormat().format(record))["err"] == {
+        "stack": "Traceback (shipped)"
+    }
+    assert SimpleTextFormat().format(record).endswith("Failed\nTraceback (shipped)")
+
+
+def test_stack_info_only() -> None:
+    """Test records with a stack but no exception."""
+    record = logging.makeLogRecord(
+        {"name": "root", "msg": "Here", "stack_info": "Stack (most recent call last):"}
+    )
+
+    assert (
+        json.loads(JsonFormat().format(record))["stack_info"]
+        == "Stack (most recent call last):"
+    )
+    assert "err" not in json.loads(BunyanFormat().format(record))
+
+
+def test_unprintable_exception() -> None:
+    """Test exceptions which fail to turn into a string."""
+
+    class Unprintable(Exception):
+        def __str__(self) -> str:
+            raise RuntimeError("no str")
+
+    try:
+        raise Unprintable()
+    except Unprintable:
+        rendered = render_exception(sys.exc_info())
+
+    assert rendered is not None
+    assert rendered.exc_message == "<exception str() failed: Unprintable>"